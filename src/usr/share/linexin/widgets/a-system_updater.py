@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
+import time
+# Taken before anything else is imported, for the startup trace
+_IMPORT_MARKS = [("import gi, Gtk, Adw and distro", time.monotonic_ns())]
 import gi
+import codecs
 import subprocess
 import threading
 import gettext
@@ -10,25 +14,30 @@ import distro
 import tempfile
 import atexit
 import datetime
-import re
+import shutil
+import sys
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-gi.require_version("Gst", "1.0")
-from gi.repository import Gtk, Adw, GLib, Gst
+from gi.repository import Gtk, Adw, GLib, Gio, GObject
 import importlib.util
 APP_NAME = "linexin-updater"
 WIDE_LAYOUT_THRESHOLD = 800
 WIDE_LAYOUT_SIDE_PADDING = 12
 LEFT_PANE_MIN_WIDTH = 300
 LAYOUT_ANIMATION_DURATION = 350
-CRITICAL_PACKAGE_PREFIXES = (
-    'linux', 'glibc', 'systemd', 'grub', 'mkinitcpio', 'nvidia',
-    'mesa', 'xorg-server', 'wayland', 'efibootmgr', 'fwupd',
-    'plasma-desktop', 'kwin', 'sddm', 'gdm', 'lightdm',
-    'nvidia-open', 'nvidia-dkms', 'nvidia-lts', 'linux-lts', 'linux-hardened',
-    'linux-zen', 'linux-rt', 'linux-amd-staging', 'linux-ck', 'linux-xanmod',
-)
-
+UPDATE_KIND_LABELS = {
+    'major': "Major update",
+    'minor': "Minor update",
+    'patch': "Patch update",
+    'rebuild': "Package rebuild",
+    'epoch': "New epoch",
+    'downgrade': "Downgrade",
+}
+SECTION_PLACEHOLDERS = {
+    'pacman': "Checking system packages...",
+    'aur': "Checking AUR packages...",
+    'flatpak': "Checking Flatpak apps...",
+}
 # --- Set to False for official/release builds ---
 DEBUG_MODE = False
 
@@ -54,35 +63,219 @@ def load_translations():
         print(f"Translation load error: {e}")
     return {}
 
+_IMPORT_MARKS.append(("load_translations", time.monotonic_ns()))
 TRANSLATIONS = load_translations()
 
 def _(text):
     """Translate text using loaded dictionary"""
     return TRANSLATIONS.get(text, text)
-class SoundPlayer:
+
+def load_backend():
+    """Load the system_updater helper package shipped next to this widget"""
+    base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "system_updater")
+    if "system_updater" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "system_updater", os.path.join(base_dir, "__init__.py"),
+            submodule_search_locations=[base_dir]
+        )
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules["system_updater"] = mod
+        spec.loader.exec_module(mod)
+    backend = sys.modules["system_updater"]
+    backend.TRANSLATIONS.update(TRANSLATIONS)
+    return backend
+
+_IMPORT_MARKS.append(("load_backend", time.monotonic_ns()))
+load_backend()
+from system_updater import cache, daemon, descriptions, downloadsize, entries, installlog, listmodel, metadata, outputparser, pacmanlog, pkgstats, probes, progressmodel, runlog, settings, tracing, vercmp, workers
+
+# Enabled by LINEXIN_UPDATER_TRACE; a no-op otherwise
+TRACER = tracing.Tracer.from_env()
+_IMPORT_MARKS.append(("end", time.monotonic_ns()))
+TRACER.phases(_IMPORT_MARKS)
+TRACER.complete("module import", _IMPORT_MARKS[0][1], _IMPORT_MARKS[-1][1])
+
+def format_version_text(current_version, new_version, repo=""):
+    """Return the "current → new (repo)" caption of an update row"""
+    if repo:
+        return f"{current_version} → {new_version} ({repo})"
+    return f"{current_version} → {new_version}"
+
+def _ordering(a, b):
+    if a < b:
+        return Gtk.Ordering.SMALLER
+    if a > b:
+        return Gtk.Ordering.LARGER
+    return Gtk.Ordering.EQUAL
+
+class UpdateListItem(GObject.Object):
+    """Entry of the update list model: an update, a section placeholder or a status message"""
+    __gtype_name__ = "LinexinUpdateListItem"
+    def __init__(self, kind, source=None, update=None):
+        super().__init__()
+        self.kind = kind
+        self.source = source
+        self.update = update
+        self.key = update.key if update is not None else None
+        if update is not None:
+            self.section = listmodel.section_of(update)
+            self.search_text = listmodel.search_text(update)
+        else:
+            self.section = listmodel.SOURCE_SECTIONS.get(source)
+            self.search_text = ''
+        self.section_rank = listmodel.section_rank(self.section)
+        self.sort_key = ()
+
+class UpdateRow(Gtk.Box):
+    """Row widget of the update list; list items recycle it for whatever entry they show"""
     def __init__(self):
-        Gst.init(None)
-        self.player = Gst.ElementFactory.make("playbin", "player")
-        bus = self.player.get_bus()
-        bus.add_signal_watch()
-        bus.connect("message", self.on_bus_message)
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        self.set_margin_start(12)
+        self.set_margin_end(12)
+        self.spinner = Gtk.Spinner()
+        self.append(self.spinner)
+        self.info_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+        self.info_box.set_hexpand(True)
+        self.name_label = Gtk.Label()
+        self.name_label.set_halign(Gtk.Align.START)
+        self.info_box.append(self.name_label)
+        self.version_label = Gtk.Label()
+        self.version_label.add_css_class("caption")
+        self.version_label.add_css_class("dim-label")
+        self.version_label.set_halign(Gtk.Align.START)
+        self.info_box.append(self.version_label)
+        self.append(self.info_box)
+        self.update_icon = Gtk.Image.new_from_icon_name("software-update-available")
+        self.update_icon.set_pixel_size(16)
+        self.append(self.update_icon)
+        self.status_box = Gtk.Box(spacing=12)
+        self.status_box.set_hexpand(True)
+        self.status_box.set_halign(Gtk.Align.CENTER)
+        self.status_icon = Gtk.Image()
+        self.status_box.append(self.status_icon)
+        self.status_label = Gtk.Label()
+        self.status_box.append(self.status_label)
+        self.append(self.status_box)
+    def bind(self, item):
+        """Show an UpdateListItem in this row"""
+        kind = item.kind
+        self.spinner.set_visible(kind == 'placeholder')
+        self.spinner.set_spinning(kind == 'placeholder')
+        self.info_box.set_visible(kind in ('update', 'placeholder'))
+        self.update_icon.set_visible(kind == 'update')
+        self.status_box.set_visible(kind in ('empty', 'error'))
+        if kind == 'update':
+            update = item.update
+            self.set_margin_top(6)
+            self.set_margin_bottom(6)
+            self.name_label.set_label(update.name)
+            self.name_label.remove_css_class("dim-label")
+            self.name_label.add_css_class("heading")
+            self.version_label.set_label(format_version_text(update.current, update.new, update.repo))
+            self.version_label.set_visible(True)
+        elif kind == 'placeholder':
+            self.set_margin_top(10)
+            self.set_margin_bottom(10)
+            self.name_label.set_label(_(SECTION_PLACEHOLDERS[item.source]))
+            self.name_label.remove_css_class("heading")
+            self.name_label.add_css_class("dim-label")
+            self.version_label.set_visible(False)
+        elif kind == 'empty':
+            self.set_margin_top(30)
+            self.set_margin_bottom(30)
+            self.status_box.set_orientation(Gtk.Orientation.VERTICAL)
+            if os.path.exists("/usr/share/icons/confirm.svg"):
+                self.status_icon.set_from_file("/usr/share/icons/confirm.svg")
+            else:
+                self.status_icon.set_from_icon_name("emblem-ok")
+            self.status_icon.set_pixel_size(48)
+            self.status_label.set_label(_("No updates available"))
+            self.status_label.remove_css_class("error")
+            self.status_label.add_css_class("title-3")
+        else:
+            self.set_margin_top(20)
+            self.set_margin_bottom(20)
+            self.status_box.set_orientation(Gtk.Orientation.HORIZONTAL)
+            self.status_icon.set_from_icon_name("dialog-error")
+            self.status_icon.set_pixel_size(24)
+            self.status_label.set_label(_("Failed to check for updates"))
+            self.status_label.remove_css_class("title-3")
+            self.status_label.add_css_class("error")
+# Tried in order when GStreamer cannot play
+FALLBACK_SOUND_PLAYERS = (
+    ('pw-play',),
+    ('canberra-gtk-play', '-f'),
+    ('paplay',),
+)
+class SoundPlayer:
+    """Plays the install result sounds; GStreamer is only loaded when first needed."""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.player = None
+        self.Gst = None
+        self._gst_failed = False
+    def preload(self):
+        """Set up GStreamer ahead of the first sound (idle callback)."""
+        if self.enabled:
+            self._ensure_player()
+        return False
+    def _ensure_player(self):
+        if self.player is None and not self._gst_failed:
+            try:
+                # Plugin registry scanning makes this expensive, so it never runs at widget load
+                gi.require_version("Gst", "1.0")
+                from gi.repository import Gst
+                Gst.init(None)
+                player = Gst.ElementFactory.make("playbin", "player")
+                if player is None:
+                    raise RuntimeError("playbin element is not available")
+                bus = player.get_bus()
+                bus.add_signal_watch()
+                bus.connect("message", self.on_bus_message)
+                self.Gst = Gst
+                self.player = player
+            except Exception as e:
+                print(f"GStreamer unavailable, falling back to a sound command: {e}")
+                self._gst_failed = True
+        return self.player
     def play_sound(self, file_path):
-        self.player.set_state(Gst.State.NULL)
-        self.player.set_property("uri", f"file://{file_path}")
-        self.player.set_state(Gst.State.PLAYING)
+        if not self.enabled:
+            return
+        player = self._ensure_player()
+        if player is None:
+            self._play_with_command(file_path)
+            return
+        player.set_state(self.Gst.State.NULL)
+        player.set_property("uri", f"file://{file_path}")
+        player.set_state(self.Gst.State.PLAYING)
+    def _play_with_command(self, file_path):
+        for command in FALLBACK_SOUND_PLAYERS:
+            if shutil.which(command[0]):
+                try:
+                    # Gio reaps the child, so nothing waits on it here
+                    Gio.Subprocess.new(
+                        list(command) + [file_path],
+                        Gio.SubprocessFlags.STDOUT_SILENCE | Gio.SubprocessFlags.STDERR_SILENCE
+                    )
+                    return
+                except GLib.Error as e:
+                    print(f"Error playing sound with {command[0]}: {e}")
     def on_bus_message(self, bus, message):
-        if message.type == Gst.MessageType.EOS:
-            self.player.set_state(Gst.State.NULL)
-        elif message.type == Gst.MessageType.ERROR:
+        if message.type == self.Gst.MessageType.EOS:
+            self.player.set_state(self.Gst.State.NULL)
+        elif message.type == self.Gst.MessageType.ERROR:
             err, debug = message.parse_error()
             print(f"Error: {err}, Debug: {debug}")
-            self.player.set_state(Gst.State.NULL)
+            self.player.set_state(self.Gst.State.NULL)
     def stop_sound(self):
-        self.player.set_state(Gst.State.NULL)
+        if self.player is not None:
+            self.player.set_state(self.Gst.State.NULL)
 class LinexInUpdaterWidget(Gtk.Box):
     def __init__(self, hide_sidebar=False, window=None):
+        init_start = time.monotonic_ns()
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        self.sound_player = SoundPlayer()
+        self.settings = settings.load_settings()
+        self.sound_player = SoundPlayer(enabled=self.settings['play_sounds'])
         self.widgetname = "System Updater"
         self.widgeticon = "/usr/share/icons/github.petexy.linexinupdater.svg"
         self.set_margin_top(12)
@@ -90,21 +283,41 @@ class LinexInUpdaterWidget(Gtk.Box):
         self.set_margin_start(12)
         self.set_margin_end(12)
         self.progress_visible = False
-        self.progress_data = ""
+        self.install_log = installlog.LogStore()
+        self._output_batcher = None
+        self.install_progress = None
+        self._output_flush_id = None
         self.install_started = False
         self.error_message = None
         self.turn_off_after_install = False
         self.include_aur_updates = True                                  
         self.window = window
         self.hide_sidebar = hide_sidebar
-        self.available_updates = []
-        self.flatpak_updates = []
-        self.aur_updates = []
+        # Immutable tuples of UpdateEntry, shared by the list, the info panel and the warnings
+        self.available_updates = ()
+        self.flatpak_updates = ()
+        self.aur_updates = ()
+        self.critical_updates = ()
         self.wide_layout_enabled = None
         self.last_measured_width = 0
         self.checking_updates = False
         self.user_password = None
         self.last_command = ""
+        self.probe_engine = probes.UpdateProbeEngine()
+        self.metadata_index = None
+        self.download_estimate = None
+        self.pacman_log = pacmanlog.PacmanLogReader()
+        self.installed_counts = pkgstats.InstalledCounts()
+        # One bounded pool for all background jobs of this widget; it stops with the widget
+        self.worker_pool = workers.WorkerPool()
+        self.description_cache = descriptions.DescriptionCache(pool=self.worker_pool)
+        self._section_items = {source: [] for source in probes.SOURCES}
+        self._section_placeholders = {}
+        self._status_items = []
+        # Sources whose last check failed; their entries are from an earlier check
+        self.failed_sources = frozenset()
+        self.sort_mode = listmodel.SORT_MODES[0]
+        self.search_query = ''
         self.main_layout_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         self.main_layout_box.set_hexpand(True)
         self.main_layout_box.set_vexpand(True)
@@ -127,22 +340,37 @@ class LinexInUpdaterWidget(Gtk.Box):
         self.content_stack.set_hexpand(True)
         self.content_stack.set_vexpand(True)
         self.append(self.main_layout_box)
-        self.setup_updates_view()
-        self.setup_info_view()
-        self.setup_progress_view()
-        self.setup_single_widget_view()
-        self.setup_controls()
+        self.connect("destroy", self.on_destroy)
+        for setup in (self.setup_updates_view, self.setup_info_view, self.setup_progress_view,
+                      self.setup_single_widget_view, self.setup_controls):
+            with TRACER.span(setup.__name__):
+                setup()
         self.update_adaptive_layout(force=True)
         GLib.timeout_add(200, self.monitor_adaptive_layout)
         self.updates_checked = False
         if not self.hide_sidebar:
             self.content_stack.set_visible_child_name("updates_view")
-            self.check_for_updates()
+            with TRACER.span("check_for_updates"):
+                self.check_for_updates(use_cache=True, refresh_databases=False)
             self.updates_checked = True
         else:
             self.content_stack.set_visible_child_name("welcome_view")
             GLib.idle_add(self.resize_window_deferred)
             self.btn_install.set_sensitive(True)
+        if TRACER.enabled:
+            self.connect("realize", self._trace_first_frame)
+        TRACER.complete("LinexInUpdaterWidget.__init__", init_start)
+    def _trace_first_frame(self, widget):
+        """Record the first painted frame in the startup trace."""
+        frame_clock = self.get_frame_clock()
+        if frame_clock is None:
+            return
+        handler_id = None
+        def on_after_paint(clock):
+            TRACER.instant("first frame", once=True)
+            TRACER.write()
+            clock.disconnect(handler_id)
+        handler_id = frame_clock.connect("after-paint", on_after_paint)
     def get_header_bar_widget(self):
         """Return a header bar widget with toggle button for single widget mode"""
         if not self.hide_sidebar:
@@ -177,7 +405,7 @@ class LinexInUpdaterWidget(Gtk.Box):
         if current_view == "welcome_view":
             self.content_stack.set_visible_child_name("updates_view")
             if not self.updates_checked:
-                self.check_for_updates()
+                self.check_for_updates(use_cache=True, refresh_databases=False)
                 self.updates_checked = True
         elif current_view == "updates_view":
             self.content_stack.set_visible_child_name("welcome_view")
@@ -237,14 +465,47 @@ class LinexInUpdaterWidget(Gtk.Box):
         title_box.append(self.updates_subtitle)
         header_box.append(title_box)
         updates_box.append(header_box)
+        search_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self.updates_search_entry = Gtk.SearchEntry()
+        self.updates_search_entry.set_placeholder_text(_("Search updates"))
+        self.updates_search_entry.set_hexpand(True)
+        self.updates_search_entry.connect("search-changed", self.on_search_changed)
+        search_box.append(self.updates_search_entry)
+        self.updates_sort_dropdown = Gtk.DropDown.new_from_strings(
+            [_(listmodel.SORT_MODE_LABELS[mode]) for mode in listmodel.SORT_MODES]
+        )
+        self.updates_sort_dropdown.connect("notify::selected", self.on_sort_changed)
+        search_box.append(self.updates_sort_dropdown)
+        updates_box.append(search_box)
         self.updates_scrolled = Gtk.ScrolledWindow()
         self.updates_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         self.updates_scrolled.set_min_content_height(50)
         self.updates_scrolled.set_vexpand(True)
-        self.updates_listbox = Gtk.ListBox()
-        self.updates_listbox.add_css_class("boxed-list")
-        self.updates_listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        self.updates_scrolled.set_child(self.updates_listbox)
+        # Only the visible rows are materialised; the store holds lightweight items
+        self.updates_store = Gio.ListStore(item_type=UpdateListItem)
+        self.updates_filter = Gtk.CustomFilter.new(self._update_item_visible)
+        self.updates_filter_model = Gtk.FilterListModel(model=self.updates_store, filter=self.updates_filter)
+        # Sections first, then the chosen sort key; placeholders stay on top of their section
+        self.updates_sorter = Gtk.CustomSorter.new(self._compare_update_items)
+        self.updates_sort_model = Gtk.SortListModel(model=self.updates_filter_model, sorter=self.updates_sorter)
+        self.updates_sort_model.set_section_sorter(Gtk.CustomSorter.new(self._compare_update_sections))
+        self.updates_selection = Gtk.SingleSelection()
+        self.updates_selection.set_autoselect(False)
+        self.updates_selection.set_can_unselect(True)
+        self.updates_selection.set_model(self.updates_sort_model)
+        self.updates_selection.connect("selection-changed", self.on_update_row_selected)
+        self.updates_no_selection = Gtk.NoSelection(model=self.updates_sort_model)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_update_item_setup)
+        factory.connect("bind", self._on_update_item_bind)
+        header_factory = Gtk.SignalListItemFactory()
+        header_factory.connect("setup", self._on_update_header_setup)
+        header_factory.connect("bind", self._on_update_header_bind)
+        self.updates_listview = Gtk.ListView(model=self.updates_no_selection, factory=factory)
+        self.updates_listview.set_header_factory(header_factory)
+        self.updates_listview.add_css_class("card")
+        self.updates_listview.set_show_separators(True)
+        self.updates_scrolled.set_child(self.updates_listview)
         updates_box.append(self.updates_scrolled)
         self.updates_warnings_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
         self.updates_warnings_box.set_margin_top(4)
@@ -305,13 +566,29 @@ class LinexInUpdaterWidget(Gtk.Box):
         self.output_textview.set_right_margin(10)
         self.output_textview.set_top_margin(5)
         self.output_textview.set_bottom_margin(5)
+        # One mark with right gravity stays at the end and is reused for every scroll
+        self.output_end_mark = self.output_buffer.create_mark("log-end", self.output_buffer.get_end_iter(), False)
+        # Store offset where the visible scrollback starts, and whether older pages were loaded
+        self._log_view_start = 0
+        self._log_view_paged = False
+        # The buffer mirrors the log from _log_view_start on; a placeholder is not part of it
+        self._log_view_placeholder = False
         scrolled_window = Gtk.ScrolledWindow()
         scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         scrolled_window.set_child(self.output_textview)
         scrolled_window.set_min_content_height(200)
+        scrolled_window.set_vexpand(True)
+        progress_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.btn_earlier_output = Gtk.Button(label=_("Show earlier output"))
+        self.btn_earlier_output.add_css_class("flat")
+        self.btn_earlier_output.set_halign(Gtk.Align.CENTER)
+        self.btn_earlier_output.set_visible(False)
+        self.btn_earlier_output.connect("clicked", self.on_earlier_output_clicked)
+        progress_box.append(self.btn_earlier_output)
         output_frame = Gtk.Frame()
         output_frame.set_child(scrolled_window)
-        self.content_stack.add_named(output_frame, "progress_view")
+        progress_box.append(output_frame)
+        self.content_stack.add_named(progress_box, "progress_view")
     def setup_controls(self):
         """Setup control buttons and options"""
         controls_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
@@ -381,15 +658,14 @@ class LinexInUpdaterWidget(Gtk.Box):
         controls_box.append(button_box)
         self.controls_box = controls_box
         GLib.idle_add(self.update_controls_min_width)
-        self.setup_info_panel()
+        with TRACER.span("setup_info_panel"):
+            self.setup_info_panel()
 
     def setup_info_panel(self):
         """Setup the wide-mode info panel shown above controls in the right pane."""
         self.info_panel = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
         self.info_panel.set_vexpand(True)
 
-        self._row_selected_handler_id = None
-
         self.info_panel_stack = Gtk.Stack()
         self.info_panel_stack.set_transition_type(Gtk.StackTransitionType.CROSSFADE)
         self.info_panel_stack.set_transition_duration(200)
@@ -552,17 +828,41 @@ class LinexInUpdaterWidget(Gtk.Box):
 
         self.info_panel.append(self.info_panel_stack)
 
+    def run_in_background(self, fn, *args, callback=None, priority=workers.PRIORITY_USER, channel=None):
+        """Run fn on the widget's worker pool and pass its result to callback on the main thread.
+
+        Jobs on the same channel supersede each other: a queued older job is
+        skipped and a result that arrives after a newer submit is dropped.
+        """
+        token = None
+
+        def deliver(result):
+            if self.worker_pool.is_current(token):
+                callback(result)
+            return False
+
+        token = self.worker_pool.submit(
+            fn, *args, priority=priority,
+            channel=channel,
+            on_done=(lambda result: GLib.idle_add(deliver, result)) if callback else None
+        )
+        return token
+
+    def on_destroy(self, widget):
+        """Cancel running probes, stop the worker pool and drop the install log with the widget."""
+        self.probe_engine.cancel()
+        self.worker_pool.shutdown()
+        # Lookups dropped from the queue never finish; forget them so none stays pending
+        self.description_cache.discard_pending()
+        TRACER.write()
+        self.install_log.close()
+
     def get_last_update_time(self):
         """Get the last system update time from pacman log."""
         try:
-            result = subprocess.run(
-                ['grep', '-a', 'starting full system upgrade', '/var/log/pacman.log'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                last_line = result.stdout.strip().splitlines()[-1]
-                timestamp = last_line.split(']')[0].lstrip('[').strip()
-                dt = datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S%z")
+            # Only reads what was appended to the log since the last call
+            dt = self.pacman_log.last_full_upgrade()
+            if dt is not None:
                 now = datetime.datetime.now(datetime.timezone.utc)
                 delta = now - dt
                 if delta.days == 0:
@@ -577,26 +877,9 @@ class LinexInUpdaterWidget(Gtk.Box):
 
     def get_installed_package_count(self):
         """Get the number of installed pacman and flatpak packages."""
-        pacman_count = None
-        flatpak_count = None
-        try:
-            result = subprocess.run(
-                ['pacman', '-Q'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0:
-                pacman_count = len(result.stdout.strip().splitlines())
-        except Exception:
-            pass
-        try:
-            result = subprocess.run(
-                ['flatpak', 'list', '--app'],
-                capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0:
-                flatpak_count = len([l for l in result.stdout.strip().splitlines() if l.strip()])
-        except Exception:
-            pass
+        # Counted from the database directories; unchanged ones cost one stat() each
+        pacman_count = self.installed_counts.pacman_count()
+        flatpak_count = self.installed_counts.flatpak_count()
         if pacman_count is not None and flatpak_count:
             return f"{pacman_count} {_('System')} + {flatpak_count} Flatpak"
         elif pacman_count is not None:
@@ -604,60 +887,71 @@ class LinexInUpdaterWidget(Gtk.Box):
         return ""
 
     def get_download_size(self):
-        """Return total download size for pending pacman/AUR updates as a formatted string, or None."""
-        pkg_names = [u['name'] for u in self.available_updates]
-        if self.include_aur_updates:
-            pkg_names += [u['name'] for u in self.aur_updates]
-        if not pkg_names:
+        """Return what the pending updates still have to download as a formatted string, or None."""
+        estimate = self.download_estimate
+        if estimate is None or estimate.total_bytes <= 0:
             return None
-        try:
-            result = subprocess.run(
-                ['pacman', '-Si'] + pkg_names,
-                capture_output=True, text=True, timeout=20,
-                env={**os.environ, 'LC_ALL': 'C'}
+        if estimate.fetch_bytes == estimate.total_bytes:
+            text = metadata.format_size(estimate.total_bytes)
+        else:
+            # Part of it is already in the pacman cache from an earlier run
+            text = _("{} to download, {} total").format(
+                metadata.format_size(estimate.fetch_bytes), metadata.format_size(estimate.total_bytes)
             )
-            total_bytes = 0.0
-            for line in result.stdout.splitlines():
-                if line.startswith('Download Size'):
-                    _, _, rest = line.partition(':')
-                    parts = rest.strip().split()
-                    if len(parts) >= 2:
-                        try:
-                            value = float(parts[0])
-                            unit = parts[1]
-                            if unit in ('KiB',):
-                                total_bytes += value * 1024
-                            elif unit in ('MiB',):
-                                total_bytes += value * 1024 * 1024
-                            elif unit in ('GiB',):
-                                total_bytes += value * 1024 * 1024 * 1024
-                            else:  # bytes
-                                total_bytes += value
-                        except ValueError:
-                            pass
-            if total_bytes <= 0:
-                return None
-            mb = total_bytes / (1024 * 1024)
-            if mb < 1:
-                return f"{total_bytes / 1024:.1f} KB"
-            elif mb < 1024:
-                return f"{mb:.1f} MB"
-            else:
-                return f"{mb / 1024:.2f} GB"
-        except Exception:
-            return None
+        if estimate.fetch_bytes > 0:
+            seconds = downloadsize.download_seconds(estimate.fetch_bytes)
+            text += " · " + downloadsize.format_duration(seconds)
+        return text
+
+    def rebuild_metadata_index(self):
+        """Collect metadata for the current update list in the background."""
+        self.metadata_index = None
+        self.download_estimate = None
+        repo_names = [u.name for u in self.available_updates]
+        aur_names = [u.name for u in self.aur_updates]
+        flatpak_updates = self.flatpak_updates
+
+        def _build():
+            try:
+                index = metadata.MetadataIndex.build(repo_names, aur_names)
+            except Exception as e:
+                print(f"Metadata index error: {e}")
+                index = metadata.MetadataIndex()
+            try:
+                estimate = downloadsize.estimate(index, repo_names, flatpak_updates)
+            except Exception as e:
+                print(f"Download size error: {e}")
+                estimate = None
+            return index, estimate
+
+        self.run_in_background(
+            _build, callback=self._apply_metadata_index,
+            priority=workers.PRIORITY_BACKGROUND, channel='metadata'
+        )
+
+    def _apply_metadata_index(self, result):
+        """Install a freshly built metadata index and download estimate (main thread)."""
+        self.metadata_index, self.download_estimate = result
+        if self.sort_mode == 'size':
+            self._resort_updates()
+        if self.wide_layout_enabled:
+            self.refresh_info_panel()
+        return False
 
     def get_critical_updates(self):
-        """Return list of critical/core packages found in pending updates."""
-        critical = []
-        all_updates = self.available_updates + self.aur_updates
-        for update in all_updates:
-            name = update.get('name', '').lower()
-            for prefix in CRITICAL_PACKAGE_PREFIXES:
-                if name == prefix or name.startswith(prefix + '-') or name.startswith(prefix):
-                    critical.append(update)
-                    break
-        return critical
+        """Return the critical/core packages found in pending pacman/AUR updates."""
+        return self.critical_updates
+    def set_updates(self, available_updates=None, aur_updates=None, flatpak_updates=None):
+        """Replace the updates of the given sources (dicts or entries) with frozen tuples."""
+        if available_updates is not None:
+            self.available_updates = entries.freeze(available_updates)
+        if aur_updates is not None:
+            self.aur_updates = entries.freeze(aur_updates)
+        if flatpak_updates is not None:
+            self.flatpak_updates = entries.freeze(flatpak_updates)
+        self.critical_updates = tuple(
+            u for source in (self.available_updates, self.aur_updates) for u in source if u.critical
+        )
 
     def refresh_info_panel(self):
         """Update the info panel with current system stats and warnings."""
@@ -667,18 +961,23 @@ class LinexInUpdaterWidget(Gtk.Box):
         def _load_stats():
             last_update = self.get_last_update_time()
             pkg_count = self.get_installed_package_count()
-            # Only run the slow pacman -Si query when the package list is final
+            # Sizes come from the metadata index, which exists once the list is final
             download_size = None if self.checking_updates else self.get_download_size()
-            GLib.idle_add(self._apply_info_panel_stats, last_update, pkg_count, download_size)
+            return last_update, pkg_count, download_size
+
+        def _apply(stats):
+            if stats:
+                self._apply_info_panel_stats(*stats)
 
-        threading.Thread(target=_load_stats, daemon=True).start()
+        # A newer refresh supersedes this one, so fast toggling never piles up jobs
+        self.run_in_background(_load_stats, callback=_apply, channel='info-stats')
 
     def _apply_info_panel_stats(self, last_update, pkg_count, download_size=None, still_checking=False):
         """Apply loaded stats to the info panel (must run on main thread)."""
         self.stats_last_update_row.set_subtitle(last_update)
         self.stats_packages_row.set_subtitle(pkg_count if pkg_count else _("Unknown"))
         # Re-read checking_updates live — avoids stale snapshots from earlier closures
-        if self.checking_updates:
+        if self.checking_updates or self.metadata_index is None:
             self.stats_download_size_row.set_subtitle(_("Calculating..."))
             self.stats_download_size_row.set_visible(True)
         elif download_size:
@@ -688,11 +987,9 @@ class LinexInUpdaterWidget(Gtk.Box):
             self.stats_download_size_row.set_visible(False)
 
         # Update summary
-        all_updates = list(self.available_updates)
+        total = len(self.available_updates) + len(self.flatpak_updates)
         if self.include_aur_updates:
-            all_updates += list(self.aur_updates)
-        all_updates += list(self.flatpak_updates)
-        total = len(all_updates)
+            total += len(self.aur_updates)
 
         if total == 0:
             if self.checking_updates:
@@ -753,7 +1050,7 @@ class LinexInUpdaterWidget(Gtk.Box):
         warn_inner.append(subtitle)
 
         for update in critical:
-            lbl = Gtk.Label(label=f"{update['name']}  {update['current']} → {update['new']}")
+            lbl = Gtk.Label(label=f"{update.name}  {update.current} → {update.new}")
             lbl.set_halign(Gtk.Align.START)
             lbl.add_css_class("caption")
             lbl.set_margin_start(24)
@@ -768,11 +1065,11 @@ class LinexInUpdaterWidget(Gtk.Box):
         """Switch the info panel back to the default stats/warnings view."""
         self.info_panel_stack.set_visible_child_name("default")
         if self.wide_layout_enabled:
-            self.updates_listbox.unselect_all()
+            self.updates_selection.unselect_all()
 
     def show_package_detail(self, update_data):
         """Show package detail in the info panel."""
-        self.detail_name_label.set_text(update_data.get('name', ''))
+        self.detail_name_label.set_text(update_data.name)
 
         # Clear detail list
         while True:
@@ -782,15 +1079,31 @@ class LinexInUpdaterWidget(Gtk.Box):
             self.detail_list.remove(row)
 
         fields = [
-            (_("Current version"), update_data.get('current', ''), "document-edit-symbolic"),
-            (_("New version"), update_data.get('new', ''), "emblem-ok-symbolic"),
-            (_("Type"), update_data.get('type', ''), "application-x-addon-symbolic"),
-            (_("Description of the package"), None, "dialog-information-symbolic"),
+            (_("Current version"), update_data.current, "document-edit-symbolic"),
+            (_("New version"), update_data.new, "emblem-ok-symbolic"),
+            (_("Type"), update_data.type, "application-x-addon-symbolic"),
         ]
-        if update_data.get('repo'):
-            fields.insert(2, (_("Repository"), update_data.get('repo', ''), "folder-remote-symbolic"))
-        if 'app_id' in update_data:
-            fields.append((_("Application ID"), update_data['app_id'], "application-x-executable-symbolic"))
+        info = None
+        if update_data.type != 'flatpak' and self.metadata_index is not None:
+            info = self.metadata_index.get(update_data.name)
+        if info:
+            if info['download_size']:
+                fields.append((_("Download size"), metadata.format_size(info['download_size']), "folder-download-symbolic"))
+            # AUR entries come from the local db and describe the installed version
+            if info['installed_size']:
+                size_title = _("Installed size (installed version)") if info['installed'] else _("Installed size")
+                fields.append((size_title, metadata.format_size(info['installed_size']), "drive-harddisk-symbolic"))
+            date_title = _("Build date (installed version)") if info['installed'] else _("Build date")
+            fields.append((date_title, info['build_date'], "x-office-calendar-symbolic"))
+        fields.append((_("Description of the package"), None, "dialog-information-symbolic"))
+        if update_data.repo:
+            fields.insert(2, (_("Repository"), update_data.repo, "folder-remote-symbolic"))
+        if update_data.type != 'flatpak':
+            kind = vercmp.classify(update_data.current, update_data.new)
+            if kind:
+                fields.insert(2, (_("Update kind"), _(UPDATE_KIND_LABELS[kind]), "view-sort-descending-symbolic"))
+        if update_data.app_id:
+            fields.append((_("Application ID"), update_data.app_id, "application-x-executable-symbolic"))
 
         self.detail_description_row = None
         for title, value, icon_name in fields:
@@ -815,12 +1128,7 @@ class LinexInUpdaterWidget(Gtk.Box):
             self.detail_warning_box.remove(child)
             child = nxt
 
-        name_lower = update_data.get('name', '').lower()
-        is_critical = any(
-            name_lower == p or name_lower.startswith(p + '-') or name_lower.startswith(p)
-            for p in CRITICAL_PACKAGE_PREFIXES
-        )
-        if is_critical:
+        if update_data.critical:
             banner_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
             banner_box.set_margin_top(4)
             warn_icon = Gtk.Image.new_from_icon_name("dialog-warning-symbolic")
@@ -838,63 +1146,45 @@ class LinexInUpdaterWidget(Gtk.Box):
         self._detail_current_update = update_data
         self.detail_update_single_btn.set_visible(not self.install_started)
 
-        # Fetch description asynchronously
-        pkg_name = update_data.get('name', '')
-        pkg_type = update_data.get('type', '')
-        app_id = update_data.get('app_id', '')
-        threading.Thread(
-            target=self._fetch_package_description,
-            args=(pkg_name, pkg_type, app_id),
-            daemon=True
-        ).start()
-
-    def _fetch_package_description(self, pkg_name, pkg_type, app_id):
-        """Fetch package description in a background thread."""
-        desc = None
-        try:
-            if pkg_type == 'flatpak' and app_id:
-                result = subprocess.run(
-                    ['flatpak', 'info', app_id],
-                    capture_output=True, text=True, timeout=10,
-                    env={**os.environ, 'LC_ALL': 'C'}
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.splitlines():
-                        if line.strip().startswith('Description:'):
-                            desc = line.split(':', 1)[1].strip()
-                            break
-            else:
-                result = subprocess.run(
-                    ['pacman', '-Si', pkg_name],
-                    capture_output=True, text=True, timeout=10,
-                    env={**os.environ, 'LC_ALL': 'C'}
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.splitlines():
-                        if line.strip().startswith('Description'):
-                            desc = line.split(':', 1)[1].strip()
-                            break
-                if not desc:
-                    result = subprocess.run(
-                        ['pacman', '-Qi', pkg_name],
-                        capture_output=True, text=True, timeout=10,
-                        env={**os.environ, 'LC_ALL': 'C'}
-                    )
-                    if result.returncode == 0:
-                        for line in result.stdout.splitlines():
-                            if line.strip().startswith('Description'):
-                                desc = line.split(':', 1)[1].strip()
-                                break
-        except Exception:
-            pass
-        final_desc = desc if desc else _("No description available")
-        GLib.idle_add(self._apply_package_description, pkg_name, final_desc)
+        pkg_name = update_data.name
+        key = descriptions.description_key(update_data)
+        if info and info['description']:
+            self.description_cache.put(key, info['description'])
+        found, desc = self.description_cache.get(key)
+        if found:
+            self._apply_package_description(pkg_name, desc or _("No description available"))
+            return
+
+        # Fetch description asynchronously; repeated clicks join the same lookup
+        self.description_cache.request(
+            key,
+            lambda desc: GLib.idle_add(
+                self._apply_package_description, pkg_name, desc or _("No description available")
+            )
+        )
+
+    def _prefetch_neighbour_descriptions(self, position):
+        """Warm the description cache for the rows around the selected one."""
+        keys = []
+        for neighbour in (position - 1, position + 1):
+            if not 0 <= neighbour < self.updates_sort_model.get_n_items():
+                continue
+            item = self.updates_sort_model.get_item(neighbour)
+            if item.kind != 'update':
+                continue
+            update = item.update
+            info = None
+            if update.type != 'flatpak' and self.metadata_index is not None:
+                info = self.metadata_index.get(update.name)
+            if not (info and info['description']):
+                keys.append(descriptions.description_key(update))
+        self.description_cache.prefetch(keys)
 
     def _apply_package_description(self, pkg_name, description):
         """Apply fetched description to the detail view (main thread)."""
         # Only update if still viewing the same package
         if (self._detail_current_update and
-                self._detail_current_update.get('name', '') == pkg_name):
+                self._detail_current_update.name == pkg_name):
             self.detail_description_row.set_subtitle(description)
         return False
 
@@ -920,9 +1210,9 @@ class LinexInUpdaterWidget(Gtk.Box):
             translate_dialog(dialog)
             dialog.present()
             return
-        pkg_name = update_data.get('name', '')
-        pkg_type = update_data.get('type', '')
-        app_id = update_data.get('app_id', '')
+        pkg_name = update_data.name
+        pkg_type = update_data.type
+        app_id = update_data.app_id
         priv_cmd = sudo_manager.wrapper_path
         if pkg_type == 'flatpak':
             command = f"flatpak update --assumeyes {app_id}"
@@ -932,17 +1222,14 @@ class LinexInUpdaterWidget(Gtk.Box):
             command = f"{priv_cmd} pacman -S --noconfirm --overwrite '*' {pkg_name}"
         self.begin_install(command, pkg_name)
 
-    def on_update_row_selected(self, listbox, row):
+    def on_update_row_selected(self, selection, position, n_items):
         """Handle row selection in the updates list (wide mode only)."""
-        if not self.wide_layout_enabled or row is None:
+        if not self.wide_layout_enabled:
             return
-        idx = row.get_index()
-        all_updates = list(self.available_updates)
-        if self.include_aur_updates:
-            all_updates += list(self.aur_updates)
-        all_updates += list(self.flatpak_updates)
-        if 0 <= idx < len(all_updates):
-            self.show_package_detail(all_updates[idx])
+        item = selection.get_selected_item()
+        if item is not None and item.kind == 'update':
+            self.show_package_detail(item.update)
+            self._prefetch_neighbour_descriptions(selection.get_selected())
 
     def get_controls_min_width(self):
         """Measure the minimum width needed for the right-side controls pane"""
@@ -1023,11 +1310,7 @@ class LinexInUpdaterWidget(Gtk.Box):
             self.controls_box.set_valign(Gtk.Align.FILL)
             self.controls_box.prepend(self.info_panel)
             self.info_panel.set_visible(True)
-            self.updates_listbox.set_selection_mode(Gtk.SelectionMode.SINGLE)
-            if self._row_selected_handler_id is None:
-                self._row_selected_handler_id = self.updates_listbox.connect(
-                    "row-selected", self.on_update_row_selected
-                )
+            self.updates_listview.set_model(self.updates_selection)
             self.show_info_panel_default()
             self.refresh_info_panel()
         elif previous_layout is None or force:
@@ -1160,40 +1443,67 @@ class LinexInUpdaterWidget(Gtk.Box):
         if self.info_panel.get_parent() == self.controls_box:
             self.controls_box.remove(self.info_panel)
         self.controls_box.set_valign(Gtk.Align.END)
-        self.updates_listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        if self._row_selected_handler_id is not None:
-            self.updates_listbox.disconnect(self._row_selected_handler_id)
-            self._row_selected_handler_id = None
-
-    def create_update_row(self, package_name, current_version, new_version, repo=""):
-        """Create a row for an update"""
-        row = Gtk.ListBoxRow()
-        row.set_margin_top(6)
-        row.set_margin_bottom(6)
-        row.set_margin_start(12)
-        row.set_margin_end(12)
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-        info_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
-        info_box.set_hexpand(True)
-        name_label = Gtk.Label(label=package_name)
-        name_label.add_css_class("heading")
-        name_label.set_halign(Gtk.Align.START)
-        info_box.append(name_label)
-        if repo:
-            version_text = f"{current_version} → {new_version} ({repo})"
-        else:
-            version_text = f"{current_version} → {new_version}"
-        version_label = Gtk.Label(label=version_text)
-        version_label.add_css_class("caption")
-        version_label.add_css_class("dim-label")
-        version_label.set_halign(Gtk.Align.START)
-        info_box.append(version_label)
-        box.append(info_box)
-        update_icon = Gtk.Image.new_from_icon_name("software-update-available")
-        update_icon.set_pixel_size(16)
-        box.append(update_icon)
-        row.set_child(box)
-        return row
+        self.updates_listview.set_model(self.updates_no_selection)
+
+    def _on_update_item_setup(self, factory, list_item):
+        list_item.set_child(UpdateRow())
+    def _on_update_item_bind(self, factory, list_item):
+        item = list_item.get_item()
+        list_item.set_selectable(item.kind == 'update')
+        list_item.set_activatable(item.kind == 'update')
+        list_item.get_child().bind(item)
+    def _on_update_header_setup(self, factory, list_header):
+        label = Gtk.Label()
+        label.add_css_class("heading")
+        label.set_halign(Gtk.Align.START)
+        label.set_margin_top(12)
+        label.set_margin_bottom(6)
+        label.set_margin_start(12)
+        list_header.set_child(label)
+    def _on_update_header_bind(self, factory, list_header):
+        title = listmodel.SECTION_TITLES.get(list_header.get_item().section)
+        label = list_header.get_child()
+        label.set_visible(bool(title))
+        if title:
+            label.set_label(_(title))
+    def _update_item_visible(self, item):
+        """Filter function of the list: AUR entries follow the AUR switch, updates the search"""
+        if item.source == 'aur' and not self.include_aur_updates:
+            return False
+        return item.kind != 'update' or self.search_query in item.search_text
+    def _compare_update_sections(self, a, b):
+        return _ordering(a.section_rank, b.section_rank)
+    def _compare_update_items(self, a, b):
+        return _ordering((a.kind != 'placeholder', a.sort_key), (b.kind != 'placeholder', b.sort_key))
+    def _update_sort_key(self, update):
+        """Precompute the sort key of an update for the current sort mode"""
+        # Flatpak sizes come with the update from the probe
+        size = update.download_size
+        if self.sort_mode == 'size' and update.type != 'flatpak' and self.metadata_index is not None:
+            info = self.metadata_index.get(update.name)
+            size = (info and info['download_size']) or size
+        return listmodel.sort_key(update, self.sort_mode, size)
+    def _resort_updates(self):
+        """Recompute every sort key and let the sort model reorder the list"""
+        for items in self._section_items.values():
+            for item in items:
+                item.sort_key = self._update_sort_key(item.update)
+        self.updates_sorter.changed(Gtk.SorterChange.DIFFERENT)
+    def on_sort_changed(self, dropdown, param):
+        """Handle a new choice in the sort dropdown"""
+        self.sort_mode = listmodel.SORT_MODES[dropdown.get_selected()]
+        self._resort_updates()
+    def on_search_changed(self, entry):
+        """Filter the list by the search text, re-checking only entries that can change"""
+        query = entry.get_text().strip().lower()
+        change = listmodel.filter_change(self.search_query, query)
+        self.search_query = query
+        if change == 'more':
+            self.updates_filter.changed(Gtk.FilterChange.MORE_STRICT)
+        elif change == 'less':
+            self.updates_filter.changed(Gtk.FilterChange.LESS_STRICT)
+        elif change == 'different':
+            self.updates_filter.changed(Gtk.FilterChange.DIFFERENT)
     def on_refresh_clicked(self, button):
         """Handle refresh button click"""
         if not self.checking_updates and not self.install_started:
@@ -1203,77 +1513,164 @@ class LinexInUpdaterWidget(Gtk.Box):
     def on_aur_toggled(self, switch, param):
         """Handle AUR toggle switch"""
         self.include_aur_updates = switch.get_active()
-        self.update_displayed_updates()
+        self.updates_filter.changed(
+            Gtk.FilterChange.LESS_STRICT if self.include_aur_updates else Gtk.FilterChange.MORE_STRICT
+        )
+        self._update_list_status()
     def update_displayed_updates(self):
         """Update the displayed updates list based on AUR toggle"""
-        child = self.updates_listbox.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.updates_listbox.remove(child)
-            child = next_child
-        if self.include_aur_updates:
-            total_updates = len(self.available_updates) + len(self.flatpak_updates) + len(self.aur_updates)
+        for source in probes.SOURCES:
+            self._render_section(source)
+        self._update_list_status()
+    def _section_updates(self, source):
+        """Return the updates shown in one section of the list"""
+        if source == 'pacman':
+            return self.available_updates
+        if source == 'aur':
+            return self.aur_updates if self.include_aur_updates else ()
+        return self.flatpak_updates
+    def _section_position(self, source):
+        """Return the store index where a section starts (the end of all sections for None)"""
+        pos = 0
+        for name in probes.SOURCES:
+            if name == source:
+                break
+            pos += len(self._section_items[name])
+            if name in self._section_placeholders:
+                pos += 1
+        return pos
+    def _show_section_placeholder(self, source):
+        """Insert a "checking" entry at the top of a section"""
+        if source in self._section_placeholders:
+            return
+        item = UpdateListItem('placeholder', source)
+        self.updates_store.insert(self._section_position(source), item)
+        self._section_placeholders[source] = item
+    def _remove_section_placeholder(self, source):
+        if source in self._section_placeholders:
+            self.updates_store.remove(self._section_position(source))
+            del self._section_placeholders[source]
+    def _render_section(self, source):
+        """Reconcile the entries of one section with its update list.
+
+        Entries are keyed by package (or app id): unchanged entries are
+        reused, and only the span between the unchanged head and tail of
+        the section is spliced into the store, so the list view rebinds
+        just the rows that changed. Other sections are not touched. The
+        store keeps probe order; sorting and sections are applied on top
+        by the sort model.
+        """
+        if source == 'pacman':
+            updates = self.available_updates
+        elif source == 'aur':
+            updates = self.aur_updates
         else:
-            total_updates = len(self.available_updates) + len(self.flatpak_updates)
-        if total_updates == 0:
+            updates = self.flatpak_updates
+        old_items = self._section_items[source]
+        old_by_key = {item.key: item for item in old_items}
+        items = []
+        for update in updates:
+            item = old_by_key.get(update.key)
+            if item is None or item.update != update:
+                item = UpdateListItem('update', source, update)
+            else:
+                item.update = update
+            item.sort_key = self._update_sort_key(update)
+            items.append(item)
+        limit = min(len(old_items), len(items))
+        head = 0
+        while head < limit and old_items[head] is items[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old_items[-1 - tail] is items[-1 - tail]:
+            tail += 1
+        removed = len(old_items) - head - tail
+        added = items[head:len(items) - tail]
+        if removed or added:
+            pos = self._section_position(source) + (1 if source in self._section_placeholders else 0)
+            self.updates_store.splice(pos + head, removed, added)
+        self._section_items[source] = items
+    def _clear_status_rows(self):
+        """Remove the "no updates" / error entries from the end of the list"""
+        if self._status_items:
+            self.updates_store.splice(self._section_position(None), len(self._status_items), [])
+            self._status_items = []
+    def _append_status_row(self, kind):
+        item = UpdateListItem(kind)
+        self.updates_store.append(item)
+        self._status_items.append(item)
+    def _update_list_status(self):
+        """Refresh subtitle, install button and empty state from the shown sections"""
+        self._clear_status_rows()
+        total_updates = sum(len(self._section_updates(source)) for source in probes.SOURCES)
+        failed = [
+            _(listmodel.SECTION_TITLES[listmodel.SOURCE_SECTIONS[source]]) for source in probes.SOURCES
+            if source in self.failed_sources and (source != 'aur' or self.include_aur_updates)
+        ]
+        if self.checking_updates:
+            self.updates_subtitle.set_text(_("Checking for updates..."))
+            self.btn_install.set_sensitive(False)
+        elif total_updates == 0 and failed:
+            # Nothing is known to be pending, but the system is not known to be current either
+            self.updates_subtitle.set_text(_("Could not check {}").format(", ".join(failed)))
+            self.btn_install.set_sensitive(False)
+            self._append_status_row('error')
+        elif total_updates == 0:
             self.updates_subtitle.set_text(_("System is up to date"))
             self.btn_install.set_sensitive(False)
-            row = Gtk.ListBoxRow()
-            row.set_selectable(False)
-            row.set_vexpand(True)
-            box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-            box.set_valign(Gtk.Align.CENTER)
-            box.set_halign(Gtk.Align.CENTER)
-            box.set_vexpand(True)
-            icon = Gtk.Image.new_from_icon_name("emblem-ok")
-            if os.path.exists("/usr/share/icons/confirm.svg"):
-                icon.set_from_file("/usr/share/icons/confirm.svg")
-            else:
-                icon.set_from_icon_name("emblem-ok")            
-            icon.set_pixel_size(48)
-            box.append(icon)
-            label = Gtk.Label(label=_("No updates available"))
-            label.add_css_class("title-3")
-            box.append(label)
-            row.set_child(box)
-            self.updates_listbox.append(row)
+            self._append_status_row('empty')
         else:
             if total_updates == 1:
-                self.updates_subtitle.set_text(_("1 update available"))
+                subtitle = _("1 update available")
             else:
-                self.updates_subtitle.set_text(_("{} updates available").format(total_updates))
+                subtitle = _("{} updates available").format(total_updates)
+            if failed:
+                subtitle += " · " + _("Could not check {}").format(", ".join(failed))
+                self._append_status_row('error')
+            self.updates_subtitle.set_text(subtitle)
             self.btn_install.set_sensitive(True)
-            for update in self.available_updates:
-                row = self.create_update_row(
-                    update['name'], 
-                    update['current'], 
-                    update['new'], 
-                    update['repo']
-                )
-                self.updates_listbox.append(row)
-            if self.include_aur_updates:
-                for update in self.aur_updates:
-                    row = self.create_update_row(
-                        update['name'], 
-                        update['current'], 
-                        update['new'], 
-                        update['repo']
-                    )
-                    self.updates_listbox.append(row)
-            for update in self.flatpak_updates:
-                row = self.create_update_row(
-                    update['name'], 
-                    update['current'], 
-                    update['new'], 
-                    update['repo']
-                )
-                self.updates_listbox.append(row)
         if self.wide_layout_enabled:
             self.refresh_info_panel()
-    def check_for_updates(self):
-        """Check for available updates without root privileges"""
+    def check_for_updates(self, use_cache=False, refresh_databases=True):
+        """Check for available updates without root privileges.
+
+        With use_cache, a valid result from the background daemon or the
+        disk cache is shown right away and the probes only run to
+        revalidate it once it is no longer fresh. Without refresh_databases,
+        recently synced pacman databases are read directly.
+        """
         if self.checking_updates:
             return
+        if use_cache:
+            def _load_cached():
+                cached = daemon.load_daemon_result() or cache.load_cached_result()
+                if cached is None:
+                    return None
+                # The first critical-rule lookup scans the local pacman db, so freeze off the main thread
+                frozen = tuple(entries.freeze(cached[key]) for key in ('available_updates', 'aur_updates', 'flatpak_updates'))
+                return frozen, cached['fresh']
+            self.run_in_background(
+                _load_cached, callback=lambda result: self._apply_cached_result(result, refresh_databases),
+                channel='cached-result'
+            )
+            return
+        self._start_update_check(refresh_databases)
+    def _apply_cached_result(self, result, refresh_databases):
+        """Show a cached result (main thread) and revalidate it unless it is fresh"""
+        # A check started meanwhile will deliver newer results
+        if self.checking_updates:
+            return
+        if result is not None:
+            frozen, fresh = result
+            self.set_updates(*frozen)
+            self.rebuild_metadata_index()
+            self.update_displayed_updates()
+            TRACER.instant("first list populated", once=True)
+            if fresh:
+                return
+        self._start_update_check(refresh_databases)
+    def _start_update_check(self, refresh_databases):
+        """Run the probes on a worker and merge each source as it finishes"""
         self.checking_updates = True
         self.refresh_button.set_sensitive(False)
         self.btn_install.set_sensitive(False)
@@ -1281,158 +1678,81 @@ class LinexInUpdaterWidget(Gtk.Box):
         if hasattr(self, 'stats_download_size_row'):
             self.stats_download_size_row.set_subtitle(_("Calculating..."))
             self.stats_download_size_row.set_visible(True)
-        child = self.updates_listbox.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.updates_listbox.remove(child)
-            child = next_child
+        # Rows from the previous check stay on screen until their section is re-probed
+        self._clear_status_rows()
+        for source in probes.SOURCES:
+            if source != 'aur' or self.include_aur_updates:
+                self._show_section_placeholder(source)
+        token = None
+        def deliver(handler, *args):
+            # Dropped if the widget was destroyed while the probes were running
+            if self.worker_pool.is_current(token):
+                handler(*args)
+            return False
+        def on_result(source, updates):
+            # Freezing here keeps critical-rule lookups off the main thread
+            GLib.idle_add(deliver, self.on_source_checked, source, entries.freeze(updates))
         def check_updates():
+            fingerprint = cache.database_fingerprint()
             try:
-                self.available_updates = []
-                self.aur_updates = []
-                self.flatpak_updates = []
-                ignored_pkgs = set()
-                try:
-                    with open('/etc/pacman.conf', 'r') as f:
-                        for cline in f:
-                            cline = cline.strip()
-                            if cline.startswith('IgnorePkg'):
-                                _, _, value = cline.partition('=')
-                                ignored_pkgs.update(value.strip().split())
-                except Exception:
-                    pass
-                try:
-                    result = subprocess.run(['checkupdates'], 
-                                          capture_output=True, text=True, timeout=30, env={**os.environ, 'LC_ALL': 'C'})
-                    if result.returncode == 0 and result.stdout.strip():
-                        for line in result.stdout.strip().split('\n'):
-                            if ' ' in line:
-                                parts = line.split()
-                                if len(parts) >= 4:
-                                    package = parts[0]
-                                    if package in ignored_pkgs:
-                                        continue
-                                    current_version = parts[1]
-                                    arrow = parts[2]                  
-                                    new_version = parts[3]
-                                    repo = parts[4] if len(parts) > 4 else ""
-                                    self.available_updates.append({
-                                        'name': package,
-                                        'current': current_version,
-                                        'new': new_version,
-                                        'repo': repo,
-                                        'type': 'pacman'
-                                    })
-                except (subprocess.SubprocessError, FileNotFoundError):
-                    pass                                        
-                try:
-                    result = subprocess.run(['paru', '-Qu'], 
-                                          capture_output=True, text=True, timeout=30, env={**os.environ, 'LC_ALL': 'C'})
-                    if result.returncode == 0 and result.stdout.strip():
-                        for line in result.stdout.strip().split('\n'):
-                            if ' ' in line:
-                                parts = line.split()
-                                if len(parts) >= 4:
-                                    package = parts[0]
-                                    if package in ignored_pkgs:
-                                        continue
-                                    current_version = parts[1]
-                                    arrow = parts[2] 
-                                    new_version = parts[3]
-                                    repo = parts[4] if len(parts) > 4 else ""
-                                    is_duplicate = any(pkg['name'] == package for pkg in self.available_updates)
-                                    if not is_duplicate:
-                                        self.aur_updates.append({
-                                            'name': package,
-                                            'current': current_version,
-                                            'new': new_version,
-                                            'repo': repo if repo else "AUR",
-                                            'type': 'AUR'
-                                        })
-                except (subprocess.SubprocessError, FileNotFoundError):
-                    pass                                        
-                try:
-                    all_flatpak_updates = []
-                    seen_ids = set()
-                    def get_updates_for_scope(scope_flag, scope_name):
-                        updates = []
-                        try:
-                            remotes_cmd = ['flatpak', 'remotes', scope_flag, '--columns=name']
-                            res = subprocess.run(remotes_cmd, capture_output=True, text=True, timeout=10, env={**os.environ, 'LC_ALL': 'C'})
-                            if res.returncode != 0:
-                                return updates
-                            remotes = [r.strip() for r in res.stdout.strip().split('\n') if r.strip()]
-                            for remote in remotes:
-                                try:
-                                    cmd = ['flatpak', 'remote-ls', scope_flag, '--updates', '--columns=ref,version', remote]
-                                    r_res = subprocess.run(cmd, capture_output=True, text=True, timeout=15, env={**os.environ, 'LC_ALL': 'C'})
-                                    if r_res.returncode == 0 and r_res.stdout.strip():
-                                        for line in r_res.stdout.strip().split('\n'):
-                                            parts = line.split()
-                                            if len(parts) >= 1:
-                                                ref = parts[0]
-                                                version = parts[1] if len(parts) > 1 else ""
-                                                ref_parts = ref.split('/')
-                                                if len(ref_parts) >= 4:
-                                                    app_id = ref_parts[1]
-                                                    branch = ref_parts[3]
-                                                    updates.append({
-                                                        'name': app_id.split('.')[-1] if '.' in app_id else app_id,
-                                                        'current': _("installed"),
-                                                        'new': version if version else _("new version"),
-                                                        'repo': f"{remote} ({scope_name})",
-                                                        'app_id': app_id,
-                                                        'type': 'flatpak'
-                                                    })
-                                except Exception:
-                                    continue                              
-                        except Exception:
-                            pass
-                        return updates
-                    sys_ups = get_updates_for_scope('--system', 'system')
-                    for up in sys_ups:
-                        if up['app_id'] not in seen_ids:
-                            all_flatpak_updates.append(up)
-                            seen_ids.add(up['app_id'])
-                    user_ups = get_updates_for_scope('--user', 'user')
-                    for up in user_ups:
-                        if up['app_id'] not in seen_ids:
-                            all_flatpak_updates.append(up)
-                            seen_ids.add(up['app_id'])
-                    self.flatpak_updates = all_flatpak_updates
-                except Exception as e:
-                    print(f"Flatpak check error: {e}")
+                results = self.probe_engine.run(on_result=on_result, refresh_databases=refresh_databases)
             except Exception as e:
-                GLib.idle_add(self.on_update_check_error, str(e))
+                GLib.idle_add(deliver, self.on_update_check_error, str(e))
                 return
-            GLib.idle_add(self.on_updates_checked)
-        threading.Thread(target=check_updates, daemon=True).start()
-    def on_updates_checked(self):
+            # A failed or cancelled source reports [], which must never be cached as "no updates"
+            if self.probe_engine.complete:
+                cache.save_result(results['pacman'], results['aur'], results['flatpak'], fingerprint)
+            incomplete = frozenset(self.probe_engine.failed_sources | self.probe_engine.cancelled_sources)
+            results = {source: entries.freeze(updates) for source, updates in results.items()}
+            GLib.idle_add(deliver, self.on_updates_checked, results, incomplete)
+        token = self.worker_pool.submit(
+            check_updates, priority=workers.PRIORITY_USER, channel='update-check'
+        )
+    def on_source_checked(self, source, updates):
+        """Merge the result of one update source into the list as soon as it arrives"""
+        if source == 'pacman':
+            self.set_updates(available_updates=updates)
+            repo_names = {u.name for u in self.available_updates}
+            aur_updates = [u for u in self.aur_updates if u.name not in repo_names]
+            if len(aur_updates) != len(self.aur_updates):
+                self.set_updates(aur_updates=aur_updates)
+                self._render_section('aur')
+        elif source == 'aur':
+            repo_names = {u.name for u in self.available_updates}
+            self.set_updates(aur_updates=[u for u in updates if u.name not in repo_names])
+        else:
+            self.set_updates(flatpak_updates=updates)
+        self._remove_section_placeholder(source)
+        self._render_section(source)
+        self._update_list_status()
+        TRACER.instant("first list populated", once=True)
+        return False
+    def on_updates_checked(self, results, incomplete=frozenset()):
         """Handle completion of update check"""
         self.checking_updates = False
         self.refresh_button.set_sensitive(True)
+        # A failed or cancelled source reports [], so it keeps the entries it had
+        self.failed_sources = incomplete
+        updates = {source: None if source in incomplete else results[source] for source in probes.SOURCES}
+        self.set_updates(updates['pacman'], updates['aur'], updates['flatpak'])
+        for source in probes.SOURCES:
+            self._remove_section_placeholder(source)
+        self.rebuild_metadata_index()
         self.update_displayed_updates()
+        TRACER.instant("update check finished", once=True)
+        TRACER.write()
         return False
     def on_update_check_error(self, error_msg):
         """Handle update check error"""
         self.checking_updates = False
         self.refresh_button.set_sensitive(True)
+        self.failed_sources = frozenset(probes.SOURCES)
         self.updates_subtitle.set_text(_("Error checking updates"))
         self.btn_install.set_sensitive(False)
-        row = Gtk.ListBoxRow()
-        row.set_selectable(False)
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
-        box.set_halign(Gtk.Align.CENTER)
-        icon = Gtk.Image.new_from_icon_name("dialog-error")
-        icon.set_pixel_size(24)
-        box.append(icon)
-        label = Gtk.Label(label=_("Failed to check for updates"))
-        label.add_css_class("error")
-        box.append(label)
-        row.set_child(box)
-        self.updates_listbox.append(row)
+        for source in probes.SOURCES:
+            self._remove_section_placeholder(source)
+        self._clear_status_rows()
+        self._append_status_row('error')
         return False
     def get_aur_helper_rebuild_command(self):
         """Check if AUR helper needs to be rebuilt (returns True/False)"""
@@ -1570,8 +1890,24 @@ class LinexInUpdaterWidget(Gtk.Box):
                 privileged_cmds += f" && echo 'Reinstalling paru to relink against new libalpm...' && {priv_cmd} pacman -S --noconfirm paru"
             command = f"echo Updating {product_name}... && {privileged_cmds}"
             command += " && { flatpak update --assumeyes || true; }"
-        self.begin_install(command, product_name)
-    def begin_install(self, command, product_name):
+        self.begin_install(command, product_name, progress=self._plan_install_progress())
+    def _plan_install_progress(self):
+        """Plan the phases of a full update for the overall progress bar."""
+        repo_count = len(self.available_updates)
+        aur_count = len(self.aur_updates) if self.include_aur_updates else 0
+        download_bytes = 0
+        download_count = None
+        estimate = self.download_estimate
+        if estimate is not None:
+            # Only what pacman still fetches; cached packages are skipped
+            download_bytes = estimate.fetch_bytes - estimate.flatpak_bytes
+            download_count = estimate.fetch_count
+        model = progressmodel.ProgressModel(
+            repo_count, aur_count, len(self.flatpak_updates), download_bytes,
+            download_count=download_count, history=progressmodel.load_history()
+        )
+        return model if model else None
+    def begin_install(self, command, product_name, progress=None):
         """Start the installation process"""
         self.install_started = True
         self.btn_install.set_sensitive(False)
@@ -1590,111 +1926,221 @@ class LinexInUpdaterWidget(Gtk.Box):
         self.install_progress_bar.set_visible(True)
         self.install_status_label.set_text("")
         self.install_status_label.set_visible(True)
-        self._install_total_packages = 0
+        # Without a plan the bar falls back to the raw (n/m) counters
+        self.install_progress = progress
         self.content_stack.set_visible_child_name("info_view")
         if hasattr(self, 'updating_label'):
             self.updating_label.set_text(_("Updating {}...").format(product_name))
             self.updating_sublabel.set_text(_("Do not shut down or close the application"))
             self.info_panel_stack.set_visible_child_name("updating")
-        self.progress_data = ""
+        self.install_log.close()
+        # Each run is also kept on disk under $XDG_STATE_HOME/linexin-updater
+        self.install_log = runlog.open_run_log()
         self.progress_visible = False
         self.btn_toggle_progress.set_label(_("Show Progress"))
         self.output_buffer.set_text("")
         self.last_command = command
         self.retry_in_progress = False
         self.detected_alpm_error = False
+        # The result sound is minutes away; get GStreamer ready while the UI is idle
+        GLib.idle_add(self.sound_player.preload, priority=GLib.PRIORITY_LOW)
         self.run_shell_command(command)
     def on_toggle_progress_clicked(self, button):
         """Handle progress toggle button"""
         self.progress_visible = not self.progress_visible
         if self.progress_visible:
             self.btn_toggle_progress.set_label(_("Hide Progress"))
-            self.output_buffer.set_text(self.progress_data or _("[console output]"))
+            self._load_log_tail()
             self.content_stack.set_visible_child_name("progress_view")
             GLib.timeout_add(50, self.scroll_to_end)
         else:
             self.btn_toggle_progress.set_label(_("Show Progress"))
             self.content_stack.set_visible_child_name("info_view")
+    def _load_log_tail(self):
+        """Show the last lines of the install log in the progress view."""
+        if self._output_batcher is not None and not self._output_batcher.closed:
+            # Atomic with the reader thread: later flushes continue exactly where this ends
+            start, text = self._output_batcher.restart_view(installlog.SCROLLBACK_LINES)
+        else:
+            start, text = self.install_log.tail_lines(installlog.SCROLLBACK_LINES)
+        self._log_view_start = start
+        self._log_view_paged = False
+        self._log_view_placeholder = not text
+        self.output_buffer.set_text(text or _("[console output]"))
+        self.btn_earlier_output.set_visible(start > 0)
+
+    def on_earlier_output_clicked(self, button):
+        """Page the previous block of output from the log store into the view."""
+        start, text = self.install_log.tail_lines(installlog.SCROLLBACK_PAGE_LINES, end=self._log_view_start)
+        if text:
+            if self._log_view_placeholder:
+                self._log_view_placeholder = False
+                self.output_buffer.set_text("")
+            self.output_buffer.insert(self.output_buffer.get_start_iter(), text)
+        self._log_view_start = start
+        # Keep what the user paged in until the view is reopened
+        self._log_view_paged = True
+        self.btn_earlier_output.set_visible(start > 0)
+
+    def _trim_log_view(self):
+        """Drop lines from the head of the view once it is well past the scrollback size."""
+        line_count = self.output_buffer.get_line_count()
+        if self._log_view_paged or line_count <= installlog.SCROLLBACK_LINES * 11 // 10:
+            return
+        found, cut = self.output_buffer.get_iter_at_line(line_count - installlog.SCROLLBACK_LINES)
+        if not found:
+            return
+        self._log_view_start += cut.get_offset()
+        self.output_buffer.delete(self.output_buffer.get_start_iter(), cut)
+        self.btn_earlier_output.set_visible(True)
+
     def append_to_log(self, text):
-        """Append text to output buffer, scroll, and update progress bar."""
+        """Append text to output buffer and scroll."""
         if self.progress_visible:
-            end_iter = self.output_buffer.get_end_iter()
-            self.output_buffer.insert(end_iter, text)
-            mark = self.output_buffer.create_mark(None, end_iter, False)
-            self.output_textview.scroll_to_mark(mark, 0.0, True, 0.0, 1.0)
-        self._parse_install_progress(text)
+            if self._log_view_placeholder:
+                self._log_view_placeholder = False
+                self.output_buffer.set_text("")
+            self.output_buffer.insert(self.output_buffer.get_end_iter(), text)
+            self._trim_log_view()
+            self.output_textview.scroll_to_mark(self.output_end_mark, 0.0, True, 0.0, 1.0)
         return False
 
-    # Regex to match pacman progress lines like "(1/89) upgrading package..."
-    _PROGRESS_RE = re.compile(r'^\((\d+)/(\d+)\)\s+(.*)')
-
-    def _parse_install_progress(self, text):
-        """Parse pacman output lines to update the progress bar."""
-        for line in text.splitlines():
-            line = line.strip()
-            m = self._PROGRESS_RE.match(line)
-            if m:
-                current = int(m.group(1))
-                total = int(m.group(2))
-                action = m.group(3).strip()
-                if total > 0:
-                    fraction = current / total
-                    self.install_progress_bar.set_fraction(fraction)
-                    self.install_progress_bar.set_text(f"{current}/{total}")
-                    # Truncate long action text
-                    if len(action) > 60:
-                        action = action[:57] + "..."
-                    self.install_status_label.set_text(action)
-                    # Update info panel updating view if visible
-                    if hasattr(self, 'updating_sublabel'):
-                        self.updating_sublabel.set_text(f"{current}/{total} — {action}")
+    def _apply_install_progress(self, current, total, action):
+        """Show parsed pacman progress in the progress bar and status labels."""
+        self.install_progress_bar.set_fraction(current / total)
+        self.install_progress_bar.set_text(f"{current}/{total}")
+        # Truncate long action text
+        if len(action) > 60:
+            action = action[:57] + "..."
+        self.install_status_label.set_text(action)
+        # Update info panel updating view if visible
+        if hasattr(self, 'updating_sublabel'):
+            self.updating_sublabel.set_text(f"{current}/{total} — {action}")
+
+    def _apply_overall_progress(self, action):
+        """Show the weighted progress of the whole run and its ETA."""
+        model = self.install_progress
+        fraction = model.fraction()
+        percent = f"{int(fraction * 100)}%"
+        self.install_progress_bar.set_fraction(fraction)
+        self.install_progress_bar.set_text(percent)
+        if action:
+            if len(action) > 60:
+                action = action[:57] + "..."
+            self.install_status_label.set_text(action)
+        if hasattr(self, 'updating_sublabel'):
+            eta = model.eta()
+            if eta is not None:
+                self.updating_sublabel.set_text(f"{percent} — {progressmodel.format_eta(eta)}")
+            else:
+                self.updating_sublabel.set_text(percent)
+
+    def _handle_output_events(self, events):
+        """React to the events parsed from one batch of command output."""
+        model = self.install_progress
+        progress = None
+        for event in events:
+            if model is not None:
+                model.handle(event)
+            if isinstance(event, (outputparser.StepProgress, outputparser.FlatpakStep, outputparser.AurBuild)):
+                progress = event
+            elif isinstance(event, outputparser.OutputError):
+                if event.reason == 'libalpm':
+                    self.detected_alpm_error = True
+            elif isinstance(event, outputparser.Prompt):
+                self.install_status_label.set_text(_("Waiting for input: {}").format(event.text))
+        # Only the newest step is worth drawing
+        if model is not None:
+            if isinstance(progress, outputparser.StepProgress):
+                self._apply_overall_progress(progress.text)
+            elif isinstance(progress, outputparser.FlatpakStep):
+                self._apply_overall_progress(f"{progress.action} {progress.ref}".strip())
+            elif isinstance(progress, outputparser.AurBuild):
+                self._apply_overall_progress(_("Building {}").format(progress.name))
+            else:
+                self._apply_overall_progress(None)
+        elif isinstance(progress, outputparser.StepProgress):
+            self._apply_install_progress(progress.current, progress.total, progress.text)
+        elif isinstance(progress, outputparser.FlatpakStep):
+            self._apply_install_progress(progress.current, progress.total, f"{progress.action} {progress.ref}".strip())
+
+    def _flush_output(self):
+        """Move queued command output into the log view and progress bar (runs at ~30 Hz)."""
+        batcher = self._output_batcher
+        if batcher is None:
+            self._output_flush_id = None
+            return False
+        # Read closed first so lines pushed right before close() are still drained
+        closed = batcher.closed
+        text, events, dropped = batcher.drain()
+        if dropped and self.progress_visible:
+            # The view missed lines; reload its tail so it stays an exact slice of the log
+            self._load_log_tail()
+            GLib.idle_add(self.scroll_to_end)
+        elif text:
+            self.append_to_log(text)
+        if events:
+            self._handle_output_events(events)
+        if closed:
+            self._output_flush_id = None
+            return False
+        return True
+
+    def _stop_output_flush(self):
+        """Stop the flush tick and drain whatever output is still queued."""
+        if self._output_flush_id is not None:
+            GLib.source_remove(self._output_flush_id)
+            self._output_flush_id = None
+        if self._output_batcher is not None:
+            self._output_batcher.close()
+            self._flush_output()
 
     def run_shell_command(self, command):
         """Execute shell command in a separate thread"""
+        self._stop_output_flush()
+        batcher = installlog.OutputBatcher(log=self.install_log)
+        self._output_batcher = batcher
+        self._output_flush_id = GLib.timeout_add(installlog.FLUSH_INTERVAL_MS, self._flush_output)
         def stream_output():
-            if sudo_manager:
-                sudo_manager.start_privileged_session()
             try:
+                # Inside the try so a failure still reaches finish_installation and closes the run log
+                if sudo_manager:
+                    sudo_manager.start_privileged_session()
                 env = sudo_manager.get_env()
                 env['PACMAN_AUTH'] = sudo_manager.wrapper_path
                 process = subprocess.Popen(command,
                     shell=True,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
                     env=env                              
                 )
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        if "error while loading shared libraries: libalpm.so" in line:
-                            self.detected_alpm_error = True
-                        self.progress_data += line
-                        GLib.idle_add(self.append_to_log, line)
+                # Read whatever is available instead of line by line; the
+                # batcher splits lines and sees prompts that lack a newline
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                while True:
+                    data = process.stdout.read1(65536)
+                    if not data:
+                        break
+                    batcher.feed(decoder.decode(data))
+                batcher.feed(decoder.decode(b'', final=True))
                 process.stdout.close()
                 return_code = process.wait()
                 if return_code != 0:
                     self.error_message = _("Process exited with code {}").format(return_code)
             except Exception as e:
                 self.error_message = str(e)
-                self.progress_data += _("\nError: {}").format(e)
-                GLib.idle_add(self.append_to_log, _("\nError: {}").format(e))
+                batcher.feed(_("\nError: {}").format(e) + "\n")
+            batcher.close()
             GLib.idle_add(self.finish_installation)
         threading.Thread(target=stream_output, daemon=True).start()
-    def update_output_buffer(self, text):
-        """Update the output buffer with new text"""
-        if self.progress_visible:
-            self.output_buffer.set_text(text)
-            GLib.idle_add(self.scroll_to_end)
-        return False
     def scroll_to_end(self):
         """Scroll text view to the end"""
-        end_iter = self.output_buffer.get_end_iter()
-        self.output_textview.scroll_to_iter(end_iter, 0.0, False, 0.0, 0.0)
+        self.output_textview.scroll_to_mark(self.output_end_mark, 0.0, False, 0.0, 0.0)
         return False
     def finish_installation(self):
         """Handle installation completion"""
+        self._stop_output_flush()
+        self.install_log.flush()
         if sudo_manager:
              sudo_manager.stop_privileged_session()
         
@@ -1703,7 +2149,7 @@ class LinexInUpdaterWidget(Gtk.Box):
             self.error_message = None                                        
             self.detected_alpm_error = False                  
             repair_msg = f"\n\n{_('--- DETECTED BROKEN PARU: Compiling fresh source from AUR... ---')}\n"
-            self.progress_data += repair_msg
+            self.install_log.append(repair_msg)
             self.append_to_log(repair_msg)
             priv = sudo_manager.wrapper_path
             repair_cmd = (
@@ -1723,6 +2169,8 @@ class LinexInUpdaterWidget(Gtk.Box):
             retry_cmd = f"{repair_cmd} && echo '--- Repair complete, retrying system update... ---' && {self.last_command}"
             self.run_shell_command(retry_cmd)
             return False
+        # The run is over, failed or not; the view can still page through the closed log
+        self.install_log.close()
         if sudo_manager:
             sudo_manager.forget_password()
         self.user_password = None
@@ -1734,6 +2182,7 @@ class LinexInUpdaterWidget(Gtk.Box):
         self.btn_toggle_progress.set_sensitive(True)
         self.install_progress_bar.set_visible(False)
         self.install_status_label.set_visible(False)
+        progress, self.install_progress = self.install_progress, None
         if self.error_message:
             self.info_label.set_markup(f'<span color="#e01b24" weight="bold" size="large">{_("Installation failed: ")}</span>\n{self.error_message}')
             self.sound_player.play_sound("/usr/share/linexin/widgets/sounds/fail.ogg")
@@ -1744,6 +2193,12 @@ class LinexInUpdaterWidget(Gtk.Box):
             if hasattr(self, 'toggle_button'):
                 self.toggle_button.set_visible(False)
         else:
+            if progress is not None:
+                # Remember how long each phase took so the next ETA starts closer
+                self.run_in_background(
+                    progressmodel.save_history, progress.finish(),
+                    priority=workers.PRIORITY_BACKGROUND, channel='progress-history'
+                )
             self.info_label.set_markup(f'<span color="#2ec27e" weight="bold" size="large">{_("Successfully updated your {}!").format(self.current_product)}</span>')
             self.sound_player.play_sound("/usr/share/linexin/widgets/sounds/confirm.ogg")
             self.success_image.set_visible(True)
@@ -1764,5 +2219,6 @@ class LinexInUpdaterWidget(Gtk.Box):
     def return_to_updates_and_refresh(self):
         """Return to updates view and refresh the list"""
         self.content_stack.set_visible_child_name("updates_view")
-        self.check_for_updates()
+        # pacman -Syu just synced the databases, no need to sync them again
+        self.check_for_updates(refresh_databases=False)
         return False
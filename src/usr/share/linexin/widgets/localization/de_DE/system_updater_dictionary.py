@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Nur dieses Paket aktualisieren',
     'Loading...': 'Laden...',
     'No description available': 'Keine Beschreibung verfügbar',
+    'Checking system packages...': 'Systempakete werden geprüft...',
+    'Checking AUR packages...': 'AUR-Pakete werden geprüft...',
+    'Checking Flatpak apps...': 'Flatpak-Apps werden geprüft...',
+    'Update kind': 'Art des Updates',
+    'Major update': 'Hauptversion',
+    'Minor update': 'Nebenversion',
+    'Patch update': 'Patch',
+    'Package rebuild': 'Paket-Neubau',
+    'New epoch': 'Neue Epoche',
+    'Downgrade': 'Downgrade',
+    'Installed size': 'Installierte Größe',
+    'Build date': 'Erstellungsdatum',
+    'Search updates': 'Updates durchsuchen',
+    'Sort by name': 'Nach Name sortieren',
+    'Sort by download size': 'Nach Downloadgröße sortieren',
+    'Critical first': 'Kritische zuerst',
+    'System packages': 'Systempakete',
+    'AUR packages': 'AUR-Pakete',
+    'Flatpak apps': 'Flatpak-Apps',
+    'Flatpak apps (user)': 'Flatpak-Apps (Benutzer)',
+    'Show earlier output': 'Frühere Ausgabe anzeigen',
+    'Waiting for input: {}': 'Warte auf Eingabe: {}',
+    'Less than a minute remaining': 'Weniger als eine Minute verbleibend',
+    'About {} min remaining': 'Noch etwa {} Min.',
+    'About {} h {} min remaining': 'Noch etwa {} Std. {} Min.',
+    'Building {}': 'Baue {}',
+    '{} to download, {} total': '{} herunterzuladen, {} insgesamt',
+    'under a minute': 'unter einer Minute',
+    'about {} min': 'etwa {} Min.',
+    'Installed size (installed version)': 'Installierte Größe (installierte Version)',
+    'Build date (installed version)': 'Erstellungsdatum (installierte Version)',
+    'Could not check {}': 'Konnte nicht prüfen: {}',
 }
@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Update only this package',
     'Loading...': 'Loading...',
     'No description available': 'No description available',
+    'Checking system packages...': 'Checking system packages...',
+    'Checking AUR packages...': 'Checking AUR packages...',
+    'Checking Flatpak apps...': 'Checking Flatpak apps...',
+    'Update kind': 'Update kind',
+    'Major update': 'Major update',
+    'Minor update': 'Minor update',
+    'Patch update': 'Patch update',
+    'Package rebuild': 'Package rebuild',
+    'New epoch': 'New epoch',
+    'Downgrade': 'Downgrade',
+    'Installed size': 'Installed size',
+    'Build date': 'Build date',
+    'Search updates': 'Search updates',
+    'Sort by name': 'Sort by name',
+    'Sort by download size': 'Sort by download size',
+    'Critical first': 'Critical first',
+    'System packages': 'System packages',
+    'AUR packages': 'AUR packages',
+    'Flatpak apps': 'Flatpak apps',
+    'Flatpak apps (user)': 'Flatpak apps (user)',
+    'Show earlier output': 'Show earlier output',
+    'Waiting for input: {}': 'Waiting for input: {}',
+    'Less than a minute remaining': 'Less than a minute remaining',
+    'About {} min remaining': 'About {} min remaining',
+    'About {} h {} min remaining': 'About {} h {} min remaining',
+    'Building {}': 'Building {}',
+    '{} to download, {} total': '{} to download, {} total',
+    'under a minute': 'under a minute',
+    'about {} min': 'about {} min',
+    'Installed size (installed version)': 'Installed size (installed version)',
+    'Build date (installed version)': 'Build date (installed version)',
+    'Could not check {}': 'Could not check {}',
 }
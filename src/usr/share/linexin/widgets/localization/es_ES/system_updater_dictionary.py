@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Actualizar solo este paquete',
     'Loading...': 'Cargando...',
     'No description available': 'No hay descripción disponible',
+    'Checking system packages...': 'Comprobando paquetes del sistema...',
+    'Checking AUR packages...': 'Comprobando paquetes de AUR...',
+    'Checking Flatpak apps...': 'Comprobando aplicaciones Flatpak...',
+    'Update kind': 'Tipo de actualización',
+    'Major update': 'Actualización mayor',
+    'Minor update': 'Actualización menor',
+    'Patch update': 'Parche',
+    'Package rebuild': 'Recompilación del paquete',
+    'New epoch': 'Nueva época',
+    'Downgrade': 'Versión anterior',
+    'Installed size': 'Tamaño instalado',
+    'Build date': 'Fecha de compilación',
+    'Search updates': 'Buscar actualizaciones',
+    'Sort by name': 'Ordenar por nombre',
+    'Sort by download size': 'Ordenar por tamaño de descarga',
+    'Critical first': 'Críticas primero',
+    'System packages': 'Paquetes del sistema',
+    'AUR packages': 'Paquetes de AUR',
+    'Flatpak apps': 'Aplicaciones Flatpak',
+    'Flatpak apps (user)': 'Aplicaciones Flatpak (usuario)',
+    'Show earlier output': 'Mostrar salida anterior',
+    'Waiting for input: {}': 'Esperando entrada: {}',
+    'Less than a minute remaining': 'Queda menos de un minuto',
+    'About {} min remaining': 'Quedan unos {} min',
+    'About {} h {} min remaining': 'Quedan unas {} h {} min',
+    'Building {}': 'Compilando {}',
+    '{} to download, {} total': '{} por descargar, {} en total',
+    'under a minute': 'menos de un minuto',
+    'about {} min': 'unos {} min',
+    'Installed size (installed version)': 'Tamaño instalado (versión instalada)',
+    'Build date (installed version)': 'Fecha de compilación (versión instalada)',
+    'Could not check {}': 'No se pudo comprobar: {}',
 }
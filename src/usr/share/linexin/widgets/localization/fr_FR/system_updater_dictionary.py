@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Mettre à jour uniquement ce paquet',
     'Loading...': 'Chargement...',
     'No description available': 'Aucune description disponible',
+    'Checking system packages...': 'Vérification des paquets système...',
+    'Checking AUR packages...': 'Vérification des paquets AUR...',
+    'Checking Flatpak apps...': 'Vérification des applications Flatpak...',
+    'Update kind': 'Type de mise à jour',
+    'Major update': 'Mise à jour majeure',
+    'Minor update': 'Mise à jour mineure',
+    'Patch update': 'Correctif',
+    'Package rebuild': 'Recompilation du paquet',
+    'New epoch': 'Nouvelle époque',
+    'Downgrade': 'Rétrogradation',
+    'Installed size': 'Taille installée',
+    'Build date': 'Date de compilation',
+    'Search updates': 'Rechercher des mises à jour',
+    'Sort by name': 'Trier par nom',
+    'Sort by download size': 'Trier par taille de téléchargement',
+    'Critical first': "Critiques d'abord",
+    'System packages': 'Paquets système',
+    'AUR packages': 'Paquets AUR',
+    'Flatpak apps': 'Applications Flatpak',
+    'Flatpak apps (user)': 'Applications Flatpak (utilisateur)',
+    'Show earlier output': 'Afficher la sortie précédente',
+    'Waiting for input: {}': "En attente d'une saisie : {}",
+    'Less than a minute remaining': "Moins d'une minute restante",
+    'About {} min remaining': 'Environ {} min restantes',
+    'About {} h {} min remaining': 'Environ {} h {} min restantes',
+    'Building {}': 'Compilation de {}',
+    '{} to download, {} total': '{} à télécharger, {} au total',
+    'under a minute': "moins d'une minute",
+    'about {} min': 'environ {} min',
+    'Installed size (installed version)': 'Taille installée (version installée)',
+    'Build date (installed version)': 'Date de compilation (version installée)',
+    'Could not check {}': 'Impossible de vérifier : {}',
 }
@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'केवल इस पैकेज को अपडेट करें',
     'Loading...': 'लोड हो रहा है...',
     'No description available': 'कोई विवरण उपलब्ध नहीं',
+    'Checking system packages...': 'सिस्टम पैकेज जाँचे जा रहे हैं...',
+    'Checking AUR packages...': 'AUR पैकेज जाँचे जा रहे हैं...',
+    'Checking Flatpak apps...': 'Flatpak ऐप्स जाँचे जा रहे हैं...',
+    'Update kind': 'अपडेट का प्रकार',
+    'Major update': 'प्रमुख अपडेट',
+    'Minor update': 'छोटा अपडेट',
+    'Patch update': 'पैच अपडेट',
+    'Package rebuild': 'पैकेज पुनर्निर्माण',
+    'New epoch': 'नया epoch',
+    'Downgrade': 'डाउनग्रेड',
+    'Installed size': 'इंस्टॉल किया गया आकार',
+    'Build date': 'बिल्ड तिथि',
+    'Search updates': 'अपडेट खोजें',
+    'Sort by name': 'नाम से क्रमबद्ध करें',
+    'Sort by download size': 'डाउनलोड आकार से क्रमबद्ध करें',
+    'Critical first': 'महत्वपूर्ण पहले',
+    'System packages': 'सिस्टम पैकेज',
+    'AUR packages': 'AUR पैकेज',
+    'Flatpak apps': 'Flatpak ऐप्स',
+    'Flatpak apps (user)': 'Flatpak ऐप्स (उपयोगकर्ता)',
+    'Show earlier output': 'पहले का आउटपुट दिखाएँ',
+    'Waiting for input: {}': 'इनपुट की प्रतीक्षा: {}',
+    'Less than a minute remaining': 'एक मिनट से कम शेष',
+    'About {} min remaining': 'लगभग {} मिनट शेष',
+    'About {} h {} min remaining': 'लगभग {} घंटे {} मिनट शेष',
+    'Building {}': '{} बनाया जा रहा है',
+    '{} to download, {} total': '{} डाउनलोड करना है, कुल {}',
+    'under a minute': 'एक मिनट से कम',
+    'about {} min': 'लगभग {} मिनट',
+    'Installed size (installed version)': 'इंस्टॉल किया गया आकार (इंस्टॉल संस्करण)',
+    'Build date (installed version)': 'बिल्ड तिथि (इंस्टॉल संस्करण)',
+    'Could not check {}': 'जाँच नहीं हो सकी: {}',
 }
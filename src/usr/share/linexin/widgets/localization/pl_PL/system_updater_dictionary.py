@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Aktualizuj tylko ten pakiet',
     'Loading...': 'Ładowanie...',
     'No description available': 'Brak opisu',
+    'Checking system packages...': 'Sprawdzanie pakietów systemowych...',
+    'Checking AUR packages...': 'Sprawdzanie pakietów AUR...',
+    'Checking Flatpak apps...': 'Sprawdzanie aplikacji Flatpak...',
+    'Update kind': 'Rodzaj aktualizacji',
+    'Major update': 'Duża aktualizacja',
+    'Minor update': 'Mniejsza aktualizacja',
+    'Patch update': 'Poprawka',
+    'Package rebuild': 'Przebudowa pakietu',
+    'New epoch': 'Nowa epoka',
+    'Downgrade': 'Obniżenie wersji',
+    'Installed size': 'Rozmiar po instalacji',
+    'Build date': 'Data kompilacji',
+    'Search updates': 'Szukaj aktualizacji',
+    'Sort by name': 'Sortuj według nazwy',
+    'Sort by download size': 'Sortuj według rozmiaru pobierania',
+    'Critical first': 'Najpierw krytyczne',
+    'System packages': 'Pakiety systemowe',
+    'AUR packages': 'Pakiety AUR',
+    'Flatpak apps': 'Aplikacje Flatpak',
+    'Flatpak apps (user)': 'Aplikacje Flatpak (użytkownik)',
+    'Show earlier output': 'Pokaż wcześniejsze dane wyjściowe',
+    'Waiting for input: {}': 'Oczekiwanie na odpowiedź: {}',
+    'Less than a minute remaining': 'Pozostała niecała minuta',
+    'About {} min remaining': 'Pozostało około {} min',
+    'About {} h {} min remaining': 'Pozostało około {} godz. {} min',
+    'Building {}': 'Budowanie {}',
+    '{} to download, {} total': '{} do pobrania, łącznie {}',
+    'under a minute': 'poniżej minuty',
+    'about {} min': 'około {} min',
+    'Installed size (installed version)': 'Rozmiar po instalacji (zainstalowana wersja)',
+    'Build date (installed version)': 'Data kompilacji (zainstalowana wersja)',
+    'Could not check {}': 'Nie udało się sprawdzić: {}',
 }
@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Atualizar apenas este pacote',
     'Loading...': 'Carregando...',
     'No description available': 'Nenhuma descrição disponível',
+    'Checking system packages...': 'Verificando pacotes do sistema...',
+    'Checking AUR packages...': 'Verificando pacotes do AUR...',
+    'Checking Flatpak apps...': 'Verificando aplicativos Flatpak...',
+    'Update kind': 'Tipo de atualização',
+    'Major update': 'Atualização principal',
+    'Minor update': 'Atualização secundária',
+    'Patch update': 'Correção',
+    'Package rebuild': 'Recompilação do pacote',
+    'New epoch': 'Nova época',
+    'Downgrade': 'Rebaixamento de versão',
+    'Installed size': 'Tamanho instalado',
+    'Build date': 'Data de compilação',
+    'Search updates': 'Pesquisar atualizações',
+    'Sort by name': 'Ordenar por nome',
+    'Sort by download size': 'Ordenar por tamanho do download',
+    'Critical first': 'Críticas primeiro',
+    'System packages': 'Pacotes do sistema',
+    'AUR packages': 'Pacotes do AUR',
+    'Flatpak apps': 'Aplicativos Flatpak',
+    'Flatpak apps (user)': 'Aplicativos Flatpak (usuário)',
+    'Show earlier output': 'Mostrar saída anterior',
+    'Waiting for input: {}': 'Aguardando entrada: {}',
+    'Less than a minute remaining': 'Falta menos de um minuto',
+    'About {} min remaining': 'Faltam cerca de {} min',
+    'About {} h {} min remaining': 'Faltam cerca de {} h {} min',
+    'Building {}': 'Compilando {}',
+    '{} to download, {} total': '{} para baixar, {} no total',
+    'under a minute': 'menos de um minuto',
+    'about {} min': 'cerca de {} min',
+    'Installed size (installed version)': 'Tamanho instalado (versão instalada)',
+    'Build date (installed version)': 'Data de compilação (versão instalada)',
+    'Could not check {}': 'Não foi possível verificar: {}',
 }
@@ -73,4 +73,36 @@ translations = {
     'Update only this package': 'Обновить только этот пакет',
     'Loading...': 'Загрузка...',
     'No description available': 'Описание недоступно',
+    'Checking system packages...': 'Проверка системных пакетов...',
+    'Checking AUR packages...': 'Проверка пакетов AUR...',
+    'Checking Flatpak apps...': 'Проверка приложений Flatpak...',
+    'Update kind': 'Тип обновления',
+    'Major update': 'Крупное обновление',
+    'Minor update': 'Минорное обновление',
+    'Patch update': 'Исправление',
+    'Package rebuild': 'Пересборка пакета',
+    'New epoch': 'Новая эпоха',
+    'Downgrade': 'Откат версии',
+    'Installed size': 'Установленный размер',
+    'Build date': 'Дата сборки',
+    'Search updates': 'Поиск обновлений',
+    'Sort by name': 'Сортировать по имени',
+    'Sort by download size': 'Сортировать по размеру загрузки',
+    'Critical first': 'Сначала критические',
+    'System packages': 'Системные пакеты',
+    'AUR packages': 'Пакеты AUR',
+    'Flatpak apps': 'Приложения Flatpak',
+    'Flatpak apps (user)': 'Приложения Flatpak (пользователь)',
+    'Show earlier output': 'Показать более ранний вывод',
+    'Waiting for input: {}': 'Ожидание ввода: {}',
+    'Less than a minute remaining': 'Осталось меньше минуты',
+    'About {} min remaining': 'Осталось около {} мин',
+    'About {} h {} min remaining': 'Осталось около {} ч {} мин',
+    'Building {}': 'Сборка {}',
+    '{} to download, {} total': '{} к загрузке, всего {}',
+    'under a minute': 'меньше минуты',
+    'about {} min': 'около {} мин',
+    'Installed size (installed version)': 'Установленный размер (установленная версия)',
+    'Build date (installed version)': 'Дата сборки (установленная версия)',
+    'Could not check {}': 'Не удалось проверить: {}',
 }
@@ -73,4 +73,36 @@ translations = {
     'Update only this package': '仅更新此软件包',
     'Loading...': '加载中...',
     'No description available': '没有可用的描述',
+    'Checking system packages...': '正在检查系统软件包...',
+    'Checking AUR packages...': '正在检查 AUR 软件包...',
+    'Checking Flatpak apps...': '正在检查 Flatpak 应用...',
+    'Update kind': '更新类型',
+    'Major update': '主要更新',
+    'Minor update': '次要更新',
+    'Patch update': '补丁更新',
+    'Package rebuild': '软件包重建',
+    'New epoch': '新纪元',
+    'Downgrade': '降级',
+    'Installed size': '安装大小',
+    'Build date': '构建日期',
+    'Search updates': '搜索更新',
+    'Sort by name': '按名称排序',
+    'Sort by download size': '按下载大小排序',
+    'Critical first': '关键更新优先',
+    'System packages': '系统软件包',
+    'AUR packages': 'AUR 软件包',
+    'Flatpak apps': 'Flatpak 应用',
+    'Flatpak apps (user)': 'Flatpak 应用（用户）',
+    'Show earlier output': '显示更早的输出',
+    'Waiting for input: {}': '等待输入：{}',
+    'Less than a minute remaining': '剩余不到一分钟',
+    'About {} min remaining': '剩余约 {} 分钟',
+    'About {} h {} min remaining': '剩余约 {} 小时 {} 分钟',
+    'Building {}': '正在构建 {}',
+    '{} to download, {} total': '需下载 {}，共 {}',
+    'under a minute': '不到一分钟',
+    'about {} min': '约 {} 分钟',
+    'Installed size (installed version)': '安装大小（已安装版本）',
+    'Build date (installed version)': '构建日期（已安装版本）',
+    'Could not check {}': '无法检查：{}',
 }
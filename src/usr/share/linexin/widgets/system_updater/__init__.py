@@ -0,0 +1,12 @@
+"""Backend helpers for the Linexin system updater widget.
+
+The widget loads this package from its own directory and hands over its
+translation dictionary, so strings produced here follow the UI language.
+"""
+
+TRANSLATIONS = {}
+
+
+def _(text):
+    """Translate text using the dictionary installed by the widget"""
+    return TRANSLATIONS.get(text, text)
@@ -0,0 +1,104 @@
+"""On-disk cache of the last update-check result.
+
+The cache lives in $XDG_CACHE_HOME/linexin-updater and records the
+modification times of the package databases it was computed from. It is
+dropped as soon as any of them changes, so a cached list never outlives an
+install, a `pacman -Sy` or a Flatpak repo update.
+"""
+import glob
+import json
+import os
+import tempfile
+import time
+
+CACHE_VERSION = 1
+CACHE_FILE_NAME = "updates.json"
+# A matching cache younger than this is shown without re-probing
+CACHE_FRESH_SECONDS = 15 * 60
+# Older caches are ignored even when the databases did not change
+CACHE_MAX_AGE_SECONDS = 3 * 24 * 60 * 60
+
+RESULT_KEYS = ('available_updates', 'aur_updates', 'flatpak_updates')
+
+
+def cache_dir():
+    """Return the per-user cache directory of the updater"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'linexin-updater')
+
+
+def _watched_paths():
+    paths = sorted(glob.glob('/var/lib/pacman/sync/*.db'))
+    paths.append('/var/lib/pacman/local')
+    for root in ('/var/lib/flatpak', os.path.expanduser('~/.local/share/flatpak')):
+        paths.append(os.path.join(root, 'repo'))
+        paths.append(os.path.join(root, 'repo', 'refs', 'remotes'))
+        paths.append(os.path.join(root, 'app'))
+    return paths
+
+
+def database_fingerprint():
+    """Return {path: mtime_ns} for every database the update list depends on"""
+    fingerprint = {}
+    for path in _watched_paths():
+        try:
+            fingerprint[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            fingerprint[path] = None
+    # Flatpak version labels are translated, so the language is part of the key
+    fingerprint['LANG'] = os.environ.get('LANG', '')
+    return fingerprint
+
+
+def load_cached_result():
+    """Return the cached result dict, or None if missing, outdated or invalid.
+
+    The returned dict holds the three update lists plus 'fresh', which is
+    True when the entry is recent enough to skip revalidation.
+    """
+    try:
+        with open(os.path.join(cache_dir(), CACHE_FILE_NAME), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return None
+    age = time.time() - data.get('created', 0)
+    if age < 0 or age > CACHE_MAX_AGE_SECONDS:
+        return None
+    if data.get('fingerprint') != database_fingerprint():
+        return None
+    result = {}
+    for key in RESULT_KEYS:
+        value = data.get(key)
+        if not isinstance(value, list):
+            return None
+        result[key] = value
+    result['fresh'] = age < CACHE_FRESH_SECONDS
+    return result
+
+
+def save_result(available_updates, aur_updates, flatpak_updates, fingerprint=None):
+    """Atomically write a new cache entry.
+
+    Pass the fingerprint taken before probing started, so a database that
+    changed during the check invalidates the entry right away.
+    """
+    data = {
+        'version': CACHE_VERSION,
+        'created': time.time(),
+        'fingerprint': fingerprint if fingerprint is not None else database_fingerprint(),
+        'available_updates': available_updates,
+        'aur_updates': aur_updates,
+        'flatpak_updates': flatpak_updates,
+    }
+    directory = cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.updates-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, os.path.join(directory, CACHE_FILE_NAME))
+    except OSError as e:
+        print(f"Failed to write update cache: {e}")
+
@@ -0,0 +1,78 @@
+"""Recognise core packages whose update may need a reboot.
+
+The rules are read from a small rule file and compiled once at import:
+exact names go into a set, prefixes and globs into one alternation
+regex. Names provided by installed packages (e.g. initramfs) are
+resolved from the local pacman database the first time they are needed.
+"""
+import fnmatch
+import os
+import re
+import threading
+
+from . import syncdb
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'critical-packages.conf')
+SYSTEM_RULES_FILE = '/etc/linexin-updater/critical-packages.conf'
+RULE_KINDS = ('exact', 'prefix', 'glob', 'provides')
+
+
+def read_rules(path):
+    """Return {kind: [patterns]} from a rule file; unknown kinds are ignored"""
+    rules = {kind: [] for kind in RULE_KINDS}
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                parts = line.split('#', 1)[0].split()
+                if len(parts) > 1 and parts[0] in rules:
+                    rules[parts[0]].extend(parts[1:])
+    except OSError as e:
+        print(f"Could not read critical package rules {path}: {e}")
+    return rules
+
+
+class CriticalMatcher:
+    """Compiled set of critical package rules."""
+
+    def __init__(self, rules, dbpath=syncdb.PACMAN_DBPATH):
+        self.exact = frozenset(name.lower() for name in rules.get('exact', ()))
+        patterns = [re.escape(prefix.lower()) + '.*' for prefix in rules.get('prefix', ())]
+        patterns += [fnmatch.translate(glob.lower()) for glob in rules.get('glob', ())]
+        self._regex = re.compile('|'.join(f'(?:{p})' for p in patterns)) if patterns else None
+        self.provides = frozenset(rules.get('provides', ()))
+        self.dbpath = dbpath
+        self._providers = None
+        self._lock = threading.Lock()
+
+    def providers(self):
+        """Names of installed packages that provide one of the 'provides' rules"""
+        with self._lock:
+            if self._providers is None:
+                try:
+                    self._providers = frozenset(syncdb.local_providers(self.provides, self.dbpath))
+                except syncdb.SyncDbError:
+                    self._providers = frozenset()
+            return self._providers
+
+    def matches(self, name):
+        """True if a package name is covered by one of the rules"""
+        name = name.lower()
+        if name in self.exact:
+            return True
+        if self._regex is not None and self._regex.fullmatch(name):
+            return True
+        return bool(self.provides) and name in self.providers()
+
+
+def load_matcher():
+    """Compile the system rule file if there is one, else the packaged defaults"""
+    path = SYSTEM_RULES_FILE if os.path.exists(SYSTEM_RULES_FILE) else DEFAULT_RULES_FILE
+    return CriticalMatcher(read_rules(path))
+
+
+MATCHER = load_matcher()
+
+
+def is_critical_package(name):
+    """True if a package is a core component whose update may need a reboot"""
+    return MATCHER.matches(name)
@@ -0,0 +1,209 @@
+"""Per-user background update checker with a Unix-socket query API.
+
+The daemon keeps the latest probe result in memory and answers JSON
+requests on $XDG_RUNTIME_DIR/linexin-updater.sock, one request line and
+one reply line per connection:
+
+    {"cmd": "get"}      -> current result set and its state
+    {"cmd": "refresh"}  -> start a new check unless one is running
+
+Checks are scheduled by linexin-updater-refresh.timer (which adds the
+jitter); failed checks are retried here with exponential backoff.
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from . import cache, probes
+
+SOCKET_NAME = "linexin-updater.sock"
+BACKOFF_INITIAL = 60
+BACKOFF_MAX = 60 * 60
+QUERY_TIMEOUT = 0.5
+# The timer fires hourly plus up to 15 min of jitter
+RESULT_FRESH_SECONDS = 90 * 60
+
+
+def socket_path():
+    """Return the path of the daemon socket for the current user"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or f"/run/user/{os.getuid()}"
+    return os.path.join(runtime_dir, SOCKET_NAME)
+
+
+def _request(message, timeout=QUERY_TIMEOUT):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path())
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return json.loads(b"".join(chunks).decode())
+    except (OSError, ValueError):
+        return None
+
+
+def query(timeout=QUERY_TIMEOUT):
+    """Ask a running daemon for its result set; None if it is not reachable"""
+    reply = _request({'cmd': 'get'}, timeout)
+    if not isinstance(reply, dict) or not reply.get('ok'):
+        return None
+    return reply
+
+
+def load_daemon_result(timeout=QUERY_TIMEOUT):
+    """Return the daemon's result in the same shape as cache.load_cached_result()"""
+    reply = query(timeout)
+    if reply is None or reply.get('state') != 'valid':
+        return None
+    checked_at = reply.get('checked_at') or 0
+    # After a failed check the result is the last good one; the widget re-probes it
+    fresh = not reply.get('checking') and not reply.get('failures') and time.time() - checked_at < RESULT_FRESH_SECONDS
+    return {
+        'available_updates': reply['available_updates'],
+        'aur_updates': reply['aur_updates'],
+        'flatpak_updates': reply['flatpak_updates'],
+        'fresh': fresh,
+    }
+
+
+def request_refresh(timeout=QUERY_TIMEOUT):
+    """Ask a running daemon to start a new check; returns False if unreachable"""
+    reply = _request({'cmd': 'refresh'}, timeout)
+    return isinstance(reply, dict) and bool(reply.get('ok'))
+
+
+class UpdateDaemon:
+    """Probe on request, keep the result and serve it over the socket."""
+
+    def __init__(self):
+        self.engine = probes.UpdateProbeEngine()
+        self.lock = threading.Lock()
+        self.checking = False
+        self.result = None
+        self.fingerprint = None
+        self.checked_at = None
+        self.failures = 0
+        self._retry_timer = None
+        self.server = None
+
+    def snapshot(self):
+        """Return the reply to a 'get' request"""
+        with self.lock:
+            result = self.result
+            fingerprint = self.fingerprint
+            reply = {
+                'ok': True,
+                'checking': self.checking,
+                'checked_at': self.checked_at,
+                'failures': self.failures,
+            }
+        if result is None:
+            reply['state'] = 'empty'
+        elif fingerprint != cache.database_fingerprint():
+            # The databases moved on (install, -Sy, flatpak update): never serve that
+            reply['state'] = 'stale'
+            self.refresh()
+        else:
+            reply['state'] = 'valid'
+            reply['available_updates'] = result['pacman']
+            reply['aur_updates'] = result['aur']
+            reply['flatpak_updates'] = result['flatpak']
+        return reply
+
+    def refresh(self):
+        """Start a check in the background; returns False if one is running"""
+        with self.lock:
+            if self.checking:
+                return False
+            self.checking = True
+            if self._retry_timer is not None:
+                self._retry_timer.cancel()
+                self._retry_timer = None
+        threading.Thread(target=self._check, daemon=True).start()
+        return True
+
+    def _check(self):
+        fingerprint = cache.database_fingerprint()
+        try:
+            result = self.engine.run()
+            failed = not self.engine.complete
+        except Exception as e:
+            print(f"Update check failed: {e}")
+            result = None
+            failed = True
+        if failed:
+            # A partial result would hide the updates of the failed sources; keep the last good one
+            result = None
+        with self.lock:
+            self.checking = False
+            if result is not None:
+                self.result = result
+                self.fingerprint = fingerprint
+                self.checked_at = time.time()
+            if failed:
+                self.failures += 1
+                delay = min(BACKOFF_INITIAL * 2 ** (self.failures - 1), BACKOFF_MAX)
+                self._retry_timer = threading.Timer(delay, self.refresh)
+                self._retry_timer.daemon = True
+                self._retry_timer.start()
+            else:
+                self.failures = 0
+        if result is not None:
+            cache.save_result(result['pacman'], result['aur'], result['flatpak'], fingerprint)
+
+    def handle(self, message):
+        """Dispatch one decoded request"""
+        cmd = message.get('cmd') if isinstance(message, dict) else None
+        if cmd == 'get':
+            return self.snapshot()
+        if cmd == 'refresh':
+            return {'ok': True, 'started': self.refresh()}
+        return {'ok': False, 'error': f"unknown command: {cmd}"}
+
+    def serve_forever(self):
+        """Bind the socket, run an initial check and serve requests"""
+        path = socket_path()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    message = json.loads(self.rfile.readline().decode())
+                except ValueError:
+                    message = None
+                reply = daemon.handle(message)
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        old_umask = os.umask(0o077)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+        self.refresh()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        """Stop serving and cancel a running check"""
+        self.engine.cancel()
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
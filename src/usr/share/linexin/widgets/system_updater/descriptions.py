@@ -0,0 +1,119 @@
+"""Memoised package descriptions for the detail panel.
+
+Descriptions are kept in a bounded LRU cache keyed by
+(type, name or app_id, version). Concurrent requests for the same key
+share one lookup, so repeated clicks never spawn duplicate processes.
+"""
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+
+from .workers import PRIORITY_BACKGROUND, PRIORITY_USER
+
+DESCRIPTION_CACHE_SIZE = 256
+
+
+def description_key(update):
+    """Return the cache key of an UpdateEntry"""
+    return update.key + (update.new,)
+
+
+def _info_field(cmd, field):
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, timeout=10,
+        env={**os.environ, 'LC_ALL': 'C'}
+    )
+    if result.returncode != 0:
+        return None
+    for line in result.stdout.splitlines():
+        if line.strip().startswith(field):
+            return line.split(':', 1)[1].strip()
+    return None
+
+
+def fetch_description(pkg_type, name):
+    """Look a description up with flatpak info or pacman -Si/-Qi; None if unknown"""
+    try:
+        if pkg_type == 'flatpak':
+            return _info_field(['flatpak', 'info', name], 'Description:') if name else None
+        return (_info_field(['pacman', '-Si', name], 'Description')
+                or _info_field(['pacman', '-Qi', name], 'Description'))
+    except (subprocess.SubprocessError, OSError):
+        return None
+
+
+class DescriptionCache:
+    """Bounded LRU of descriptions with in-flight request coalescing."""
+
+    def __init__(self, maxsize=DESCRIPTION_CACHE_SIZE, fetcher=fetch_description, pool=None):
+        self.maxsize = maxsize
+        self.fetcher = fetcher
+        self.pool = pool
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, description) without starting a lookup"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+        return False, None
+
+    def put(self, key, description):
+        """Store a description that is already known (e.g. from the metadata index)"""
+        with self._lock:
+            self._store(key, description)
+
+    def _store(self, key, description):
+        self._entries[key] = description
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def request(self, key, callback=None, priority=PRIORITY_USER):
+        """Deliver the description for key to callback(description).
+
+        A cached value is delivered synchronously. Otherwise a lookup is
+        started, or joined if one for the same key is already running, and
+        the callback runs on that worker thread. Failed lookups are cached
+        as None so they are not retried on every click.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                description = self._entries[key]
+            elif key in self._inflight:
+                if callback:
+                    self._inflight[key].append(callback)
+                return
+            else:
+                self._inflight[key] = [callback] if callback else []
+                if self.pool is not None:
+                    self.pool.submit(self._fetch, key, priority=priority)
+                else:
+                    threading.Thread(target=self._fetch, args=(key,), daemon=True).start()
+                return
+        if callback:
+            callback(description)
+
+    def discard_pending(self):
+        """Forget lookups whose jobs were dropped, so later requests start new ones"""
+        with self._lock:
+            self._inflight.clear()
+
+    def prefetch(self, keys):
+        """Warm the cache for keys that are likely to be requested next"""
+        for key in keys:
+            self.request(key, priority=PRIORITY_BACKGROUND)
+
+    def _fetch(self, key):
+        pkg_type, name, _version = key
+        description = self.fetcher(pkg_type, name)
+        with self._lock:
+            self._store(key, description)
+            callbacks = self._inflight.pop(key, [])
+        for callback in callbacks:
+            callback(description)
@@ -0,0 +1,93 @@
+"""How much an update still has to download, and how long that should take.
+
+A repo package whose file is already in pacman's package cache with the
+expected size (left there by an aborted or download-only run) costs
+nothing to fetch, so it only counts towards the total. Flatpak download
+sizes come with the updates from the Flatpak probe. AUR packages are
+built from sources whose size nobody knows before fetching them, so they
+are left out.
+The time estimate uses the download rate measured in earlier runs.
+"""
+import os
+from collections import namedtuple
+
+from . import _, progressmodel, syncdb
+
+DEFAULT_CACHE_DIRS = ('/var/cache/pacman/pkg',)
+
+# fetch_bytes and fetch_count are what is not in the package cache yet
+DownloadEstimate = namedtuple(
+    'DownloadEstimate',
+    'total_bytes fetch_bytes fetch_count cached_count flatpak_bytes'
+)
+
+# GLib's g_format_size uses SI units
+_SI_UNITS = {'bytes': 1, 'byte': 1, 'B': 1, 'kB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3, 'TB': 1000 ** 4}
+
+
+def parse_flatpak_size(text):
+    """Parse a size as flatpak prints it ("12.3 MB") into bytes"""
+    parts = text.replace(',', '.').split()
+    if len(parts) < 2 or parts[1] not in _SI_UNITS:
+        return 0
+    try:
+        return int(float(parts[0]) * _SI_UNITS[parts[1]])
+    except ValueError:
+        return 0
+
+
+def is_cached(info, cache_dirs=DEFAULT_CACHE_DIRS):
+    """Return True if the package file of a metadata entry is complete in a cache dir"""
+    filename = info.get('filename')
+    size = info.get('download_size')
+    if not filename or not size:
+        return False
+    for directory in cache_dirs:
+        try:
+            if os.stat(os.path.join(directory, filename)).st_size == size:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def package_cache_dirs():
+    """Return pacman's package cache directories"""
+    return syncdb.read_pacman_conf()['cache_dirs'] or list(DEFAULT_CACHE_DIRS)
+
+
+def estimate(index, repo_names, flatpak_updates=(), cache_dirs=None):
+    """Build a DownloadEstimate from a MetadataIndex and the pending updates"""
+    if cache_dirs is None:
+        cache_dirs = package_cache_dirs()
+    total_bytes = fetch_bytes = fetch_count = cached_count = 0
+    for name in repo_names:
+        info = index.get(name)
+        if info is None:
+            fetch_count += 1
+            continue
+        total_bytes += info['download_size']
+        if is_cached(info, cache_dirs):
+            cached_count += 1
+        else:
+            fetch_bytes += info['download_size']
+            fetch_count += 1
+    flatpak_bytes = sum(update.download_size for update in flatpak_updates)
+    return DownloadEstimate(
+        total_bytes + flatpak_bytes, fetch_bytes + flatpak_bytes, fetch_count,
+        cached_count, flatpak_bytes
+    )
+
+
+def download_seconds(fetch_bytes, history=None):
+    """Return the expected download time at the rate measured in earlier runs"""
+    rates = history if history is not None else progressmodel.load_history()
+    rate = rates.get('download') or progressmodel.DEFAULT_RATES['download']
+    return fetch_bytes / rate
+
+
+def format_duration(seconds):
+    """Format an expected download time for the info panel"""
+    if seconds < 60:
+        return _("under a minute")
+    return _("about {} min").format(int(round(seconds / 60)))
@@ -0,0 +1,73 @@
+"""Immutable record type for pending updates.
+
+The probes, the cache and the daemon exchange plain dicts (they are JSON
+on the wire); the widget freezes them into UpdateEntry tuples once per
+result, and every consumer shares those tuples instead of copying lists.
+"""
+import sys
+
+from .critical import is_critical_package
+
+FIELDS = ('name', 'current', 'new', 'repo', 'type', 'app_id', 'scope', 'download_size')
+
+
+class UpdateEntry:
+    """One pending update with precomputed key and flags."""
+
+    __slots__ = FIELDS + ('key', 'lower_name', 'critical')
+
+    def __init__(self, name, current, new, repo='', type='pacman', app_id='', scope='', download_size=0):
+        setattr_ = object.__setattr__
+        setattr_(self, 'name', name)
+        setattr_(self, 'current', current)
+        setattr_(self, 'new', new)
+        # Repo, type and scope take a handful of distinct values across thousands of entries
+        setattr_(self, 'repo', sys.intern(repo))
+        setattr_(self, 'type', sys.intern(type))
+        setattr_(self, 'app_id', app_id)
+        setattr_(self, 'scope', sys.intern(scope))
+        # Bytes to fetch; only the Flatpak probe knows it up front
+        setattr_(self, 'download_size', download_size)
+        setattr_(self, 'key', ('flatpak', app_id) if type == 'flatpak' else (self.type, name))
+        setattr_(self, 'lower_name', name.lower())
+        # Critical rules describe pacman packages; Flatpak apps never match them
+        setattr_(self, 'critical', type != 'flatpak' and is_critical_package(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UpdateEntry is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("UpdateEntry is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, UpdateEntry):
+            return NotImplemented
+        return (self.key, self.current, self.new, self.repo) == (other.key, other.current, other.new, other.repo)
+
+    def __hash__(self):
+        return hash((self.key, self.current, self.new, self.repo))
+
+    def __repr__(self):
+        return f"UpdateEntry({self.name!r}, {self.current!r} -> {self.new!r}, {self.repo!r})"
+
+    @classmethod
+    def from_dict(cls, update):
+        """Build an entry from a probe/cache update dict"""
+        return cls(**{field: update[field] for field in FIELDS if field in update})
+
+    def to_dict(self):
+        """Return the JSON-friendly dict form the probes and the cache use"""
+        update = {'name': self.name, 'current': self.current, 'new': self.new,
+                  'repo': self.repo, 'type': self.type}
+        if self.app_id:
+            update['app_id'] = self.app_id
+        if self.scope:
+            update['scope'] = self.scope
+        if self.download_size:
+            update['download_size'] = self.download_size
+        return update
+
+
+def freeze(updates):
+    """Return updates (dicts or entries) as a tuple of UpdateEntry"""
+    return tuple(u if isinstance(u, UpdateEntry) else UpdateEntry.from_dict(u) for u in updates)
@@ -0,0 +1,250 @@
+"""Install output plumbing between the command's reader thread and the UI.
+
+The reader thread feeds raw output into an OutputBatcher, which splits
+it into lines and typed events with an OutputParser as it passes. The
+main loop drains the batcher on a fixed-rate tick, so it does one text
+insert and one round of event handling per tick instead of one idle
+callback per line. The complete output is kept in a LogStore.
+"""
+import bisect
+import tempfile
+import threading
+import time
+from collections import deque
+
+from .outputparser import OutputParser, index_kind
+
+# ~30 Hz is smooth for a scrolling log and a progress bar
+FLUSH_INTERVAL_MS = 33
+# Lines waiting for the next tick; older ones are dropped from the view if the UI falls behind
+PENDING_LINES = 5000
+# A question left unterminated this long means the command waits for input
+PROMPT_IDLE_SECONDS = 2.0
+
+# Lines the live log view keeps; older output is paged in on request
+SCROLLBACK_LINES = 2000
+SCROLLBACK_PAGE_LINES = 1000
+
+# Output kept in memory before older chunks are spilled to a temporary file
+LOG_MEMORY_CAP = 8 * 1024 * 1024
+
+
+class OutputBatcher:
+    """Thread-safe ring buffer of output lines plus the events parsed from them.
+
+    With a log, every line is also appended to that LogStore under the
+    same lock, so a view can switch between reading the log and following
+    the batcher without losing or repeating lines.
+    """
+
+    def __init__(self, maxlen=PENDING_LINES, log=None, parser=None, clock=time.monotonic):
+        self.log = log
+        self.parser = parser or OutputParser()
+        self._lines = deque(maxlen=maxlen)
+        self._events = []
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._clock = clock
+        self._last_output = clock()
+        self.closed = False
+
+    def _queue(self, parsed):
+        for line, events in parsed:
+            if self.log is not None:
+                self.log.append(line, index_kind(events))
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+            self._events.extend(events)
+
+    def feed(self, text):
+        """Queue a chunk of raw output (reader thread)"""
+        with self._lock:
+            self._queue(self.parser.feed(text))
+            self._last_output = self._clock()
+
+    def close(self):
+        """Mark the end of the output; the next drain is the last one"""
+        with self._lock:
+            if not self.closed:
+                self._queue(self.parser.finish())
+            self.closed = True
+
+    def drain(self):
+        """Take the queued output (main thread).
+
+        Returns (text, events, dropped): the queued lines joined, the
+        events parsed since the last drain in order, and how many lines
+        were dropped from the view because the ring buffer was full. A
+        Prompt is added once the output has stopped on an unterminated
+        question for PROMPT_IDLE_SECONDS.
+        """
+        with self._lock:
+            if not self.closed and self._clock() - self._last_output >= PROMPT_IDLE_SECONDS:
+                prompt = self.parser.pending_prompt()
+                if prompt is not None:
+                    self._events.append(prompt)
+            text = ''.join(self._lines)
+            self._lines.clear()
+            events, self._events = self._events, []
+            dropped, self._dropped = self._dropped, 0
+        return text, events, dropped
+
+    def restart_view(self, n_lines):
+        """Drop the queued lines and return log.tail_lines(n_lines) in one step.
+
+        The returned text plus every later drain is exactly the log from
+        the returned offset on.
+        """
+        with self._lock:
+            self._lines.clear()
+            self._dropped = 0
+            return self.log.tail_lines(n_lines)
+
+
+class LogStore:
+    """Append-only log kept as a list of chunks.
+
+    Appending never copies earlier output. With a path, every chunk is
+    written through to that file as it arrives; otherwise chunks only go
+    to an anonymous temporary file once more than memory_cap characters
+    are held. Either way old chunks are then dropped from memory, and
+    slices that reach back that far read them from disk. Offsets are
+    character offsets into the whole log.
+    """
+
+    def __init__(self, memory_cap=LOG_MEMORY_CAP, path=None):
+        self.memory_cap = memory_cap
+        self.path = path
+        self._lock = threading.Lock()
+        self._starts = []       # offset of each chunk
+        self._chunks = []       # chunk text, None once dropped from memory
+        self._positions = []    # (byte offset, byte length) of chunks written to the file
+        self._first_in_memory = 0
+        self._length = 0
+        self._memory = 0
+        self._bytes = 0
+        self._file = open(path, 'w+b') if path else None
+
+    def __len__(self):
+        return self._length
+
+    def append(self, text, kind=None):
+        """Add text to the end of the log.
+
+        kind ('progress', 'warning', 'error') is what the parser made of
+        the text; a plain store ignores it. Returns the byte offset of the
+        text in the log file when the log is written through to a path,
+        else None.
+        """
+        if not text:
+            return None
+        with self._lock:
+            offset = None
+            if self.path:
+                offset = self._write(text)
+            self._starts.append(self._length)
+            self._chunks.append(text)
+            self._length += len(text)
+            self._memory += len(text)
+            # The newest chunk always stays in memory for tail views
+            while self._memory > self.memory_cap and self._first_in_memory < len(self._chunks) - 1:
+                self._evict_chunk(self._first_in_memory)
+                self._first_in_memory += 1
+            return offset
+
+    def _write(self, text):
+        data = text.encode('utf-8', 'surrogatepass')
+        offset = self._bytes
+        self._file.write(data)
+        self._positions.append((offset, len(data)))
+        self._bytes += len(data)
+        return offset
+
+    def _evict_chunk(self, index):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='linexin-updater-log-')
+        if index == len(self._positions):
+            self._write(self._chunks[index])
+        self._memory -= len(self._chunks[index])
+        self._chunks[index] = None
+
+    def _chunk(self, index):
+        text = self._chunks[index]
+        if text is None:
+            offset, size = self._positions[index]
+            if self._file is None:
+                # Closed: a log file at path can still be read back
+                with open(self.path, 'rb') as f:
+                    f.seek(offset)
+                    return f.read(size).decode('utf-8', 'surrogatepass')
+            self._file.flush()
+            self._file.seek(offset)
+            text = self._file.read(size).decode('utf-8', 'surrogatepass')
+            self._file.seek(0, 2)
+        return text
+
+    def slice(self, start, end=None):
+        """Return the text between two offsets"""
+        with self._lock:
+            end = self._length if end is None else min(end, self._length)
+            start = max(0, start)
+            if start >= end:
+                return ''
+            index = bisect.bisect_right(self._starts, start) - 1
+            parts = []
+            while index < len(self._chunks) and self._starts[index] < end:
+                chunk_start = self._starts[index]
+                text = self._chunk(index)
+                parts.append(text[max(0, start - chunk_start):end - chunk_start])
+                index += 1
+            return ''.join(parts)
+
+    def tail_lines(self, n_lines, end=None):
+        """Return (offset, text) of the last n_lines lines before end.
+
+        A trailing line without a newline counts as a line.
+        """
+        with self._lock:
+            end = self._length if end is None else min(end, self._length)
+            index = bisect.bisect_left(self._starts, end) - 1
+            # Newlines to pass: one per wanted line, plus the one ending the text itself
+            needed = n_lines
+            start = 0
+            while index >= 0:
+                chunk_start = self._starts[index]
+                text = self._chunk(index)[:end - chunk_start]
+                pos = len(text)
+                if chunk_start + pos == end and text.endswith('\n'):
+                    pos -= 1
+                while needed > 0:
+                    pos = text.rfind('\n', 0, pos)
+                    if pos < 0:
+                        break
+                    needed -= 1
+                if needed == 0:
+                    start = chunk_start + pos + 1
+                    break
+                index -= 1
+        return start, self.slice(start, end)
+
+    def tail(self, max_chars):
+        """Return at most the last max_chars characters"""
+        return self.slice(self._length - max_chars)
+
+    def getvalue(self):
+        """Return the whole log"""
+        return self.slice(0)
+
+    def flush(self):
+        """Push written-through output to disk"""
+        with self._lock:
+            if self.path and self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Close the backing file; a log file at path is kept and stays readable"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,71 @@
+"""Sections, sort keys and search keys of the update list.
+
+The widget keeps one list item per update; everything it needs to place,
+order and filter that item is computed here once, when the item is
+created, so sorting and searching only compare precomputed values.
+"""
+
+# Display order of the list sections
+SECTIONS = ('repo', 'aur', 'flatpak-system', 'flatpak-user')
+SECTION_TITLES = {
+    'repo': "System packages",
+    'aur': "AUR packages",
+    'flatpak-system': "Flatpak apps",
+    'flatpak-user': "Flatpak apps (user)",
+}
+# Section that shows the "checking" placeholder of each probe source
+SOURCE_SECTIONS = {'pacman': 'repo', 'aur': 'aur', 'flatpak': 'flatpak-system'}
+
+SORT_MODES = ('name', 'size', 'critical')
+SORT_MODE_LABELS = {
+    'name': "Sort by name",
+    'size': "Sort by download size",
+    'critical': "Critical first",
+}
+
+
+def section_of(update):
+    """Return the section an UpdateEntry belongs to"""
+    if update.type == 'flatpak':
+        return 'flatpak-user' if update.scope == 'user' else 'flatpak-system'
+    if update.type == 'AUR':
+        return 'aur'
+    return 'repo'
+
+
+def section_rank(section):
+    """Position of a section in the list; anything else sorts after all sections"""
+    try:
+        return SECTIONS.index(section)
+    except ValueError:
+        return len(SECTIONS)
+
+
+def search_text(update):
+    """Lowercase text a search query is matched against"""
+    return ' '.join(field for field in (update.name, update.app_id, update.repo) if field).lower()
+
+
+def sort_key(update, mode, download_size=0):
+    """Return the sort key of an update within its section for a sort mode"""
+    if mode == 'size':
+        return (-download_size, update.lower_name)
+    if mode == 'critical':
+        return (not update.critical, update.lower_name)
+    return (update.lower_name,)
+
+
+def filter_change(old_query, new_query):
+    """Relate a new search query to the previous one.
+
+    Returns 'more' when the new query can only hide entries (it extends
+    the old one), 'less' when it can only reveal entries, and 'different'
+    otherwise, so the list only re-checks the entries that can change.
+    """
+    if new_query == old_query:
+        return None
+    if new_query.startswith(old_query):
+        return 'more'
+    if old_query.startswith(new_query):
+        return 'less'
+    return 'different'
@@ -0,0 +1,146 @@
+"""Package metadata for every pending update, collected once per check.
+
+Repo packages are read straight from the newest sync databases; AUR
+packages (and repo packages when the dbs cannot be read) are filled in by
+one bulk pacman query. The detail panel and the download-size row then
+only do dictionary lookups.
+"""
+import os
+import subprocess
+import time
+
+from . import syncdb
+
+FIELDS = ('description', 'download_size', 'installed_size', 'depends', 'build_date', 'filename', 'installed')
+
+_SIZE_UNITS = {'B': 1, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3, 'TiB': 1024 ** 4}
+
+
+def format_size(total_bytes):
+    """Format a byte count the way the info panel shows it"""
+    mb = total_bytes / (1024 * 1024)
+    if mb < 1:
+        return f"{total_bytes / 1024:.1f} KB"
+    elif mb < 1024:
+        return f"{mb:.1f} MB"
+    else:
+        return f"{mb / 1024:.2f} GB"
+
+
+def parse_size(text):
+    """Parse '12.34 MiB' as printed by pacman into bytes"""
+    parts = text.split()
+    if len(parts) < 2:
+        return 0
+    try:
+        return int(float(parts[0]) * _SIZE_UNITS.get(parts[1], 1))
+    except ValueError:
+        return 0
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _from_desc(fields):
+    build_date = _int((fields.get('%BUILDDATE%') or [''])[0])
+    return {
+        'description': (fields.get('%DESC%') or [''])[0],
+        'download_size': _int((fields.get('%CSIZE%') or [''])[0]),
+        'installed_size': _int((fields.get('%ISIZE%') or [''])[0]),
+        'depends': list(fields.get('%DEPENDS%', [])),
+        'build_date': time.strftime('%Y-%m-%d', time.localtime(build_date)) if build_date else '',
+        'filename': (fields.get('%FILENAME%') or [''])[0],
+        'installed': False,
+    }
+
+
+def parse_pacman_info(output, flag='-Si'):
+    """Parse `pacman -Si/-Qi` output for several packages into {name: entry}"""
+    entries = {}
+    for block in output.split('\n\n'):
+        info = {}
+        key = None
+        for line in block.splitlines():
+            if line.startswith(' ') and key is not None:
+                info[key] += ' ' + line.strip()
+                continue
+            key, sep, value = line.partition(':')
+            if not sep:
+                key = None
+                continue
+            key = key.strip()
+            info[key] = value.strip()
+        name = info.get('Name')
+        if not name:
+            continue
+        depends = info.get('Depends On', '')
+        entries[name] = {
+            'description': info.get('Description', ''),
+            'download_size': parse_size(info.get('Download Size', '')),
+            'installed_size': parse_size(info.get('Installed Size', '')),
+            'depends': [] if depends in ('', 'None') else depends.split(),
+            'build_date': info.get('Build Date', ''),
+            # `pacman -Si` does not print the file name, so these never count as cached
+            'filename': '',
+            # True when the entry describes the installed package, not the update
+            'installed': flag == '-Qi',
+        }
+    return entries
+
+
+def _bulk_query(flag, names, timeout=20):
+    if not names:
+        return {}
+    try:
+        result = subprocess.run(
+            ['pacman', flag] + sorted(names),
+            capture_output=True, text=True, timeout=timeout,
+            env={**os.environ, 'LC_ALL': 'C'}
+        )
+    except (subprocess.SubprocessError, OSError):
+        return {}
+    return parse_pacman_info(result.stdout, flag)
+
+
+class MetadataIndex:
+    """In-memory metadata for the pending updates of one check."""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    def get(self, name):
+        """Return the metadata dict of a package, or None"""
+        return self.entries.get(name)
+
+    def download_size(self, names):
+        """Sum of download sizes of the given packages in bytes"""
+        return sum(self.entries[name]['download_size'] for name in names if name in self.entries)
+
+    @classmethod
+    def build(cls, repo_names, aur_names=()):
+        """Collect metadata for repo and AUR packages with at most two bulk reads"""
+        entries = {}
+        missing = set(repo_names)
+        if missing:
+            conf = syncdb.read_pacman_conf()
+            sync_dir, _mtime = syncdb.newest_sync_dir(conf)
+            if sync_dir is not None:
+                for repo in conf['repos']:
+                    if not missing:
+                        break
+                    try:
+                        packages = syncdb.read_sync_db(os.path.join(sync_dir, f'{repo}.db'), missing)
+                    except (syncdb.SyncDbError, OSError):
+                        break
+                    for name, fields in packages.items():
+                        entries[name] = _from_desc(fields)
+                        missing.discard(name)
+        entries.update(_bulk_query('-Si', missing))
+        # AUR packages are not in any sync db; the local db still describes
+        # them, but as the installed version
+        entries.update(_bulk_query('-Qi', set(aur_names) - set(entries)))
+        return cls(entries)
@@ -0,0 +1,211 @@
+"""Streaming parser for pacman, paru/makepkg and flatpak output.
+
+Raw output goes in as arbitrary text chunks; complete lines come out
+together with typed events describing what the transaction is doing.
+Each line is matched once: a cheap first-character dispatch picks the
+few patterns that can apply, so the parser keeps up with compiler output
+from AUR builds. Complete lines never count as prompts: with --noconfirm
+pacman still prints ":: Proceed with installation? [Y/n]" and answers it
+itself. Only a trailing partial line that looks like a question can be
+one, and the caller decides when the output has been idle long enough.
+"""
+import re
+from collections import namedtuple
+
+# A section of the transaction started (":: Retrieving packages...", "==> Making package: ...")
+PhaseStart = namedtuple('PhaseStart', 'phase text')
+# One "(n/m) ..." step of a pacman phase: keys, integrity, load, conflicts, diskspace, packages, hooks
+StepProgress = namedtuple('StepProgress', 'phase current total text')
+PackageAction = namedtuple('PackageAction', 'action name current total')
+HookRun = namedtuple('HookRun', 'name current total')
+DownloadStart = namedtuple('DownloadStart', 'name')
+DownloadProgress = namedtuple('DownloadProgress', 'name percent')
+DownloadFinish = namedtuple('DownloadFinish', 'name')
+AurBuild = namedtuple('AurBuild', 'name stage')
+FlatpakStep = namedtuple('FlatpakStep', 'action current total ref')
+OutputWarning = namedtuple('OutputWarning', 'text')
+# reason is None or a known failure the widget reacts to, e.g. 'libalpm'
+OutputError = namedtuple('OutputError', 'text reason')
+Conflict = namedtuple('Conflict', 'text packages')
+Prompt = namedtuple('Prompt', 'text')
+
+_STEP_RE = re.compile(r'\((\d+)/(\d+)\)\s+(.*)')
+_ACTION_RE = re.compile(r'(upgrading|installing|removing|reinstalling|downgrading)\s+(\S+?)(?:\.\.\.)?\s*$')
+_STEP_PHASES = (
+    ('checking keys', 'keys'),
+    ('checking package integrity', 'integrity'),
+    ('loading package files', 'load'),
+    ('checking for file conflicts', 'conflicts'),
+    ('checking available disk space', 'diskspace'),
+)
+_SECTION_PHASES = (
+    ('Synchronizing package databases', 'sync'),
+    ('Retrieving packages', 'download'),
+    ('Processing package changes', 'packages'),
+    ('Running pre-transaction hooks', 'hooks'),
+    ('Running post-transaction hooks', 'hooks'),
+)
+# pacman without a tty prints " foo-1.0-1-x86_64 downloading..." (older: "downloading foo...")
+_DOWNLOAD_RE = re.compile(r'\s*(?:downloading\s+(\S+?)\.\.\.|(\S+)\s+downloading\.\.\.)\s*$')
+_PERCENT_RE = re.compile(r'\s*(\S+)\s+.*?(\d{1,3})%\s*$')
+_CONFLICT_RE = re.compile(r':: (\S+) and (\S+) are in conflict')
+_FILE_CONFLICT_RE = re.compile(r'(\S+): (/\S*) exists in filesystem')
+_MAKEPKG_RE = re.compile(r'==> (Making package|Finished making): (\S+)')
+_FLATPAK_RE = re.compile(r'(Installing|Updating|Uninstalling)\s+(\d+)/(\d+)\W*\s*(\S*)')
+_PROMPT_RE = re.compile(
+    r'(\[[Yy]/[Nn]\]|\[[Nn]/[Yy]\]|Enter a (?:number|selection)[^:]*|\[v\]iew|Proceed with \S+)\s*[:?]?\s*$'
+)
+
+
+def index_kind(events):
+    """Reduce the events of a line to the run-log index kind: 'progress', 'warning', 'error' or None"""
+    kind = None
+    for event in events:
+        if isinstance(event, (OutputError, Conflict)):
+            return 'error'
+        if isinstance(event, OutputWarning):
+            kind = 'warning'
+        elif kind is None and isinstance(event, (StepProgress, FlatpakStep)):
+            kind = 'progress'
+    return kind
+
+
+class OutputParser:
+    """Split a command's output into lines and typed events."""
+
+    def __init__(self):
+        self._partial = ''
+        self._phase = None
+        self._download = None
+        self._prompted = None
+
+    def feed(self, text):
+        """Add a chunk of output; return [(line, events)] for every completed line"""
+        if not text:
+            return []
+        data = self._partial + text
+        lines = data.split('\n')
+        self._partial = lines.pop()
+        return [(line + '\n', self.parse_line(line)) for line in lines]
+
+    def finish(self):
+        """Return the [(line, events)] of a final line without a newline, if any"""
+        if not self._partial:
+            return []
+        line, self._partial = self._partial, ''
+        events = self.parse_line(line)
+        if self._download is not None:
+            events.append(DownloadFinish(self._download))
+            self._download = None
+        return [(line, events)]
+
+    def pending_prompt(self):
+        """Return a Prompt if the unterminated output ends in a question, once per prompt"""
+        partial = self._partial.rsplit('\r', 1)[-1]
+        if partial and partial != self._prompted and _PROMPT_RE.search(partial):
+            self._prompted = partial
+            return Prompt(partial.strip())
+        return None
+
+    def parse_line(self, line):
+        """Return the events of one line of output (without its newline)"""
+        # Progress bars redraw with \r; only the last state matters
+        line = line.rsplit('\r', 1)[-1].rstrip()
+        stripped = line.lstrip()
+        if not stripped:
+            return []
+        events = []
+        first = stripped[0]
+        if first == '(':
+            m = _STEP_RE.match(stripped)
+            if m:
+                self._step(events, int(m.group(1)), int(m.group(2)), m.group(3).strip())
+                return events
+        elif first == ':':
+            if stripped.startswith('::'):
+                self._section(events, stripped)
+                return events
+        elif first == '=':
+            self._makepkg(events, stripped)
+            return events
+        lower = stripped[:24].lower()
+        if lower.startswith(('error:', 'error ')):
+            if 'exists in filesystem' in stripped or 'conflicting' in stripped:
+                events.append(Conflict(stripped, ()))
+            else:
+                events.append(OutputError(stripped, None))
+        elif lower.startswith('warning:'):
+            events.append(OutputWarning(stripped))
+        elif 'error while loading shared libraries: libalpm.so' in stripped:
+            events.append(OutputError(stripped, 'libalpm'))
+        elif 'exists in filesystem' in stripped:
+            m = _FILE_CONFLICT_RE.search(stripped)
+            events.append(Conflict(stripped, (m.group(1),) if m else ()))
+        elif 'downloading' in stripped:
+            m = _DOWNLOAD_RE.match(stripped)
+            if m:
+                self._start_download(events, m.group(1) or m.group(2))
+        elif first in 'IUu':
+            m = _FLATPAK_RE.match(stripped)
+            if m:
+                events.append(FlatpakStep(m.group(1).lower(), int(m.group(2)), int(m.group(3)), m.group(4)))
+        elif stripped.endswith('%') and self._download is not None:
+            m = _PERCENT_RE.match(stripped)
+            if m:
+                events.append(DownloadProgress(m.group(1), int(m.group(2))))
+        return events
+
+    def _end_download(self, events):
+        if self._download is not None:
+            events.append(DownloadFinish(self._download))
+            self._download = None
+
+    def _start_download(self, events, name):
+        self._end_download(events)
+        self._download = name
+        events.append(DownloadStart(name))
+
+    def _step(self, events, current, total, text):
+        self._end_download(events)
+        if total <= 0:
+            return
+        if self._phase == 'hooks':
+            events.append(HookRun(text, current, total))
+            events.append(StepProgress('hooks', current, total, text))
+            return
+        m = _ACTION_RE.match(text)
+        if m:
+            events.append(PackageAction(m.group(1), m.group(2), current, total))
+            events.append(StepProgress('packages', current, total, text))
+            return
+        phase = self._phase or 'packages'
+        for prefix, name in _STEP_PHASES:
+            if text.startswith(prefix):
+                phase = name
+                break
+        events.append(StepProgress(phase, current, total, text))
+
+    def _section(self, events, line):
+        m = _CONFLICT_RE.match(line)
+        if m:
+            events.append(Conflict(line, (m.group(1), m.group(2))))
+            return
+        for marker, phase in _SECTION_PHASES:
+            if marker in line:
+                self._end_download(events)
+                self._phase = phase
+                events.append(PhaseStart(phase, line))
+                return
+
+    def _makepkg(self, events, line):
+        m = _MAKEPKG_RE.match(line)
+        if m:
+            stage = 'start' if m.group(1) == 'Making package' else 'finish'
+            if stage == 'start':
+                self._phase = 'aur'
+                events.append(PhaseStart('aur', line))
+            events.append(AurBuild(m.group(2), stage))
+        elif line.startswith('==> ERROR:'):
+            events.append(OutputError(line, None))
+        elif line.startswith('==> WARNING:'):
+            events.append(OutputWarning(line))
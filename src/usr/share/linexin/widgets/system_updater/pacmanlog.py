@@ -0,0 +1,198 @@
+"""Incremental reader for /var/log/pacman.log.
+
+The log only ever grows until logrotate replaces it, and it can reach
+hundreds of MB on old installs. The reader scans it backwards from the
+end in blocks and stops at the newest line it is looking for. The byte
+offset and inode it has seen are kept in the cache directory, so later
+calls only look at what was appended since; a new inode or a shorter
+file means the log was rotated and is scanned again.
+"""
+import datetime
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import namedtuple
+
+from . import cache
+
+PACMAN_LOG = '/var/log/pacman.log'
+STATE_FILE_NAME = "pacman-log.json"
+BLOCK_SIZE = 64 * 1024
+
+FULL_UPGRADE_MARKER = b'starting full system upgrade'
+_TRANSACTION_START = b'[ALPM] transaction started'
+_TRANSACTION_END = b'[ALPM] transaction completed'
+_CHANGE_RE = re.compile(r'\[ALPM\] (upgraded|installed|removed|downgraded|reinstalled) (\S+) \((.*)\)')
+
+PackageChange = namedtuple('PackageChange', 'action name old new')
+# completed is None for a transaction that was interrupted
+Transaction = namedtuple('Transaction', 'started completed packages')
+
+
+def parse_timestamp(line):
+    """Return the aware datetime a pacman.log line starts with, or None.
+
+    Current pacman writes "[2024-05-01T10:00:00+0200]"; logs from before
+    pacman 5.2 use "[2019-05-01 10:00]" in local time.
+    """
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', 'replace')
+    if not line.startswith('['):
+        return None
+    stamp = line[1:line.find(']')]
+    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M"):
+        try:
+            dt = datetime.datetime.strptime(stamp, fmt)
+        except ValueError:
+            continue
+        return dt if dt.tzinfo else dt.astimezone()
+    return None
+
+
+def lines_backwards(f, end, stop=0, block_size=BLOCK_SIZE):
+    """Yield the lines of a binary file between stop and end, newest first.
+
+    stop must be the start of a line. When end is not right after a
+    newline, the first line yielded is the incomplete last line.
+    """
+    pos = end
+    tail = b''
+    while pos > stop:
+        size = min(block_size, pos - stop)
+        pos -= size
+        f.seek(pos)
+        lines = (f.read(size) + tail).split(b'\n')
+        # The first piece may continue in the previous block
+        tail = lines.pop(0)
+        yield from reversed(lines)
+    if tail:
+        yield tail
+
+
+def _parse_change(line):
+    m = _CHANGE_RE.search(line.decode('utf-8', 'replace'))
+    if not m:
+        return None
+    action, name, versions = m.groups()
+    old, _sep, new = versions.partition(' -> ')
+    if not new:
+        # installed/removed only name one version
+        old, new = (None, old) if action == 'installed' else (old, None)
+    return PackageChange(action, name, old, new)
+
+
+class PacmanLogReader:
+    """Answers "when was the last full upgrade" without reading the whole log."""
+
+    def __init__(self, path=PACMAN_LOG, state_path=None):
+        self.path = path
+        self.state_path = state_path or os.path.join(cache.cache_dir(), STATE_FILE_NAME)
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(state, dict) or state.get('path') != self.path:
+            return {}
+        return state
+
+    def _save_state(self, state):
+        directory = os.path.dirname(self.state_path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pacman-log-', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Failed to write pacman log state: {e}")
+
+    def last_full_upgrade(self):
+        """Return the time of the newest "starting full system upgrade", or None"""
+        with self._lock:
+            if self._state is None:
+                self._state = self._load_state()
+            state = self._state
+            try:
+                with open(self.path, 'rb') as f:
+                    st = os.fstat(f.fileno())
+                    same_file = (state.get('inode') == st.st_ino and state.get('device') == st.st_dev
+                                 and state.get('offset', 0) <= st.st_size)
+                    stop = state['offset'] if same_file else 0
+                    if same_file and stop == st.st_size:
+                        return self._last_upgrade(state)
+                    found = None
+                    offset = st.st_size
+                    for index, line in enumerate(lines_backwards(f, st.st_size, stop)):
+                        if index == 0 and line:
+                            # A line still being written; look at it again next time
+                            offset -= len(line)
+                            continue
+                        if FULL_UPGRADE_MARKER in line:
+                            found = line
+                            break
+            except OSError:
+                return None
+            new_state = {
+                'path': self.path,
+                'inode': st.st_ino,
+                'device': st.st_dev,
+                'offset': offset,
+                'last_upgrade': state.get('last_upgrade') if same_file else None,
+            }
+            if found is not None:
+                dt = parse_timestamp(found)
+                if dt is not None:
+                    new_state['last_upgrade'] = dt.isoformat()
+            if new_state != state:
+                self._state = new_state
+                self._save_state(new_state)
+            return self._last_upgrade(new_state)
+
+    @staticmethod
+    def _last_upgrade(state):
+        stamp = state.get('last_upgrade')
+        if not stamp:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(stamp)
+        except ValueError:
+            return None
+
+    def recent_transactions(self, count=10, upgrades_only=True):
+        """Return the newest transactions, newest first.
+
+        With upgrades_only, only transactions that upgraded at least one
+        package are returned. Reads backwards only as far as needed.
+        """
+        transactions = []
+        changes = []
+        completed = None
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                for line in lines_backwards(f, size):
+                    if _TRANSACTION_END in line:
+                        changes = []
+                        completed = parse_timestamp(line)
+                    elif _TRANSACTION_START in line:
+                        changes.reverse()
+                        if changes and (not upgrades_only or any(c.action == 'upgraded' for c in changes)):
+                            transactions.append(Transaction(parse_timestamp(line), completed, tuple(changes)))
+                            if len(transactions) >= count:
+                                break
+                        changes = []
+                        completed = None
+                    elif b'[ALPM] ' in line:
+                        change = _parse_change(line)
+                        if change is not None:
+                            changes.append(change)
+        except OSError:
+            pass
+        return transactions
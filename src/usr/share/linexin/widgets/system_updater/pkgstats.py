@@ -0,0 +1,62 @@
+"""Installed-package counts for the info panel, read from the filesystem.
+
+pacman keeps one directory per installed package in its local database
+and Flatpak one directory per installed app under app/, so both counts
+are a directory listing. Installing or removing a package changes the
+mtime of those directories, so a count is only redone when that mtime
+moved; otherwise a refresh costs one stat() per source.
+"""
+import os
+import threading
+
+from .syncdb import PACMAN_DBPATH
+
+FLATPAK_APP_DIRS = ('/var/lib/flatpak/app', '~/.local/share/flatpak/app')
+
+
+def count_subdirs(path):
+    """Return the number of non-hidden subdirectories of path"""
+    count = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            if not entry.name.startswith('.') and entry.is_dir():
+                count += 1
+    return count
+
+
+class InstalledCounts:
+    """Package counts cached by the mtime of the directory they come from."""
+
+    def __init__(self, dbpath=PACMAN_DBPATH, flatpak_dirs=FLATPAK_APP_DIRS):
+        self.local_dir = os.path.join(dbpath, 'local')
+        self.flatpak_dirs = tuple(os.path.expanduser(path) for path in flatpak_dirs)
+        self._lock = threading.Lock()
+        self._cache = {}    # path -> (mtime_ns, count)
+
+    def _count(self, path):
+        """Return the number of entries in path, or None if it cannot be read"""
+        try:
+            # Taken before listing, so a change during the listing shows up next time
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        try:
+            count = count_subdirs(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._cache[path] = (mtime, count)
+        return count
+
+    def pacman_count(self):
+        """Return the number of installed pacman packages, or None"""
+        return self._count(self.local_dir)
+
+    def flatpak_count(self):
+        """Return the number of installed Flatpak apps (system and user), or None"""
+        counts = [count for count in map(self._count, self.flatpak_dirs) if count is not None]
+        return sum(counts) if counts else None
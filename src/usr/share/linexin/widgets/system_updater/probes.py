@@ -0,0 +1,313 @@
+"""Concurrent update probes for pacman, AUR and Flatpak.
+
+Every source runs in its own worker thread. All workers share one deadline
+and can be cancelled individually, so a full check takes about as long as
+the slowest probe instead of the sum of all of them.
+"""
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from . import _, syncdb
+from .downloadsize import parse_flatpak_size
+
+PROBE_DEADLINE = 45
+SOURCES = ('pacman', 'aur', 'flatpak')
+
+
+class ProbeCancelled(Exception):
+    """Raised inside a probe once its source was cancelled or timed out."""
+
+
+class ProbeFailed(Exception):
+    """Raised by a probe whose command could not tell whether there are updates."""
+
+
+class ProbeContext:
+    """Cancellation token and deadline shared by the commands of one probe"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self):
+        """Stop the probe, killing any command it is currently waiting on"""
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    def run(self, cmd, timeout):
+        """Run a command with LC_ALL=C, bounded by both timeout and the deadline"""
+        if self.cancelled:
+            raise ProbeCancelled()
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            env={**os.environ, 'LC_ALL': 'C'}
+        )
+        with self._lock:
+            self._processes.add(process)
+        try:
+            stdout, _unused = process.communicate(timeout=min(timeout, self.remaining()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+        if self.cancelled:
+            raise ProbeCancelled()
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, None)
+
+
+def read_ignored_packages(conf_path=syncdb.PACMAN_CONF):
+    """Return the set of IgnorePkg entries from pacman.conf"""
+    return set(syncdb.read_pacman_conf(conf_path)['ignore_pkgs'])
+
+
+def parse_query_updates(stdout, ignored_pkgs, update_type, default_repo=""):
+    """Parse `name current -> new [repo]` lines printed by checkupdates/paru"""
+    updates = []
+    for line in stdout.strip().split('\n'):
+        if ' ' not in line:
+            continue
+        parts = line.split()
+        if len(parts) < 4 or parts[0] in ignored_pkgs:
+            continue
+        repo = parts[4] if len(parts) > 4 else ""
+        updates.append({
+            'name': parts[0],
+            'current': parts[1],
+            'new': parts[3],
+            'repo': repo if repo else default_repo,
+            'type': update_type
+        })
+    return updates
+
+
+def probe_pacman(ctx, ignored_pkgs, refresh_databases=True):
+    """Repository updates, read in-process from recent sync dbs or via checkupdates.
+
+    Without refresh_databases, sync dbs synced within SYNC_DB_MAX_AGE (by
+    pacman -Sy or an earlier checkupdates run) are trusted as they are.
+    """
+    if not refresh_databases:
+        try:
+            return syncdb.find_updates()
+        except (syncdb.SyncDbError, OSError) as e:
+            print(f"Falling back to checkupdates: {e}")
+    try:
+        result = ctx.run(['checkupdates'], timeout=30)
+    except (subprocess.SubprocessError, FileNotFoundError) as e:
+        raise ProbeFailed(f"checkupdates: {e}") from e
+    # checkupdates exits 2 when there are no updates and 1 when it failed
+    if result.returncode == 2:
+        return []
+    if result.returncode != 0:
+        raise ProbeFailed(f"checkupdates exited with code {result.returncode}")
+    return parse_query_updates(result.stdout, ignored_pkgs, 'pacman')
+
+
+def probe_aur(ctx, ignored_pkgs):
+    """Foreign package updates via paru (AUR only, repo updates come from checkupdates)"""
+    try:
+        result = ctx.run(['paru', '-Qua'], timeout=30)
+    except (subprocess.SubprocessError, OSError) as e:
+        raise ProbeFailed(f"paru: {e}") from e
+    # Like pacman -Qu, paru exits 1 without output when nothing is out of date
+    if result.returncode == 1 and not result.stdout.strip():
+        return []
+    if result.returncode != 0:
+        raise ProbeFailed(f"paru exited with code {result.returncode}")
+    return parse_query_updates(result.stdout, ignored_pkgs, 'AUR', default_repo="AUR")
+
+
+def _flatpak_remote_updates(ctx, scope_flag, scope_name, remote):
+    updates = []
+    # The download size comes along so the estimate needs no second remote-ls
+    cmd = ['flatpak', 'remote-ls', scope_flag, '--updates', '--columns=ref,version,download-size', remote]
+    try:
+        r_res = ctx.run(cmd, timeout=15)
+    except (subprocess.SubprocessError, OSError) as e:
+        raise ProbeFailed(f"flatpak remote-ls {remote}: {e}") from e
+    if r_res.returncode != 0:
+        raise ProbeFailed(f"flatpak remote-ls {remote} exited with code {r_res.returncode}")
+    if not r_res.stdout.strip():
+        return updates
+    for line in r_res.stdout.strip().split('\n'):
+        # Columns are tab separated; the version may be empty and the size has a space
+        parts = line.strip().split('\t')
+        if len(parts) < 2:
+            parts = line.split()
+        if len(parts) < 1:
+            continue
+        ref = parts[0].strip()
+        version = parts[1].strip() if len(parts) > 1 else ""
+        download_size = parse_flatpak_size(parts[2]) if len(parts) > 2 else 0
+        ref_parts = ref.split('/')
+        if len(ref_parts) >= 4:
+            app_id = ref_parts[1]
+            updates.append({
+                'name': app_id.split('.')[-1] if '.' in app_id else app_id,
+                'current': _("installed"),
+                'new': version if version else _("new version"),
+                'repo': f"{remote} ({scope_name})",
+                'app_id': app_id,
+                'scope': scope_name,
+                'type': 'flatpak',
+                'download_size': download_size
+            })
+    return updates
+
+
+def _flatpak_remotes(ctx, scope_flag):
+    try:
+        res = ctx.run(['flatpak', 'remotes', scope_flag, '--columns=name'], timeout=10)
+    except (subprocess.SubprocessError, OSError) as e:
+        raise ProbeFailed(f"flatpak remotes: {e}") from e
+    if res.returncode != 0:
+        raise ProbeFailed(f"flatpak remotes exited with code {res.returncode}")
+    return [r.strip() for r in res.stdout.strip().split('\n') if r.strip()]
+
+
+def probe_flatpak(ctx):
+    """Flatpak updates for every remote of both scopes, queried in parallel"""
+    scopes = (('--system', 'system'), ('--user', 'user'))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        remote_lists = list(pool.map(lambda s: _flatpak_remotes(ctx, s[0]), scopes))
+    jobs = [
+        (scope_flag, scope_name, remote)
+        for (scope_flag, scope_name), remotes in zip(scopes, remote_lists)
+        for remote in remotes
+    ]
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(jobs), 6)) as pool:
+        per_remote = list(pool.map(lambda job: _flatpak_remote_updates(ctx, *job), jobs))
+    # System scope wins over user scope for the same app, as before
+    all_flatpak_updates = []
+    seen_ids = set()
+    for updates in per_remote:
+        for up in updates:
+            if up['app_id'] not in seen_ids:
+                all_flatpak_updates.append(up)
+                seen_ids.add(up['app_id'])
+    return all_flatpak_updates
+
+
+class UpdateProbeEngine:
+    """Run all update probes concurrently under one shared deadline."""
+
+    def __init__(self, deadline=PROBE_DEADLINE):
+        self.deadline = deadline
+        self._contexts = {}
+        self._lock = threading.Lock()
+        # Sources that errored or missed the deadline during the last run
+        self.failed_sources = set()
+        # Sources that were cancelled before they finished during the last run
+        self.cancelled_sources = set()
+
+    @property
+    def complete(self):
+        """True if every source of the last run finished successfully"""
+        return not self.failed_sources and not self.cancelled_sources
+
+    def _probe(self, source, ctx, ignored_pkgs, refresh_databases):
+        if source == 'pacman':
+            return probe_pacman(ctx, ignored_pkgs, refresh_databases)
+        if source == 'aur':
+            return probe_aur(ctx, ignored_pkgs)
+        if source == 'flatpak':
+            return probe_flatpak(ctx)
+        raise ValueError(f"Unknown update source: {source}")
+
+    def cancel(self, source=None):
+        """Cancel one running source, or all of them"""
+        with self._lock:
+            contexts = dict(self._contexts)
+        for name, ctx in contexts.items():
+            if source is None or name == source:
+                ctx.cancel()
+
+    def run(self, sources=SOURCES, on_result=None, refresh_databases=True):
+        """Probe the given sources and return {source: [update dicts]}.
+
+        on_result(source, updates) is called from the worker thread as soon
+        as each source finishes. Sources that fail, are cancelled or miss
+        the deadline report an empty list and are recorded in
+        failed_sources or cancelled_sources; only a run where complete is
+        True may be cached as the truth. Without refresh_databases,
+        recently synced pacman databases are read in-process instead of
+        syncing a fresh copy through checkupdates.
+        """
+        deadline = time.monotonic() + self.deadline
+        ignored_pkgs = read_ignored_packages()
+        results = {source: [] for source in sources}
+        failed = set()
+        cancelled = set()
+        with self._lock:
+            self._contexts = {source: ProbeContext(deadline) for source in sources}
+            contexts = dict(self._contexts)
+        pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="update-probe")
+        try:
+            futures = {
+                pool.submit(self._probe, source, contexts[source], ignored_pkgs, refresh_databases): source
+                for source in sources
+            }
+            pending = set(futures)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = futures[future]
+                    try:
+                        results[source] = future.result()
+                    except ProbeCancelled:
+                        cancelled.add(source)
+                        continue
+                    except Exception as e:
+                        print(f"{source} update check error: {e}")
+                        failed.add(source)
+                        continue
+                    if contexts[source].cancelled:
+                        # Probes that swallow their errors can still return [] after a cancel
+                        cancelled.add(source)
+                        results[source] = []
+                        continue
+                    if on_result:
+                        on_result(source, results[source])
+            for future in pending:
+                if contexts[futures[future]].cancelled:
+                    cancelled.add(futures[future])
+                    continue
+                print(f"{futures[future]} update check timed out")
+                contexts[futures[future]].cancel()
+                failed.add(futures[future])
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self._contexts = {}
+            self.failed_sources = failed
+            self.cancelled_sources = cancelled
+        if 'pacman' in results and 'aur' in results:
+            repo_names = {u['name'] for u in results['pacman']}
+            results['aur'] = [u for u in results['aur'] if u['name'] not in repo_names]
+        return results
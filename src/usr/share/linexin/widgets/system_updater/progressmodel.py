@@ -0,0 +1,219 @@
+"""Overall progress of an install run across all of its phases.
+
+An update runs through a database sync, the package downloads, the
+pacman transaction, the post-transaction hooks, the AUR builds and the
+Flatpak update, and every one of them counts its own "(n/m)" from zero.
+The model plans those phases from the update check, gives each one a
+weight in expected seconds (downloads by byte size, the rest by the
+rates measured in earlier runs) and turns the parser events into a
+single fraction that never moves backwards, plus an ETA.
+"""
+import json
+import os
+import tempfile
+import time
+
+from . import _, cache
+from .outputparser import AurBuild, DownloadProgress, DownloadStart, FlatpakStep, PhaseStart, StepProgress
+
+PHASES = ('sync', 'download', 'install', 'hooks', 'aur', 'flatpak')
+HISTORY_FILE_NAME = "progress-history.json"
+
+# Used until a run has been measured: seconds per run for sync and hooks,
+# bytes per second for downloads, seconds per package, build or app otherwise
+DEFAULT_RATES = {
+    'sync': 4.0,
+    'download': 4 * 1024 * 1024,
+    'install': 0.6,
+    'hooks': 8.0,
+    'aur': 90.0,
+    'flatpak': 20.0,
+}
+# Download weight of a repo package when the check found no sizes
+FALLBACK_PACKAGE_BYTES = 2 * 1024 * 1024
+# Share of a new measurement in the remembered rate
+HISTORY_SMOOTHING = 0.3
+
+# Share of the install phase taken by the checks before packages are unpacked
+_CHECK_STEPS = ('keys', 'integrity', 'load', 'conflicts', 'diskspace')
+_CHECK_SHARE = 0.1
+
+
+def load_history():
+    """Return the rates measured in earlier runs, {} if there are none"""
+    try:
+        with open(os.path.join(cache.cache_dir(), HISTORY_FILE_NAME), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {phase: float(rate) for phase, rate in data.items()
+            if phase in DEFAULT_RATES and isinstance(rate, (int, float)) and rate > 0}
+
+
+def save_history(rates):
+    """Atomically write the measured rates"""
+    directory = cache.cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.progress-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(rates, f)
+        os.replace(tmp_path, os.path.join(directory, HISTORY_FILE_NAME))
+    except OSError as e:
+        print(f"Failed to write progress history: {e}")
+
+
+def format_eta(seconds):
+    """Format a remaining time for the status line"""
+    if seconds < 60:
+        return _("Less than a minute remaining")
+    minutes = int(round(seconds / 60))
+    if minutes < 60:
+        return _("About {} min remaining").format(minutes)
+    return _("About {} h {} min remaining").format(minutes // 60, minutes % 60)
+
+
+class ProgressModel:
+    """Weighted, monotonic progress of one planned install run."""
+
+    def __init__(self, repo_count=0, aur_count=0, flatpak_count=0, download_bytes=0,
+                 download_count=None, history=None, clock=time.monotonic):
+        self.rates = dict(DEFAULT_RATES)
+        self.rates.update(history or {})
+        self.measured_bytes = download_bytes > 0
+        # Packages already in the pacman cache are not downloaded again
+        self.download_count = repo_count if download_count is None else download_count
+        self.units = {
+            'sync': 1 if repo_count or aur_count else 0,
+            'download': download_bytes or self.download_count * FALLBACK_PACKAGE_BYTES,
+            'install': repo_count,
+            'hooks': 1 if repo_count or aur_count else 0,
+            'aur': aur_count,
+            'flatpak': flatpak_count,
+        }
+        self.weights = {}
+        for phase in PHASES:
+            if phase == 'download':
+                self.weights[phase] = self.units[phase] / self.rates[phase]
+            else:
+                self.weights[phase] = self.units[phase] * self.rates[phase]
+        self.total = sum(self.weights.values())
+        self.repo_count = repo_count
+        self.aur_count = aur_count
+        self._clock = clock
+        self._start_time = clock()
+        self._done = dict.fromkeys(PHASES, 0.0)
+        self._phase = None
+        self._phase_started = None
+        self._durations = {}
+        self._pre_hooks = False
+        self._downloads = 0
+        self._built = 0
+        self._building = False
+        self._fraction = 0.0
+        self.finished = False
+
+    def __bool__(self):
+        return self.total > 0
+
+    def _enter(self, phase):
+        """Move to a later phase; earlier phases count as complete"""
+        if self._phase is not None and PHASES.index(phase) <= PHASES.index(self._phase):
+            return self._phase == phase
+        now = self._clock()
+        if self._phase is not None:
+            self._durations[self._phase] = now - self._phase_started
+        for earlier in PHASES[:PHASES.index(phase)]:
+            self._done[earlier] = 1.0
+        self._phase = phase
+        self._phase_started = now
+        return True
+
+    def _advance(self, phase, done):
+        self._done[phase] = max(self._done[phase], min(done, 1.0))
+
+    def handle(self, event):
+        """Account for one parser event"""
+        if isinstance(event, PhaseStart):
+            if event.phase == 'packages':
+                self._enter('install')
+            elif event.phase == 'hooks':
+                self._pre_hooks = 'pre-transaction' in event.text
+                if not self._pre_hooks:
+                    self._enter('hooks')
+            elif event.phase in PHASES:
+                self._enter(event.phase)
+        elif isinstance(event, StepProgress):
+            fraction = event.current / event.total
+            if event.phase == 'hooks':
+                if not self._pre_hooks and self._phase == 'hooks':
+                    self._advance('hooks', fraction)
+            elif event.phase in _CHECK_STEPS:
+                if self._enter('install'):
+                    step = _CHECK_STEPS.index(event.phase)
+                    self._advance('install', _CHECK_SHARE * (step + fraction) / len(_CHECK_STEPS))
+            elif self._enter('install'):
+                self._advance('install', _CHECK_SHARE + (1 - _CHECK_SHARE) * fraction)
+        elif isinstance(event, DownloadStart):
+            # Database downloads during the sync are not package downloads
+            if self._phase == 'download' and self.download_count:
+                self._advance('download', self._downloads / self.download_count)
+                self._downloads += 1
+        elif isinstance(event, DownloadProgress):
+            if self._phase == 'download' and self.download_count:
+                self._advance('download', (self._downloads - 1 + event.percent / 100) / self.download_count)
+        elif isinstance(event, AurBuild):
+            self._enter('aur')
+            if event.stage == 'start':
+                self._building = True
+            else:
+                self._building = False
+                self._built += 1
+            if self.aur_count:
+                self._advance('aur', (self._built + 0.5 * self._building) / self.aur_count)
+        elif isinstance(event, FlatpakStep):
+            self._enter('flatpak')
+            self._advance('flatpak', (event.current - 1) / event.total)
+
+    def fraction(self):
+        """Return the overall fraction; it only grows and stays below 1 until finish()"""
+        if self.finished:
+            return 1.0
+        if self.total > 0:
+            done = sum(self.weights[phase] * self._done[phase] for phase in PHASES) / self.total
+            self._fraction = max(self._fraction, min(done, 0.99))
+        return self._fraction
+
+    def eta(self):
+        """Return the estimated seconds left, or None before there is anything to go by"""
+        if self.finished or self.total <= 0:
+            return None
+        fraction = self.fraction()
+        remaining = self.total * (1 - fraction)
+        elapsed = self._clock() - self._start_time
+        # Once some work is done, scale the plan by how fast this machine actually is
+        if fraction >= 0.05 and elapsed > 0:
+            remaining *= elapsed / (self.total * fraction)
+        return remaining
+
+    def finish(self):
+        """Mark the run as complete; returns the rates to remember for the next run"""
+        now = self._clock()
+        if self._phase is not None:
+            self._durations[self._phase] = now - self._phase_started
+        self.finished = True
+        rates = dict(self.rates)
+        for phase, seconds in self._durations.items():
+            units = self.units[phase]
+            if seconds <= 0 or units <= 0:
+                continue
+            if phase == 'download':
+                if not self.measured_bytes:
+                    continue
+                measured = units / seconds
+            else:
+                measured = seconds / units
+            rates[phase] = (1 - HISTORY_SMOOTHING) * rates[phase] + HISTORY_SMOOTHING * measured
+        return rates
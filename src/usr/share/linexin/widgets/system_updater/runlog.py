@@ -0,0 +1,135 @@
+"""Per-run install logs under $XDG_STATE_HOME/linexin-updater/.
+
+Every install run gets a timestamped .log file, written through by the
+LogStore as output arrives, and an .idx file next to it listing the byte
+offsets of progress, warning and error lines ("kind offset" per line).
+A history viewer can read the index and seek straight to the failures.
+Old runs are rotated away by count and total size.
+"""
+import os
+import time
+
+from .installlog import LogStore
+
+MAX_RUN_LOGS = 10
+MAX_LOG_DIR_BYTES = 64 * 1024 * 1024
+INDEX_KINDS = ('progress', 'warning', 'error')
+
+
+def default_log_dir():
+    """Return $XDG_STATE_HOME/linexin-updater"""
+    state_home = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(state_home, 'linexin-updater')
+
+
+def _run_order(name):
+    """Sort key of update-STAMP[-N].log: by timestamp, then by collision suffix"""
+    parts = name[len('update-'):-len('.log')].split('-')
+    suffix = parts[2] if len(parts) > 2 else ''
+    return '-'.join(parts[:2]), int(suffix) if suffix.isdigit() else 0
+
+
+def list_runs(log_dir=None):
+    """Return the log paths of past runs, newest first"""
+    log_dir = log_dir or default_log_dir()
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return []
+    runs = sorted((n for n in names if n.startswith('update-') and n.endswith('.log')), key=_run_order, reverse=True)
+    return [os.path.join(log_dir, n) for n in runs]
+
+
+def index_path(log_path):
+    """Return the index file that belongs to a run log"""
+    return log_path[:-len('.log')] + '.idx'
+
+
+def read_index(log_path):
+    """Return {kind: [byte offsets]} for a run log; empty lists if it has no index"""
+    index = {kind: [] for kind in INDEX_KINDS}
+    try:
+        with open(index_path(log_path), 'r') as f:
+            for line in f:
+                kind, _sep, offset = line.partition(' ')
+                if kind in index:
+                    try:
+                        index[kind].append(int(offset))
+                    except ValueError:
+                        continue
+    except OSError:
+        pass
+    return index
+
+
+def read_lines_at(log_path, offset, n_lines=20):
+    """Return up to n_lines lines of a run log starting at a byte offset"""
+    lines = []
+    with open(log_path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            lines.append(raw.decode('utf-8', 'replace'))
+            if len(lines) >= n_lines:
+                break
+    return ''.join(lines)
+
+
+def rotate_logs(log_dir=None, keep=MAX_RUN_LOGS, max_bytes=MAX_LOG_DIR_BYTES):
+    """Delete the oldest runs until fewer than keep remain and they fit in max_bytes"""
+    runs = list_runs(log_dir)
+    sizes = []
+    for path in runs:
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(0)
+    total = sum(sizes)
+    # Oldest first; keep - 1 leaves room for the run about to start
+    while runs and (len(runs) > keep - 1 or total > max_bytes):
+        path = runs.pop()
+        total -= sizes.pop()
+        for victim in (path, index_path(path)):
+            try:
+                os.remove(victim)
+            except OSError:
+                pass
+
+
+class RunLog(LogStore):
+    """LogStore written through to a per-run log file with an offset index."""
+
+    def __init__(self, log_dir=None, **kwargs):
+        log_dir = log_dir or default_log_dir()
+        os.makedirs(log_dir, exist_ok=True)
+        rotate_logs(log_dir)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(log_dir, f'update-{stamp}.log')
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(log_dir, f'update-{stamp}-{suffix}.log')
+            suffix += 1
+        super().__init__(path=path, **kwargs)
+        # Line-buffered: the index stays usable even if the widget dies mid-run
+        self._index = open(index_path(path), 'w', buffering=1)
+
+    def append(self, text, kind=None):
+        """Add output to the log and record it in the index if it is notable"""
+        offset = super().append(text, kind)
+        if kind in INDEX_KINDS and offset is not None and self._index is not None:
+            self._index.write(f'{kind} {offset}\n')
+        return offset
+
+    def close(self):
+        super().close()
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+def open_run_log():
+    """Start the log of a new install run; falls back to memory only if the state dir is unusable"""
+    try:
+        return RunLog()
+    except OSError as e:
+        print(f"Could not create update log file: {e}")
+        return LogStore()
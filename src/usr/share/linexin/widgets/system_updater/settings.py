@@ -0,0 +1,39 @@
+"""User settings of the updater.
+
+Settings live in $XDG_CONFIG_HOME/linexin-updater/settings.json; keys
+that are missing or malformed fall back to DEFAULTS. The environment
+variable LINEXIN_UPDATER_SOUNDS=0 turns sounds off for one session.
+"""
+import json
+import os
+
+SETTINGS_FILE_NAME = "settings.json"
+DEFAULTS = {
+    # Play a sound when an install finishes or fails
+    'play_sounds': True,
+}
+_FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+def config_dir():
+    """Return the per-user config directory of the updater"""
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(base, 'linexin-updater')
+
+
+def load_settings():
+    """Return the settings dict with defaults filled in"""
+    settings = dict(DEFAULTS)
+    try:
+        with open(os.path.join(config_dir(), SETTINGS_FILE_NAME), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if isinstance(data, dict):
+        for key, default in DEFAULTS.items():
+            if isinstance(data.get(key), type(default)):
+                settings[key] = data[key]
+    sounds = os.environ.get('LINEXIN_UPDATER_SOUNDS')
+    if sounds is not None:
+        settings['play_sounds'] = sounds.strip().lower() not in _FALSE_VALUES
+    return settings
@@ -0,0 +1,255 @@
+"""Read pacman's sync and local databases in-process.
+
+This replaces `checkupdates` for the common case where the sync databases
+are already recent: instead of spawning pacman against a temporary db copy,
+the tarballs in a sync directory are read directly and compared against
+/var/lib/pacman/local with a native vercmp.
+"""
+import fnmatch
+import glob
+import io
+import os
+import tarfile
+import time
+
+from .vercmp import vercmp
+
+PACMAN_CONF = '/etc/pacman.conf'
+PACMAN_DBPATH = '/var/lib/pacman'
+# Sync dbs older than this are not trusted; the caller falls back to checkupdates
+SYNC_DB_MAX_AGE = 90 * 60
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+    _zstd_decompress = _zstd.decompress
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        def _zstd_decompress(data):
+            with _zstd.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                return reader.read()
+    except ImportError:
+        _zstd_decompress = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class SyncDbError(Exception):
+    """A database could not be read; callers should fall back to pacman."""
+
+
+def read_pacman_conf(path=PACMAN_CONF):
+    """Return repos (in priority order), IgnorePkg, IgnoreGroup and CacheDir from pacman.conf"""
+    conf = {'repos': [], 'ignore_pkgs': [], 'ignore_groups': [], 'dbpath': PACMAN_DBPATH, 'cache_dirs': []}
+    section = None
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                if line.startswith('[') and line.endswith(']'):
+                    section = line[1:-1]
+                    if section != 'options':
+                        conf['repos'].append(section)
+                    continue
+                if section != 'options':
+                    continue
+                key, _sep, value = line.partition('=')
+                key = key.strip()
+                if key == 'IgnorePkg':
+                    conf['ignore_pkgs'].extend(value.split())
+                elif key == 'IgnoreGroup':
+                    conf['ignore_groups'].extend(value.split())
+                elif key == 'DBPath':
+                    conf['dbpath'] = value.strip().rstrip('/')
+                elif key == 'CacheDir':
+                    conf['cache_dirs'].extend(value.split())
+    except OSError:
+        pass
+    return conf
+
+
+def parse_desc(text):
+    """Parse a pacman desc file into {'%KEY%': [values]}"""
+    fields = {}
+    key = None
+    for line in text.splitlines():
+        if line.startswith('%') and line.endswith('%') and len(line) > 2:
+            key = line
+            fields[key] = []
+        elif not line:
+            key = None
+        elif key is not None:
+            fields[key].append(line)
+    return fields
+
+
+def _first(fields, key, default=""):
+    values = fields.get(key)
+    return values[0] if values else default
+
+
+def _open_tarball(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] == _ZSTD_MAGIC:
+        if _zstd_decompress is None:
+            raise SyncDbError(f"{path} is zstd-compressed and no zstd module is available")
+        try:
+            data = _zstd_decompress(data)
+        except Exception as e:
+            raise SyncDbError(f"{path}: {e}") from e
+    try:
+        return tarfile.open(fileobj=io.BytesIO(data), mode='r:*')
+    except tarfile.TarError as e:
+        raise SyncDbError(f"{path}: {e}") from e
+
+
+def read_sync_db(path, names=None):
+    """Return {name: desc fields} for the packages in a sync db tarball.
+
+    With names, only entries whose directory name (name-pkgver-pkgrel)
+    matches one of them are decompressed and parsed.
+    """
+    packages = {}
+    with _open_tarball(path) as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.endswith('/desc'):
+                continue
+            if names is not None and member.name[:-5].rsplit('-', 2)[0] not in names:
+                continue
+            f = tar.extractfile(member)
+            if f is None:
+                continue
+            fields = parse_desc(f.read().decode('utf-8', 'replace'))
+            name = _first(fields, '%NAME%')
+            if name:
+                packages[name] = fields
+    return packages
+
+
+def read_local_db(dbpath=PACMAN_DBPATH):
+    """Return {name: version} for every installed package"""
+    installed = {}
+    local_dir = os.path.join(dbpath, 'local')
+    try:
+        entries = os.listdir(local_dir)
+    except OSError as e:
+        raise SyncDbError(f"{local_dir}: {e}") from e
+    for entry in entries:
+        try:
+            with open(os.path.join(local_dir, entry, 'desc'), 'r', encoding='utf-8', errors='replace') as f:
+                fields = parse_desc(f.read())
+        except OSError:
+            continue
+        name = _first(fields, '%NAME%')
+        if name:
+            installed[name] = _first(fields, '%VERSION%')
+    return installed
+
+
+def local_providers(provides, dbpath=PACMAN_DBPATH):
+    """Return the names of installed packages that provide any of the given names"""
+    wanted = set(provides)
+    providers = set()
+    if not wanted:
+        return providers
+    local_dir = os.path.join(dbpath, 'local')
+    try:
+        entries = os.listdir(local_dir)
+    except OSError as e:
+        raise SyncDbError(f"{local_dir}: {e}") from e
+    for entry in entries:
+        try:
+            with open(os.path.join(local_dir, entry, 'desc'), 'r', encoding='utf-8', errors='replace') as f:
+                fields = parse_desc(f.read())
+        except OSError:
+            continue
+        # Provides may carry a version: initramfs=1.0
+        if any(p.split('=', 1)[0] in wanted for p in fields.get('%PROVIDES%', [])):
+            name = _first(fields, '%NAME%')
+            if name:
+                providers.add(name)
+    return providers
+
+
+def candidate_sync_dirs(dbpath=PACMAN_DBPATH):
+    """Sync directories that may hold recent databases: pacman's own and checkupdates'"""
+    dirs = [os.path.join(dbpath, 'sync')]
+    tmp = os.environ.get('TMPDIR') or '/tmp'
+    checkup_db = os.environ.get('CHECKUPDATES_DB')
+    if checkup_db:
+        dirs.append(os.path.join(checkup_db, 'sync'))
+    dirs.extend(sorted(glob.glob(os.path.join(tmp, f'checkup-db-{os.getuid()}*', 'sync'))))
+    return dirs
+
+
+def sync_dir_mtime(sync_dir, repos):
+    """Return the oldest mtime of the configured repo dbs in a dir, or None if any is missing"""
+    mtimes = []
+    for repo in repos:
+        try:
+            mtimes.append(os.stat(os.path.join(sync_dir, f'{repo}.db')).st_mtime)
+        except OSError:
+            return None
+    return min(mtimes) if mtimes else None
+
+
+def newest_sync_dir(conf=None, dbpath=None):
+    """Return (sync_dir, mtime) of the most recently synced complete db set, or (None, None)"""
+    conf = conf or read_pacman_conf()
+    best, best_mtime = None, None
+    for sync_dir in candidate_sync_dirs(dbpath or conf['dbpath']):
+        mtime = sync_dir_mtime(sync_dir, conf['repos'])
+        if mtime is not None and (best_mtime is None or mtime > best_mtime):
+            best, best_mtime = sync_dir, mtime
+    return best, best_mtime
+
+
+def _is_ignored(name, fields, conf):
+    if any(fnmatch.fnmatchcase(name, pattern) for pattern in conf['ignore_pkgs']):
+        return True
+    groups = fields.get('%GROUPS%', [])
+    return any(fnmatch.fnmatchcase(group, pattern)
+               for group in groups for pattern in conf['ignore_groups'])
+
+
+def find_updates(sync_dir=None, conf=None, dbpath=None, max_age=SYNC_DB_MAX_AGE):
+    """Return pending repo updates as {'name','current','new','repo','type'} dicts.
+
+    Raises SyncDbError if no sync directory is recent enough or a database
+    cannot be read, so the caller can fall back to checkupdates.
+    """
+    conf = conf or read_pacman_conf()
+    dbpath = dbpath or conf['dbpath']
+    if sync_dir is None:
+        sync_dir, mtime = newest_sync_dir(conf, dbpath)
+        if sync_dir is None:
+            raise SyncDbError("no complete set of sync databases found")
+        if max_age is not None and time.time() - mtime > max_age:
+            raise SyncDbError(f"sync databases in {sync_dir} are too old")
+    installed = read_local_db(dbpath)
+    remaining = dict(installed)
+    updates = []
+    # The first repo providing a package wins, as in pacman -Qu
+    for repo in conf['repos']:
+        if not remaining:
+            break
+        sync_pkgs = read_sync_db(os.path.join(sync_dir, f'{repo}.db'), remaining)
+        for name in [n for n in remaining if n in sync_pkgs]:
+            current = remaining.pop(name)
+            fields = sync_pkgs[name]
+            new = _first(fields, '%VERSION%')
+            if vercmp(new, current) <= 0 or _is_ignored(name, fields, conf):
+                continue
+            updates.append({
+                'name': name,
+                'current': current,
+                'new': new,
+                'repo': repo,
+                'type': 'pacman'
+            })
+    updates.sort(key=lambda u: u['name'])
+    return updates
@@ -0,0 +1,108 @@
+"""Startup tracer writing Chrome trace JSON.
+
+Set LINEXIN_UPDATER_TRACE to a file path (or to 1 for
+$XDG_CACHE_HOME/linexin-updater/startup-trace.json) and the widget
+records its module import, each setup_* step, the first frame and the
+first populated list with monotonic timestamps. The file opens in
+chrome://tracing or https://ui.perfetto.dev. With the variable unset
+every call is a cheap no-op.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+from . import cache
+
+ENV_VAR = 'LINEXIN_UPDATER_TRACE'
+DEFAULT_TRACE_FILE_NAME = "startup-trace.json"
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """Collects trace events in memory and writes them on request."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = path is not None
+        self._events = []
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @classmethod
+    def from_env(cls):
+        """Return a tracer configured by LINEXIN_UPDATER_TRACE"""
+        value = os.environ.get(ENV_VAR, '').strip()
+        if not value or value == '0':
+            return cls()
+        if value == '1':
+            value = os.path.join(cache.cache_dir(), DEFAULT_TRACE_FILE_NAME)
+        return cls(value)
+
+    def _add(self, event):
+        event['pid'] = self._pid
+        event['tid'] = threading.get_ident()
+        with self._lock:
+            self._events.append(event)
+
+    def complete(self, name, start_ns, end_ns=None, category='startup'):
+        """Record a span that has already ended"""
+        if not self.enabled:
+            return
+        if end_ns is None:
+            end_ns = time.monotonic_ns()
+        self._add({'name': name, 'cat': category, 'ph': 'X',
+                   'ts': start_ns / 1000, 'dur': (end_ns - start_ns) / 1000})
+
+    def phases(self, marks, category='import'):
+        """Record consecutive spans from [(name, ns), ...]; each span ends at the next mark"""
+        for (name, start_ns), (_next, end_ns) in zip(marks, marks[1:]):
+            self.complete(name, start_ns, end_ns, category)
+
+    def span(self, name, category='startup'):
+        """Context manager recording the time spent inside it"""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category)
+
+    @contextlib.contextmanager
+    def _span(self, name, category):
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, start_ns, category=category)
+
+    def instant(self, name, once=False, category='startup'):
+        """Record a point in time; with once, only its first occurrence"""
+        if not self.enabled:
+            return
+        if once:
+            with self._lock:
+                if name in self._seen:
+                    return
+                self._seen.add(name)
+        self._add({'name': name, 'cat': category, 'ph': 'i', 's': 'p',
+                   'ts': time.monotonic_ns() / 1000})
+
+    def recorded(self, name):
+        """True once an event with this name has been recorded"""
+        with self._lock:
+            return any(event['name'] == name for event in self._events)
+
+    def write(self):
+        """Write all events recorded so far to the trace file"""
+        if not self.enabled:
+            return
+        with self._lock:
+            data = {'traceEvents': list(self._events), 'displayTimeUnit': 'ms'}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Failed to write startup trace: {e}")
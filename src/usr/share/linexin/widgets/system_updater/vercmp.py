@@ -0,0 +1,143 @@
+"""Pure-Python port of libalpm's package version comparison (vercmp).
+
+Results are memoised: an update check compares the same version pairs
+again and again (sorting, dedupe, re-checks), so an LRU cache turns most
+calls into a dict lookup.
+"""
+import functools
+import re
+
+VERCMP_CACHE_SIZE = 4096
+_SEGMENT_RE = re.compile(r'[0-9]+|[A-Za-z]+')
+
+
+def _isdigit(c):
+    return '0' <= c <= '9'
+
+
+def _isalpha(c):
+    return 'a' <= c <= 'z' or 'A' <= c <= 'Z'
+
+
+def _isalnum(c):
+    return _isdigit(c) or _isalpha(c)
+
+
+def rpmvercmp(a, b):
+    """Compare two version segments the way libalpm's rpmvercmp() does"""
+    if a == b:
+        return 0
+    one = two = 0
+    len_a, len_b = len(a), len(b)
+    isnum = False
+    while one < len_a and two < len_b:
+        ptr1, ptr2 = one, two
+        while one < len_a and not _isalnum(a[one]):
+            one += 1
+        while two < len_b and not _isalnum(b[two]):
+            two += 1
+        if one >= len_a or two >= len_b:
+            break
+        # Different separator lengths decide the comparison on their own
+        if one - ptr1 != two - ptr2:
+            return -1 if one - ptr1 < two - ptr2 else 1
+        ptr1, ptr2 = one, two
+        if _isdigit(a[ptr1]):
+            while ptr1 < len_a and _isdigit(a[ptr1]):
+                ptr1 += 1
+            while ptr2 < len_b and _isdigit(b[ptr2]):
+                ptr2 += 1
+            isnum = True
+        else:
+            while ptr1 < len_a and _isalpha(a[ptr1]):
+                ptr1 += 1
+            while ptr2 < len_b and _isalpha(b[ptr2]):
+                ptr2 += 1
+            isnum = False
+        seg_a, seg_b = a[one:ptr1], b[two:ptr2]
+        if not seg_b:
+            # Numeric segments are always newer than alpha segments
+            return 1 if isnum else -1
+        if isnum:
+            seg_a = seg_a.lstrip('0')
+            seg_b = seg_b.lstrip('0')
+            if len(seg_a) != len(seg_b):
+                return 1 if len(seg_a) > len(seg_b) else -1
+        if seg_a != seg_b:
+            return -1 if seg_a < seg_b else 1
+        one, two = ptr1, ptr2
+    rest_a = one < len_a
+    rest_b = two < len_b
+    if not rest_a and not rest_b:
+        return 0
+    # A remaining alpha segment never beats an empty string: 1.0a < 1.0 < 1.0.1
+    if (not rest_a and not _isalpha(b[two])) or (rest_a and _isalpha(a[one])):
+        return -1
+    return 1
+
+
+def parse_evr(version):
+    """Split [epoch:]version[-release] into (epoch, version, release or None)"""
+    i = 0
+    while i < len(version) and _isdigit(version[i]):
+        i += 1
+    if i < len(version) and version[i] == ':':
+        epoch = version[:i] or '0'
+        rest = version[i + 1:]
+    else:
+        epoch = '0'
+        rest = version
+    ver, sep, rel = rest.rpartition('-')
+    if not sep:
+        return epoch, rest, None
+    return epoch, ver, rel
+
+
+@functools.lru_cache(maxsize=VERCMP_CACHE_SIZE)
+def vercmp(a, b):
+    """Return -1, 0 or 1 like `vercmp a b` from pacman"""
+    if not a:
+        return 0 if not b else -1
+    if not b:
+        return 1
+    if a == b:
+        return 0
+    epoch1, ver1, rel1 = parse_evr(a)
+    epoch2, ver2, rel2 = parse_evr(b)
+    ret = rpmvercmp(epoch1, epoch2)
+    if ret == 0:
+        ret = rpmvercmp(ver1, ver2)
+        if ret == 0 and rel1 is not None and rel2 is not None:
+            ret = rpmvercmp(rel1, rel2)
+    return ret
+
+
+def classify(current, new):
+    """Describe an update from current to new.
+
+    Returns one of 'downgrade', 'epoch', 'major', 'minor', 'patch',
+    'rebuild' (only pkgrel changed) or None when the versions are equal.
+    """
+    ret = vercmp(new, current)
+    if ret == 0:
+        return None
+    if ret < 0:
+        return 'downgrade'
+    epoch1, ver1, _rel1 = parse_evr(current)
+    epoch2, ver2, _rel2 = parse_evr(new)
+    if rpmvercmp(epoch1, epoch2) != 0:
+        return 'epoch'
+    if rpmvercmp(ver1, ver2) == 0:
+        return 'rebuild'
+    segments1 = _SEGMENT_RE.findall(ver1)
+    segments2 = _SEGMENT_RE.findall(ver2)
+    for index, (seg1, seg2) in enumerate(zip(segments1, segments2)):
+        if rpmvercmp(seg1, seg2) != 0:
+            break
+    else:
+        index = min(len(segments1), len(segments2))
+    if index == 0:
+        return 'major'
+    if index == 1:
+        return 'minor'
+    return 'patch'
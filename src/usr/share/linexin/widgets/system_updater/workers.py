@@ -0,0 +1,97 @@
+"""Bounded worker pool for the widget's background jobs.
+
+Jobs are ordered by priority (user-visible work first). Jobs submitted on
+a channel carry a generation token: submitting again on the same channel
+supersedes the older job, which is dropped if it has not started yet, and
+whose result the caller can recognise as stale with is_current().
+"""
+import itertools
+import queue
+import threading
+
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 10
+DEFAULT_MAX_WORKERS = 4
+
+
+class WorkerPool:
+    """Priority thread pool with per-channel generation tokens."""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, name="linexin-worker"):
+        self.max_workers = max_workers
+        self.name = name
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._generations = {}
+        self._epoch = 0
+
+    def submit(self, fn, *args, priority=PRIORITY_BACKGROUND, channel=None, on_done=None):
+        """Queue fn(*args) and return its token.
+
+        on_done(result) runs on the worker thread after fn returns, unless
+        the job was superseded in the meantime. Exceptions are printed and
+        reported as a None result.
+        """
+        with self._lock:
+            generation = None
+            if channel is not None:
+                generation = self._generations.get(channel, 0) + 1
+                self._generations[channel] = generation
+            token = (self._epoch, channel, generation)
+            self._ensure_workers()
+        self._queue.put((priority, next(self._seq), (token, fn, args, on_done)))
+        return token
+
+    def is_current(self, token):
+        """True unless the job was superseded on its channel or the pool shut down"""
+        if token is None:
+            return True
+        epoch, channel, generation = token
+        with self._lock:
+            if epoch != self._epoch:
+                return False
+            return channel is None or self._generations.get(channel) == generation
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            _priority, _seq, job = self._queue.get()
+            if job is None:
+                return
+            token, fn, args, on_done = job
+            if not self.is_current(token):
+                continue
+            try:
+                result = fn(*args)
+            except Exception as e:
+                print(f"Background job {getattr(fn, '__name__', fn)} failed: {e}")
+                result = None
+            if on_done is not None and self.is_current(token):
+                on_done(result)
+
+    def shutdown(self):
+        """Drop queued jobs, invalidate every token and stop the worker threads.
+
+        Jobs that are already running finish, but their results are
+        discarded. The pool restarts on the next submit().
+        """
+        with self._lock:
+            self._epoch += 1
+            self._generations.clear()
+            threads, self._threads = self._threads, []
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        for _thread in threads:
+            # Sentinels sort after every real job of the same priority
+            self._queue.put((float('inf'), next(self._seq), None))
@@ -0,0 +1,31 @@
+"""Load the updater backend package from the source tree.
+
+The widget loads system_updater next to itself at runtime; the tests and
+benchmarks do the same so they run without installing anything.
+"""
+import importlib.util
+import os
+import sys
+
+WIDGETS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'src', 'usr', 'share', 'linexin', 'widgets'
+)
+BACKEND_DIR = os.path.join(WIDGETS_DIR, 'system_updater')
+
+
+def load_backend():
+    """Import system_updater from the source tree and return it"""
+    if 'system_updater' in sys.modules:
+        return sys.modules['system_updater']
+    spec = importlib.util.spec_from_file_location(
+        'system_updater', os.path.join(BACKEND_DIR, '__init__.py'),
+        submodule_search_locations=[BACKEND_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['system_updater'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+system_updater = load_backend()
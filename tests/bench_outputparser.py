@@ -0,0 +1,59 @@
+"""Measure how fast the output parser gets through a long install transcript.
+
+Run with `python3 tests/bench_outputparser.py [megabytes]`. The transcript
+is the regression corpus followed by compiler-style noise from an AUR
+build, fed in 64 KiB chunks the way the reader thread reads them.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import system_updater  # noqa: E402,F401
+from system_updater import installlog  # noqa: E402
+from system_updater.outputparser import OutputParser  # noqa: E402
+from test_outputparser import PARSER_CORPUS  # noqa: E402
+
+CHUNK_SIZE = 65536
+BUILD_LINES = (
+    '  CC       src/alpm/package.o',
+    '  CCLD     libalpm.so',
+    'In file included from /usr/include/stdio.h:28,',
+    '   Compiling serde v1.0.203',
+    '(3/12) upgrading libfoo...',
+)
+
+
+def build_transcript(megabytes):
+    """Return a transcript of roughly the given size"""
+    corpus = ''.join(line + '\n' for line, _events in PARSER_CORPUS)
+    noise = ''.join(line + '\n' for line in BUILD_LINES) * 200
+    block = corpus + noise
+    return block * max(1, int(megabytes * 1024 * 1024 / len(block)))
+
+
+def bench(feed, transcript):
+    """Return seconds to feed the transcript chunk by chunk"""
+    start = time.perf_counter()
+    for i in range(0, len(transcript), CHUNK_SIZE):
+        feed(transcript[i:i + CHUNK_SIZE])
+    return time.perf_counter() - start
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    transcript = build_transcript(megabytes)
+    size_mb = len(transcript) / (1024 * 1024)
+    lines = transcript.count('\n')
+    parser_seconds = bench(OutputParser().feed, transcript)
+    print(f"parser: {size_mb / parser_seconds:.1f} MB/s, {lines / parser_seconds / 1e6:.2f} M lines/s")
+    # The batcher adds the ring buffer and the log store on top of parsing
+    batcher = installlog.OutputBatcher(log=installlog.LogStore())
+    batcher_seconds = bench(batcher.feed, transcript)
+    print(f"batcher: {size_mb / batcher_seconds:.1f} MB/s, {lines / batcher_seconds / 1e6:.2f} M lines/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
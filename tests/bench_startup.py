@@ -0,0 +1,116 @@
+"""Time the widget's startup path with the startup tracer enabled.
+
+Run with `python3 tests/bench_startup.py [runs]`. Every run starts a
+fresh interpreter with LINEXIN_UPDATER_TRACE set, imports the widget,
+shows it in a window and waits until the update list is populated
+(or STARTUP_TIMEOUT_SECONDS). The phase timings of all runs are then
+printed as median and minimum. Without a display the runs go through
+xvfb-run.
+"""
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import WIDGETS_DIR  # noqa: E402
+
+WIDGET_FILE = os.path.join(WIDGETS_DIR, 'a-system_updater.py')
+STARTUP_TIMEOUT_SECONDS = 60
+# Instant that ends a run; the trace also holds "update check finished" when the probes ran
+END_EVENT = "first list populated"
+
+
+def run_child(trace_path):
+    """Start the widget in this process and write its trace to trace_path"""
+    os.environ['LINEXIN_UPDATER_TRACE'] = trace_path
+    spec = importlib.util.spec_from_file_location('a_system_updater', WIDGET_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    from gi.repository import Adw, GLib, Gtk
+    Adw.init()
+    loop = GLib.MainLoop()
+    window = Gtk.Window()
+    window.set_child(module.LinexInUpdaterWidget())
+    window.present()
+
+    def check_done():
+        if module.TRACER.recorded(END_EVENT):
+            loop.quit()
+            return False
+        return True
+
+    GLib.timeout_add(50, check_done)
+    GLib.timeout_add_seconds(STARTUP_TIMEOUT_SECONDS, loop.quit)
+    loop.run()
+    module.TRACER.write()
+    # Probe and metadata workers may still be running; they do not matter here
+    os._exit(0)
+
+
+def child_command(trace_path):
+    """Return the command running one traced startup, under xvfb-run when headless"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', trace_path]
+    if os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'):
+        return cmd
+    xvfb_run = shutil.which('xvfb-run')
+    if xvfb_run is None:
+        return None
+    return [xvfb_run, '-a'] + cmd
+
+
+def read_phases(trace_path):
+    """Return {name: milliseconds}: durations of spans, time since startup for instants"""
+    with open(trace_path, 'r') as f:
+        events = json.load(f)['traceEvents']
+    if not events:
+        return {}
+    events.sort(key=lambda event: event['ts'])
+    origin = events[0]['ts']
+    phases = {}
+    for event in events:
+        if event['ph'] == 'X':
+            phases[event['name']] = event['dur'] / 1000
+        else:
+            phases[event['name'] + ' (since start)'] = (event['ts'] - origin) / 1000
+    return phases
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {}
+    order = []
+    with tempfile.TemporaryDirectory(prefix='linexin-startup-') as directory:
+        for run in range(runs):
+            trace_path = os.path.join(directory, f'trace-{run}.json')
+            cmd = child_command(trace_path)
+            if cmd is None:
+                print("No display and no xvfb-run; install xorg-server-xvfb to run headless")
+                return 1
+            subprocess.run(cmd, timeout=STARTUP_TIMEOUT_SECONDS + 30)
+            if not os.path.exists(trace_path):
+                print(f"run {run + 1}: no trace written")
+                continue
+            for name, ms in read_phases(trace_path).items():
+                if name not in results:
+                    order.append(name)
+                results.setdefault(name, []).append(ms)
+    if not results:
+        return 1
+    width = max(len(name) for name in order)
+    print(f"{'phase':<{width}}  {'median ms':>10}  {'min ms':>10}  runs")
+    for name in order:
+        values = results[name]
+        print(f"{name:<{width}}  {statistics.median(values):>10.1f}  {min(values):>10.1f}  {len(values)}")
+    return 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        run_child(sys.argv[2])
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Compare the in-process vercmp with spawning pacman's `vercmp` per pair.
+
+Run with `python3 tests/bench_vercmp.py [rounds]`. Without pacman
+installed only the in-process numbers are printed.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import system_updater  # noqa: E402,F401
+from system_updater import vercmp  # noqa: E402
+from test_vercmp import VERCMP_CORPUS  # noqa: E402
+
+
+def bench_in_process(pairs, rounds):
+    """Return seconds per comparison, with the lru cache cleared before each round"""
+    start = time.perf_counter()
+    for _round in range(rounds):
+        vercmp.vercmp.cache_clear()
+        for a, b in pairs:
+            vercmp.vercmp(a, b)
+    return (time.perf_counter() - start) / (rounds * len(pairs))
+
+
+def bench_spawn(pairs, binary):
+    """Return seconds per comparison and the pairs where the two disagree"""
+    mismatches = []
+    start = time.perf_counter()
+    for a, b in pairs:
+        result = subprocess.run([binary, a, b], capture_output=True, text=True)
+        expected = int(result.stdout.strip())
+        if vercmp.vercmp(a, b) != expected:
+            mismatches.append((a, b, expected))
+    return (time.perf_counter() - start) / len(pairs), mismatches
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pairs = [(a, b) for a, b, _expected in VERCMP_CORPUS]
+    pairs += [(b, a) for a, b in pairs]
+    in_process = bench_in_process(pairs, rounds)
+    print(f"in-process: {in_process * 1e6:.2f} us per comparison ({len(pairs)} pairs x {rounds} rounds)")
+    binary = shutil.which('vercmp')
+    if binary is None:
+        print("vercmp not found, skipping the subprocess comparison")
+        return 0
+    spawn, mismatches = bench_spawn(pairs, binary)
+    print(f"spawned vercmp: {spawn * 1e6:.2f} us per comparison ({spawn / in_process:.0f}x slower)")
+    for a, b, expected in mismatches:
+        print(f"mismatch: vercmp {a} {b} = {expected}, in-process {vercmp.vercmp(a, b)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Regression corpus for system_updater.outputparser and the prompt detection."""
+import unittest
+
+from backend import system_updater  # noqa: F401
+from system_updater import installlog
+from system_updater.outputparser import (
+    AurBuild, Conflict, DownloadFinish, DownloadProgress, DownloadStart, FlatpakStep, HookRun,
+    OutputError, OutputParser, OutputWarning, PackageAction, PhaseStart, Prompt, StepProgress,
+)
+
+# (line, events) in transcript order; the parser keeps state between lines
+PARSER_CORPUS = (
+    (':: Synchronizing package databases...',
+     [PhaseStart('sync', ':: Synchronizing package databases...')]),
+    (' core downloading...', [DownloadStart('core')]),
+    (' extra downloading...', [DownloadFinish('core'), DownloadStart('extra')]),
+    (':: Starting full system upgrade...', []),
+    ('resolving dependencies...', []),
+    ('looking for conflicting packages...', []),
+    # With --noconfirm pacman prints the question and answers it itself
+    (':: Proceed with installation? [Y/n] ', []),
+    (':: Retrieving packages...',
+     [DownloadFinish('extra'), PhaseStart('download', ':: Retrieving packages...')]),
+    (' linux-6.9.1.arch1-1-x86_64 downloading...', [DownloadStart('linux-6.9.1.arch1-1-x86_64')]),
+    (' linux-6.9.1.arch1-1-x86_64  120.5 MiB  10.2 MiB/s 00:12 [######----]  55%',
+     [DownloadProgress('linux-6.9.1.arch1-1-x86_64', 55)]),
+    ('\r linux-6.9.1.arch1-1-x86_64  120.5 MiB  10.2 MiB/s 00:06 [#######---]  70%'
+     '\r linux-6.9.1.arch1-1-x86_64  120.5 MiB  10.2 MiB/s 00:00 [##########] 100%',
+     [DownloadProgress('linux-6.9.1.arch1-1-x86_64', 100)]),
+    ('(2/2) checking keys in keyring',
+     [DownloadFinish('linux-6.9.1.arch1-1-x86_64'), StepProgress('keys', 2, 2, 'checking keys in keyring')]),
+    ('(2/2) checking package integrity',
+     [StepProgress('integrity', 2, 2, 'checking package integrity')]),
+    ('(2/2) loading package files', [StepProgress('load', 2, 2, 'loading package files')]),
+    ('(2/2) checking for file conflicts', [StepProgress('conflicts', 2, 2, 'checking for file conflicts')]),
+    ('(2/2) checking available disk space', [StepProgress('diskspace', 2, 2, 'checking available disk space')]),
+    (':: Processing package changes...',
+     [PhaseStart('packages', ':: Processing package changes...')]),
+    ('(1/2) upgrading linux...',
+     [PackageAction('upgrading', 'linux', 1, 2), StepProgress('packages', 1, 2, 'upgrading linux...')]),
+    ('(2/2) installing paru-debug...',
+     [PackageAction('installing', 'paru-debug', 2, 2), StepProgress('packages', 2, 2, 'installing paru-debug...')]),
+    ('warning: /etc/pacman.conf installed as /etc/pacman.conf.pacnew',
+     [OutputWarning('warning: /etc/pacman.conf installed as /etc/pacman.conf.pacnew')]),
+    (':: Running post-transaction hooks...',
+     [PhaseStart('hooks', ':: Running post-transaction hooks...')]),
+    ('(1/3) Arming ConditionNeedsUpdate...',
+     [HookRun('Arming ConditionNeedsUpdate...', 1, 3),
+      StepProgress('hooks', 1, 3, 'Arming ConditionNeedsUpdate...')]),
+    ('error: failed to commit transaction (conflicting files)',
+     [Conflict('error: failed to commit transaction (conflicting files)', ())]),
+    ('foo: /usr/bin/foo exists in filesystem',
+     [Conflict('foo: /usr/bin/foo exists in filesystem', ('foo',))]),
+    (':: foo and bar are in conflict. Remove bar? [y/N]',
+     [Conflict(':: foo and bar are in conflict. Remove bar? [y/N]', ('foo', 'bar'))]),
+    ('error: target not found: nothing', [OutputError('error: target not found: nothing', None)]),
+    ('==> Making package: paru 2.0.3-1 (Mon 01 Jan 2024)',
+     [PhaseStart('aur', '==> Making package: paru 2.0.3-1 (Mon 01 Jan 2024)'), AurBuild('paru', 'start')]),
+    ('==> WARNING: Skipping verification', [OutputWarning('==> WARNING: Skipping verification')]),
+    ('==> Finished making: paru 2.0.3-1 (Mon 01 Jan 2024)', [AurBuild('paru', 'finish')]),
+    ('==> ERROR: A failure occurred in build().',
+     [OutputError('==> ERROR: A failure occurred in build().', None)]),
+    ('paru: error while loading shared libraries: libalpm.so.13: cannot open shared object file',
+     [OutputError('paru: error while loading shared libraries: libalpm.so.13: cannot open shared object file',
+                  'libalpm')]),
+    ('Updating 1/2… org.gnome.Calculator', [FlatpakStep('updating', 1, 2, 'org.gnome.Calculator')]),
+    # Questions on complete lines never count as prompts
+    ('Enter a number (default=all): ', []),
+    ('==> Packages to cleanBuild? [N]one [A]ll', []),
+    ('', []),
+)
+
+
+def _parse_corpus():
+    parser = OutputParser()
+    return [(line, parser.parse_line(line)) for line, _events in PARSER_CORPUS]
+
+
+class ParserCorpusTest(unittest.TestCase):
+
+    def test_lines(self):
+        for (line, events), (_line, expected) in zip(_parse_corpus(), PARSER_CORPUS):
+            with self.subTest(line=line):
+                self.assertEqual(events, expected)
+
+    def test_chunking_does_not_matter(self):
+        transcript = ''.join(line + '\n' for line, _events in PARSER_CORPUS)
+        expected = [(line + '\n', events) for line, events in _parse_corpus()]
+        for size in (1, 7, 64, len(transcript)):
+            with self.subTest(chunk=size):
+                parser = OutputParser()
+                parsed = []
+                for i in range(0, len(transcript), size):
+                    parsed.extend(parser.feed(transcript[i:i + size]))
+                parsed.extend(parser.finish())
+                self.assertEqual(parsed, expected)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PromptTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.batcher = installlog.OutputBatcher(clock=self.clock)
+
+    def prompts(self):
+        return [event for event in self.batcher.drain()[1] if isinstance(event, Prompt)]
+
+    def test_noconfirm_question_is_no_prompt(self):
+        self.batcher.feed(':: Proceed with installation? [Y/n] ')
+        self.batcher.feed('\n:: Retrieving packages...\n')
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS * 2
+        self.assertEqual(self.prompts(), [])
+
+    def test_question_split_across_chunks_is_no_prompt(self):
+        self.batcher.feed(':: Proceed with installation? [Y/n] ')
+        self.assertEqual(self.prompts(), [])
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS / 4
+        self.batcher.feed('\n')
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS * 2
+        self.assertEqual(self.prompts(), [])
+
+    def test_idle_question_is_prompt_once(self):
+        self.batcher.feed('resolving dependencies...\n:: Proceed with installation? [Y/n] ')
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS / 2
+        self.assertEqual(self.prompts(), [])
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS
+        self.assertEqual(self.prompts(), [Prompt(':: Proceed with installation? [Y/n]')])
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS
+        self.assertEqual(self.prompts(), [])
+
+    def test_idle_output_without_question_is_no_prompt(self):
+        self.batcher.feed('  CC       src/main.o')
+        self.clock.now += installlog.PROMPT_IDLE_SECONDS * 2
+        self.assertEqual(self.prompts(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""system_updater.runlog: run ordering and reading a closed run log."""
+import os
+import tempfile
+import unittest
+
+from backend import system_updater  # noqa: F401
+from system_updater import runlog
+
+
+class RunLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_runs_with_the_same_stamp_are_newest_first(self):
+        names = ['update-20260101-120000.log', 'update-20260101-120000-1.log',
+                 'update-20260101-120000-2.log', 'update-20260101-120000-10.log',
+                 'update-20251231-235959.log']
+        for name in names:
+            open(os.path.join(self.log_dir, name), 'w').close()
+        self.assertEqual([os.path.basename(path) for path in runlog.list_runs(self.log_dir)], [
+            'update-20260101-120000-10.log', 'update-20260101-120000-2.log',
+            'update-20260101-120000-1.log', 'update-20260101-120000.log',
+            'update-20251231-235959.log',
+        ])
+
+    def test_closed_log_stays_readable(self):
+        log = runlog.RunLog(log_dir=self.log_dir, memory_cap=16)
+        text = ''.join(f"line {i}\n" for i in range(50))
+        for line in text.splitlines(keepends=True):
+            log.append(line, 'error' if line == 'line 3\n' else None)
+        log.close()
+        self.assertEqual(log.slice(0), text)
+        self.assertEqual(log.tail_lines(2)[1], "line 48\nline 49\n")
+        self.assertEqual(runlog.read_index(log.path)['error'], [len("line 0\nline 1\nline 2\n")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""system_updater.syncdb against small fixture databases built in a tmpdir."""
+import io
+import os
+import tarfile
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from backend import system_updater  # noqa: F401
+from system_updater import syncdb
+
+
+def desc(name, version, groups=()):
+    """Return the text of a desc file"""
+    text = f"%NAME%\n{name}\n\n%VERSION%\n{version}\n\n"
+    if groups:
+        text += "%GROUPS%\n" + "\n".join(groups) + "\n\n"
+    return text
+
+
+def write_sync_db(path, packages):
+    """Write a gzip sync db with one name-version/desc entry per (name, version, groups)"""
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, version, groups in packages:
+            data = desc(name, version, groups).encode('utf-8')
+            info = tarfile.TarInfo(f"{name}-{version}/desc")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def write_local_db(dbpath, packages):
+    """Create dbpath/local/name-version/desc for every installed (name, version)"""
+    for name, version in packages:
+        directory = os.path.join(dbpath, 'local', f"{name}-{version}")
+        os.makedirs(directory)
+        with open(os.path.join(directory, 'desc'), 'w') as f:
+            f.write(desc(name, version))
+
+
+class FindUpdatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dbpath = self._tmp.name
+        self.sync_dir = os.path.join(self.dbpath, 'sync')
+        os.makedirs(self.sync_dir)
+        write_local_db(self.dbpath, [
+            ('linux', '6.8.1-1'),
+            ('bash', '5.2.026-2'),
+            ('vim', '9.1.0-1'),
+            ('gnome-shell', '46.0-1'),
+            ('nvidia-utils', '550.0-1'),
+            ('foreign-pkg', '1.0-1'),
+        ])
+        write_sync_db(os.path.join(self.sync_dir, 'core.db'), [
+            ('linux', '6.9.1-1', ()),
+            ('bash', '5.2.026-2', ()),
+            # Older than the installed version: not an update
+            ('vim', '9.0.0-1', ()),
+        ])
+        write_sync_db(os.path.join(self.sync_dir, 'extra.db'), [
+            # core already provides these; the extra versions must be ignored
+            ('linux', '7.0-1', ()),
+            ('vim', '9.2.0-1', ()),
+            ('gnome-shell', '46.1-1', ('gnome',)),
+            ('nvidia-utils', '555.0-1', ()),
+        ])
+        self.conf = {'repos': ['core', 'extra'], 'ignore_pkgs': [], 'ignore_groups': [],
+                     'dbpath': self.dbpath, 'cache_dirs': []}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def find(self, **kwargs):
+        updates = syncdb.find_updates(sync_dir=self.sync_dir, conf=self.conf, dbpath=self.dbpath, **kwargs)
+        return {u['name']: (u['current'], u['new'], u['repo']) for u in updates}
+
+    def test_updates_and_repo_precedence(self):
+        self.assertEqual(self.find(), {
+            'linux': ('6.8.1-1', '6.9.1-1', 'core'),
+            'gnome-shell': ('46.0-1', '46.1-1', 'extra'),
+            'nvidia-utils': ('550.0-1', '555.0-1', 'extra'),
+        })
+
+    def test_no_newer_version(self):
+        updates = self.find()
+        self.assertNotIn('bash', updates)
+        # core's older vim wins over extra's newer one
+        self.assertNotIn('vim', updates)
+        self.assertNotIn('foreign-pkg', updates)
+
+    def test_ignore_pkg_patterns(self):
+        self.conf['ignore_pkgs'] = ['nvidia-*', 'linux']
+        self.assertEqual(set(self.find()), {'gnome-shell'})
+
+    def test_ignore_group_patterns(self):
+        self.conf['ignore_groups'] = ['gno*']
+        self.assertEqual(set(self.find()), {'linux', 'nvidia-utils'})
+
+    def test_result_shape(self):
+        updates = syncdb.find_updates(sync_dir=self.sync_dir, conf=self.conf, dbpath=self.dbpath)
+        self.assertEqual([u['name'] for u in updates], ['gnome-shell', 'linux', 'nvidia-utils'])
+        self.assertTrue(all(u['type'] == 'pacman' for u in updates))
+
+    def test_stale_sync_dir_raises(self):
+        old = time.time() - syncdb.SYNC_DB_MAX_AGE - 60
+        for repo in self.conf['repos']:
+            os.utime(os.path.join(self.sync_dir, f'{repo}.db'), (old, old))
+        # No checkupdates copies from the real /tmp may be picked up
+        with mock.patch.dict(os.environ, {'TMPDIR': self.dbpath}):
+            os.environ.pop('CHECKUPDATES_DB', None)
+            with self.assertRaises(syncdb.SyncDbError):
+                syncdb.find_updates(conf=self.conf, dbpath=self.dbpath)
+            updates = syncdb.find_updates(conf=self.conf, dbpath=self.dbpath, max_age=None)
+        self.assertEqual(len(updates), 3)
+
+    def test_missing_repo_db_raises(self):
+        self.conf['repos'].append('multilib')
+        with mock.patch.dict(os.environ, {'TMPDIR': self.dbpath}):
+            os.environ.pop('CHECKUPDATES_DB', None)
+            with self.assertRaises(syncdb.SyncDbError):
+                syncdb.find_updates(conf=self.conf, dbpath=self.dbpath)
+
+    def test_read_pacman_conf(self):
+        path = os.path.join(self.dbpath, 'pacman.conf')
+        with open(path, 'w') as f:
+            f.write("[options]\nIgnorePkg = linux nvidia-*  # pinned\nIgnoreGroup = gnome\n"
+                    "DBPath = /var/lib/pacman/\n\n[core]\nInclude = /etc/pacman.d/mirrorlist\n"
+                    "#[testing]\n[extra]\n")
+        conf = syncdb.read_pacman_conf(path)
+        self.assertEqual(conf['repos'], ['core', 'extra'])
+        self.assertEqual(conf['ignore_pkgs'], ['linux', 'nvidia-*'])
+        self.assertEqual(conf['ignore_groups'], ['gnome'])
+        self.assertEqual(conf['dbpath'], '/var/lib/pacman')
+
+
+if __name__ == '__main__':
+    unittest.main()
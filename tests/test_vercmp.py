@@ -0,0 +1,101 @@
+"""Conformance of system_updater.vercmp with pacman's vercmp.
+
+The corpus is the one pacman tests its own vercmp with
+(test/util/vercmptest.sh); every pair is checked in both directions.
+"""
+import unittest
+
+from backend import system_updater  # noqa: F401
+from system_updater import vercmp
+
+# (a, b, expected vercmp a b)
+VERCMP_CORPUS = (
+    # all similar length, no pkgrel
+    ('1.5.0', '1.5.0', 0),
+    ('1.5.1', '1.5.0', 1),
+    # mixed length
+    ('1.5.1', '1.5', 1),
+    # with pkgrel, simple
+    ('1.5.0-1', '1.5.0-1', 0),
+    ('1.5.0-1', '1.5.0-2', -1),
+    ('1.5.0-1', '1.5.1-1', -1),
+    ('1.5.0-2', '1.5.1-1', -1),
+    # with pkgrel, mixed lengths
+    ('1.5-1', '1.5.1-1', -1),
+    ('1.5-2', '1.5.1-1', -1),
+    ('1.5-2', '1.5.1-2', -1),
+    # mixed pkgrel inclusion
+    ('1.5', '1.5-1', 0),
+    ('1.5-1', '1.5', 0),
+    ('1.1-1', '1.1', 0),
+    ('1.0-1', '1.1', -1),
+    ('1.1-1', '1.0', 1),
+    # alphanumeric versions
+    ('1.5b-1', '1.5-1', -1),
+    ('1.5b', '1.5', -1),
+    ('1.5b-1', '1.5', -1),
+    ('1.5b', '1.5.1', -1),
+    # from the manpage
+    ('1.0a', '1.0alpha', -1),
+    ('1.0alpha', '1.0b', -1),
+    ('1.0b', '1.0beta', -1),
+    ('1.0beta', '1.0rc', -1),
+    ('1.0rc', '1.0', -1),
+    # alpha-dotted versions
+    ('1.5.a', '1.5', 1),
+    ('1.5.b', '1.5.a', 1),
+    ('1.5.1', '1.5.b', 1),
+    # alpha dots and dashes
+    ('1.5.b-1', '1.5.b', 0),
+    ('1.5-1', '1.5.b', -1),
+    # same/similar content, differing separators
+    ('2.0', '2_0', 0),
+    ('2.0_a', '2_0.a', 0),
+    ('2.0a', '2.0.a', -1),
+    ('2___a', '2_a', 1),
+    # epoch included version comparisons
+    ('0:1.0', '0:1.0', 0),
+    ('0:1.0', '0:1.1', -1),
+    ('1:1.0', '0:1.0', 1),
+    ('1:1.0', '0:1.1', 1),
+    ('1:1.0', '2:1.1', -1),
+    # epoch + sometimes present pkgrel
+    ('1:1.0', '0:1.0-1', 1),
+    ('1:1.0-1', '0:1.1-1', 1),
+    # epoch included on one version
+    ('0:1.0', '1.0', 0),
+    ('0:1.0', '1.1', -1),
+    ('0:1.1', '1.0', 1),
+    ('1:1.0', '1.0', 1),
+    ('1:1.0', '1.1', 1),
+    ('1:1.1', '1.1', 1),
+    # leading zeros and empty versions
+    ('1.002', '1.2', 0),
+    ('1.010', '1.9', 1),
+    ('', '', 0),
+    ('', '1.0', -1),
+    ('1.0', '', 1),
+)
+
+
+class VercmpConformanceTest(unittest.TestCase):
+
+    def test_corpus(self):
+        for a, b, expected in VERCMP_CORPUS:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(vercmp.vercmp(a, b), expected)
+
+    def test_corpus_reversed(self):
+        for a, b, expected in VERCMP_CORPUS:
+            with self.subTest(a=b, b=a):
+                self.assertEqual(vercmp.vercmp(b, a), -expected)
+
+    def test_classify(self):
+        self.assertIsNone(vercmp.classify('1.0-1', '1.0-1'))
+        self.assertEqual(vercmp.classify('1.0-2', '1.0-1'), 'downgrade')
+        self.assertEqual(vercmp.classify('1.0-1', '1:0.9-1'), 'epoch')
+        self.assertEqual(vercmp.classify('1.0-1', '1.0-2'), 'rebuild')
+
+
+if __name__ == '__main__':
+    unittest.main()